@@ -0,0 +1,150 @@
+"""
+Async read endpoints for assets and asset types, built on the async ORM.
+
+They mirror the read paths of AssetViewSet and AssetTypeViewSet, but a request waiting on the
+database (or long-polling for availability) does not hold a worker thread, so a single ASGI
+worker can serve many slow or long-lived connections.
+"""
+
+import asyncio
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, PermissionDenied, ValidationError
+
+from core.authentication import AsyncJWTAuthentication
+from core.models import Asset, AssetType
+from core.permissions import IsAssetAdmin, IsAssetModerator
+from core.services.search import AssetSearchService
+from core.services.users import UserService
+
+from .serializers import AssetSerializer, AssetTypeSerializer
+
+
+ASSET_FILTER_FIELDS = ("location", "manufacturer", "current_owner", "asset_type", "quantity")
+ASSET_TYPE_FILTER_FIELDS = ("type", "sub_type", "group")
+
+
+async def ahas_any_permission(request, permission_classes) -> bool:
+    """Superusers, and members of any of the groups of `permission_classes`, are granted access."""
+    if request.user.is_staff:
+        return True
+    for permission_class in permission_classes:
+        if await permission_class().ahas_permission(request, None):
+            return True
+    return False
+
+
+def async_api_view(permission_classes=()):
+    """
+    Wrap an async GET view with JWT authentication and permission checks.
+    API exceptions raised by the view are rendered as JSON responses with their status code.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+            try:
+                authentication = await AsyncJWTAuthentication().aauthenticate(request)
+                if authentication is None:
+                    raise NotAuthenticated()
+                request.user = authentication[0]
+
+                if permission_classes and not await ahas_any_permission(request, permission_classes):
+                    raise PermissionDenied()
+
+                return await view(request, *args, **kwargs)
+            except APIException as error:
+                return JsonResponse({"detail": error.detail}, status=error.status_code)
+        return wrapper
+    return decorator
+
+
+def get_int_param(request, name: str, default: int | None = None) -> int | None:
+    """A non-negative integer query parameter. Negative offsets and limits would reach the queryset slicing."""
+    value = request.GET.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: "A valid integer is required."})
+    if value < 0:
+        raise ValidationError({name: "Ensure this value is greater than or equal to 0."})
+    return value
+
+
+async def aget_visible_assets(user):
+    """Assets the user can read. Members of "Asset User" only see the assets they own."""
+    queryset = Asset.objects.select_related("asset_type", "current_owner", "current_owner__profile").order_by("-quantity")
+    if await UserService.ais_user_in_group(user, "Asset User"):
+        queryset = queryset.filter(current_owner=user)
+    return queryset
+
+
+async def aget_asset(request, pk: int):
+    asset = await Asset.objects.select_related("asset_type", "current_owner", "current_owner__profile").filter(pk=pk).afirst()
+    if asset is None:
+        raise NotFound("No Asset matches the given query.")
+    if await UserService.ais_user_in_group(request.user, "Asset User") and asset.current_owner_id != request.user.id:
+        raise PermissionDenied("You are not allowed to perform this action.")
+    return asset
+
+
+@async_api_view()
+async def asset_list(request):
+    queryset = await aget_visible_assets(request.user)
+    try:
+        queryset = queryset.filter(**{field: request.GET[field] for field in ASSET_FILTER_FIELDS if field in request.GET})
+    except ValueError as error:
+        raise ValidationError(str(error))
+    queryset = AssetSearchService.search(queryset, request.GET.get("search", ""))
+
+    count = await queryset.acount()
+    offset, limit = get_int_param(request, "offset", 0), get_int_param(request, "limit")
+    queryset = queryset[offset:offset + limit] if limit is not None else queryset[offset:]
+
+    assets = [asset async for asset in queryset]
+    return JsonResponse({"detail": "Assets retrieved successfully.", "count": count, "data": AssetSerializer(assets, many=True).data})
+
+
+@async_api_view()
+async def asset_detail(request, pk):
+    asset = await aget_asset(request, pk)
+    return JsonResponse({"detail": "Asset retrieved successfully.", "data": AssetSerializer(asset).data})
+
+
+@async_api_view()
+async def asset_availability(request, pk):
+    """
+    Available quantity of an asset. With `wait` (seconds) and `min_quantity`, the request is held
+    open until at least `min_quantity` is available or the wait runs out (long-polling).
+    """
+    asset = await aget_asset(request, pk)
+    min_quantity = get_int_param(request, "min_quantity", 1)
+    wait = min(get_int_param(request, "wait", 0), settings.ASYNC_AVAILABILITY_MAX_WAIT)
+
+    quantity = asset.quantity
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while quantity < min_quantity and loop.time() < deadline:
+        await asyncio.sleep(settings.ASYNC_AVAILABILITY_POLL_INTERVAL)
+        quantity = await Asset.objects.filter(pk=pk).values_list("quantity", flat=True).afirst()
+        if quantity is None:
+            raise NotFound("No Asset matches the given query.")
+
+    return JsonResponse(
+        {
+            "detail": "Asset availability retrieved successfully.",
+            "data": {"asset_id": asset.id, "quantity": quantity, "available": quantity >= min_quantity},
+        }
+    )
+
+
+@async_api_view(permission_classes=(IsAssetModerator, IsAssetAdmin))
+async def asset_type_list(request):
+    queryset = AssetType.objects.filter(**{field: request.GET[field] for field in ASSET_TYPE_FILTER_FIELDS if field in request.GET})
+    asset_types = [asset_type async for asset_type in queryset.order_by("id")]
+    return JsonResponse({"detail": "Asset types retrieved successfully.", "count": len(asset_types), "data": AssetTypeSerializer(asset_types, many=True).data})
@@ -0,0 +1,27 @@
+from rest_framework.filters import BaseFilterBackend
+
+from core.services.search import AssetSearchService
+
+
+class AssetSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search for assets using the `search` query parameter.
+    Replaces DRF's SearchFilter, whose `icontains` OR-joins across the asset type scan the whole table.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        search_text = request.query_params.get(self.search_param, "")
+        return AssetSearchService.search(queryset, search_text)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search over the asset name, description, location, manufacturer and asset type.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -38,6 +38,12 @@ class AssetSerializer(serializers.ModelSerializer):
 
 
 
+class AssetAutocompleteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Asset
+        fields = ("id", "name", "location", "manufacturer")
+
+
 class RequisitionSerialzier(serializers.ListField):
         asset_id=serializers.IntegerField()
         quantity=serializers.IntegerField()
@@ -56,6 +62,15 @@ class AssetTypeGetCode(serializers.ModelSerializer):
 
 
 
+class AssetOwnerTimelineSerializer(serializers.Serializer):
+    owner_id = serializers.IntegerField()
+    period_start = serializers.DateTimeField()
+    period_end = serializers.DateTimeField()
+    quantity = serializers.IntegerField()
+    requisitions = serializers.IntegerField()
+    archived = serializers.BooleanField()
+
+
 class AssetFileUploadSerializer(serializers.ModelSerializer):
     class Meta:
         model = AssetFileUploadHistory
@@ -2,6 +2,7 @@ from django.urls import path, include
 
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import AssetTypeViewSet, AssetViewSet, AssetFileViewSet
 
 router = DefaultRouter(trailing_slash=False)
@@ -9,6 +10,13 @@ router.register("asset-type", AssetTypeViewSet, basename="asset-type")
 router.register("asset", AssetViewSet, basename="asset")
 router.register("file", AssetFileViewSet , basename="asset-files")
 
+async_urlpatterns = [
+    path("async/asset", async_views.asset_list, name="async-asset-list"),
+    path("async/asset/<int:pk>", async_views.asset_detail, name="async-asset-detail"),
+    path("async/asset/<int:pk>/availability", async_views.asset_availability, name="async-asset-availability"),
+    path("async/asset-type", async_views.asset_type_list, name="async-asset-type-list"),
+]
+
 urlpatterns = [
     path("", include(router.urls)),
-]
\ No newline at end of file
+] + async_urlpatterns
\ No newline at end of file
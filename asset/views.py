@@ -1,16 +1,27 @@
-from datetime import datetime
+import csv
+import gzip
+import io
+import logging
 import os
+from wsgiref.util import FileWrapper
 from django.conf import settings
 from rest_framework.viewsets import ModelViewSet, ViewSet
 from rest_framework.permissions import IsAuthenticated, IsAdminUser as IsSuperUser
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.parsers import MultiPartParser, FormParser
 
-from core.models import AssetType, Asset
+from core.mixins import ReplicaReadMixin
+from core.models import AssetType, Asset, AssetFileUploadHistory
 from core.permissions import IsAssetAdmin, IsAssetModerator
-from core.services.assets import AssetService
+from core.services.assets import AssetService, AssetOwnerHistoryService
+from core.services.search import AssetSearchService
+from core.services.summary import InventorySummaryService
 from core.services.files import FileService
+from core.services.memory import MemoryService
+from core.services.replicas import ReplicaService
+from core.services.uploads import UploadDeduplicationService, UploadValidationResultService
 from core.services.users import UserService
 from core.messages import (
     response_bad_request,
@@ -26,24 +37,32 @@ from core.exceptions import (
     raise_404_exception,
 )
 
+from .filters import AssetSearchFilter
 from .serializers import (
     AssetAssignSerializer,
+    AssetAutocompleteSerializer,
     AssetSerializer,
     AssetTypeGetCode,
     AssetTypeSerializer,
     AssetFileUploadSerializer,
+    AssetOwnerTimelineSerializer,
 )
 
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import content_disposition_header
 
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from django_filters.rest_framework import DjangoFilterBackend
 
+logger = logging.getLogger("inventory.assets")
 
-class AssetTypeViewSet(ModelViewSet):
+
+class AssetTypeViewSet(ReplicaReadMixin, ModelViewSet):
     queryset = AssetType.objects.all()
     serializer_class = AssetTypeSerializer
     filter_backends = (DjangoFilterBackend, SearchFilter)
@@ -95,18 +114,10 @@ class AssetTypeViewSet(ModelViewSet):
         return response_ok(detail="Access code found.", data={"asset_code": asset_type.code})
 
 
-class AssetViewSet(ModelViewSet):
+class AssetViewSet(ReplicaReadMixin, ModelViewSet):
     serializer_class = AssetSerializer
-    filter_backends = (DjangoFilterBackend, OrderingFilter, SearchFilter)
-    search_filter = (
-        "location",
-        "manufacturer",
-        "current_owner",
-        "asset_type__type",
-        "asset_type__sub_type",
-        "asset_type__group",
-        "asset_type__code",
-    )
+    replica_read_actions = ("list", "retrieve", "summary", "autocomplete", "history")
+    filter_backends = (DjangoFilterBackend, AssetSearchFilter, OrderingFilter)
     ordering_filter = (
         "quantity",
         "current_owner",
@@ -164,18 +175,93 @@ class AssetViewSet(ModelViewSet):
         ):
             raise_400_exception("Quantity must be greater than 0")
 
-        if UserService.filter_user(is_superuser=True).exists():
-            serializer.save(
-                current_owner=UserService.filter_user(is_superuser=True).first()
-            )
-        else:
+        owner = AssetService.get_default_owner()
+        if owner is None:
             return response_server_error(
                 detail="No superuser found to assign the asset to.", data={}
             )
+
+        serializer.save(current_owner=owner)
         return response_created(
             detail="Asset created successfully", data=serializer.data
         )
 
+    def get_batch_rows(self, request) -> list:
+        """Rows of a batch create request: a CSV `file` upload, a JSON list or a JSON object with an `assets` list."""
+        uploaded_file = request.FILES.get("file")
+        if uploaded_file is not None:
+            rows = list(csv.DictReader(io.TextIOWrapper(uploaded_file, encoding="utf-8-sig")))
+            # An empty description cell is a missing description, stored as NULL as in the JSON rows.
+            for row in rows:
+                if not (row.get("description") or "").strip():
+                    row["description"] = None
+            return rows
+
+        rows = request.data.get("assets") if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list):
+            raise_400_exception("Expected a list of assets or a CSV file.")
+        return rows
+
+    @extend_schema(
+        request=AssetSerializer(many=True),
+        summary="Create assets in batch",
+        description="Creates all the assets of a JSON list or CSV file, or none of them if any row is invalid. Errors are reported per row.",
+    )
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="batch",
+        permission_classes=[IsAuthenticated, (IsAssetModerator | IsAssetAdmin | IsSuperUser)],
+    )
+    def batch_create(self, request):
+        rows = self.get_batch_rows(request)
+
+        if len(rows) == 0:
+            raise_400_exception("No assets to create.")
+        if len(rows) > settings.ASSET_BATCH_CREATE_MAX_ROWS:
+            raise_400_exception(f"Cannot create more than {settings.ASSET_BATCH_CREATE_MAX_ROWS} assets at once.")
+
+        owner = AssetService.get_default_owner()
+        if owner is None:
+            return response_server_error(
+                detail="No superuser found to assign the asset to.", data={}
+            )
+
+        # Validate every row with a single serializer instance, then check the asset types in one query.
+        row_serializer, validated_rows, row_errors = AssetSerializer(), [], []
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                validated_rows.append((row_number, row_serializer.run_validation(row)))
+            except ValidationError as error:
+                row_errors.append({"row": row_number, "errors": error.detail})
+
+        existing_asset_type_ids = AssetService.get_existing_asset_type_ids(
+            validated_row["asset_type_id"] for _, validated_row in validated_rows
+        )
+        for row_number, validated_row in validated_rows:
+            errors = {}
+            if validated_row["asset_type_id"] not in existing_asset_type_ids:
+                errors["asset_type_id"] = ["Asset type not found."]
+            if not AssetService.check_qunatity_greater_than_zero(validated_row["quantity"]):
+                errors["quantity"] = ["Quantity must be greater than 0"]
+            if errors:
+                row_errors.append({"row": row_number, "errors": errors})
+
+        if row_errors:
+            return response_bad_request(
+                detail="Invalid asset rows. No assets were created.",
+                data=sorted(row_errors, key=lambda row_error: row_error["row"]),
+            )
+
+        created_assets = AssetService.bulk_create_assets(
+            [validated_row for _, validated_row in validated_rows],
+            owner=owner,
+            chunk_size=settings.ASSET_BATCH_CREATE_CHUNK_SIZE,
+        )
+        return response_created(
+            detail="Assets created successfully", data={"created": created_assets}
+        )
+
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         return response_list(
@@ -184,6 +270,58 @@ class AssetViewSet(ModelViewSet):
             count=self.get_queryset().count(),
         )
 
+    @extend_schema(
+        summary="Get the inventory summary",
+        description="Total asset quantities and counts rolled up by asset type, sub-type and group, by location and overall.",
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="summary",
+        permission_classes=[IsAuthenticated, (IsAssetModerator | IsAssetAdmin | IsSuperUser)],
+    )
+    def summary(self, request):
+        return response_ok(detail="Inventory summary retrieved successfully.", data=InventorySummaryService.get_summary())
+
+    @extend_schema(
+        parameters=[OpenApiParameter("q", str, description="Text to complete. The last word is matched as a prefix.")],
+        responses={200: AssetAutocompleteSerializer(many=True)},
+        summary="Autocomplete assets",
+        description="Returns the best matching assets for a partially typed search text.",
+    )
+    @action(detail=False, methods=["GET"], url_path="autocomplete", permission_classes=[IsAuthenticated])
+    def autocomplete(self, request):
+        assets = AssetSearchService.autocomplete(self.get_queryset(), request.query_params.get("q", ""))
+        serializer = AssetAutocompleteSerializer(assets, many=True)
+
+        return response_list(
+            detail="Assets retrieved successfully.",
+            data=serializer.data,
+            count=len(serializer.data),
+        )
+
+    @extend_schema(
+        responses={200: AssetOwnerTimelineSerializer(many=True)},
+        summary="Get the ownership history of an asset",
+        description="Lists the requisitions of the asset, newest first. Archived requisitions are summarised per user and month.",
+    )
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="history",
+        permission_classes=[IsAuthenticated, (IsAssetModerator | IsAssetAdmin | IsSuperUser)],
+    )
+    def history(self, request, pk=None):
+        asset = self.get_object()
+        timeline = AssetOwnerHistoryService.get_asset_owner_timeline(asset.id)
+        serializer = AssetOwnerTimelineSerializer(timeline, many=True)
+
+        return response_list(
+            detail="Asset history retrieved successfully.",
+            data=serializer.data,
+            count=len(serializer.data),
+        )
+
     @extend_schema(
         request=AssetAssignSerializer,
         responses={200: {"detail": "Assets assigned successfully"}},
@@ -209,10 +347,11 @@ class AssetViewSet(ModelViewSet):
             raise_404_exception(detail=f"User with id: {user_id} not found!")
 
         validation_success, validation_result = AssetService.validate_requisitions(requisitions)
-        print(validation_success, validation_result)
 
         if validation_success is True:
             AssetService.assign(user, validation_result)
+            ReplicaService.pin_user_to_primary(request.user)
+            ReplicaService.pin_user_to_primary(user)
             return response_ok(detail="Asset(s) assigned to user succesfully!", data={})
         else:
             validation_errors = validation_result.get("validation_errors", [])
@@ -220,8 +359,6 @@ class AssetViewSet(ModelViewSet):
             date_validation_error = validation_result.get("date_validation_error", [])
             error_mssgs = []
 
-            print(validation_errors, quantity_validation_errors, date_validation_error)
-
             if len(validation_errors):
 
                 error_mssgs +=list(
@@ -269,6 +406,12 @@ class AssetFileViewSet(ViewSet):
             response = response_bad_request(detail=str(e), data={})
         return response
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("dry_run", bool, description="Only validate the file: nothing is stored and the errors are returned as a summary."),
+            OpenApiParameter("max_errors", int, description=f"Errors after which a dry run stops. Defaults to {settings.FILE_DRY_RUN_MAX_ERRORS}."),
+        ],
+    )
     @action(detail=False, methods=["POST"], url_path="upload")
     def upload_file(self, request):
 
@@ -277,29 +420,101 @@ class AssetFileViewSet(ViewSet):
 
         uploaded_file = serializer.validated_data.get("uploaded_file")
 
-        validation_status, updated_file_df, totality_check, totality_check_error_messages = FileService.validate_file(uploaded_file)
-
-        file_path = FileService.generate_file_path(request.user.email, uploaded_file)
-
-        #[TODO] Change this to excel.
-        #[TODO] ADD A NEW SHEET IN THE EXCEL FILE WITH THE "totality_check_error_messages", IF ANY.
-        updated_file_df.to_csv(file_path, index=False)
+        if request.query_params.get("dry_run") in ("1", "true"):
+            return self.dry_run_upload(request, uploaded_file)
+
+        # A re-upload of the same file, e.g. after a timeout, gets the result of the first upload.
+        content_hash = UploadDeduplicationService.get_content_hash(uploaded_file)
+        generation = UploadDeduplicationService.get_inventory_generation()
+        reusable_upload = UploadDeduplicationService.get_reusable_upload(request.user, uploaded_file.name, content_hash, generation)
+        if reusable_upload is not None:
+            logger.info(
+                "File upload by %s reuses the result of upload %s", request.user.email, reusable_upload.pk,
+                extra={"upload_id": reusable_upload.pk, "valid": reusable_upload.is_valid, "deduplicated": True},
+            )
+            return self.get_upload_response(reusable_upload)
+
+        with MemoryService.job() as memory:
+            previous_results = UploadValidationResultService.get_previous_results(request.user)
+            validation_status, updated_file_df, totality_check, totality_check_error_messages, validation_results = FileService.validate_file(uploaded_file, previous_results)
+
+            file_path = FileService.generate_file_path(request)
+
+            #[TODO] Change this to excel.
+            #[TODO] ADD A NEW SHEET IN THE EXCEL FILE WITH THE "totality_check_error_messages", IF ANY.
+            with MemoryService.stage("write"):
+                validated_file = FileService.write_validated_file(updated_file_df, file_path)
+
+        serialized_instance = serializer.save(
+            uploaded_by=request.user,
+            validated_file=validated_file,
+            memory_profile=memory.as_dict() if memory is not None else None,
+            content_hash=content_hash,
+            inventory_generation=generation,
+            is_valid=validation_status,
+            validation_results=validation_results,
+        )
+        if validation_results is not None:
+            UploadValidationResultService.drop_previous_results(serialized_instance)
 
-        serialized_instance = serializer.save(uploaded_by=request.user, validated_file=file_path)
+        logger.info(
+            "File upload by %s recorded at %s", request.user.email, serialized_instance.uploaded_file.path,
+            extra={"upload_id": serialized_instance.pk, "valid": validation_status},
+        )
 
-        print(f"File upload by {self.request.user.email} at {datetime.now().strftime('%Y-%m-%d_%H-%M-%S')} recorded at {serialized_instance.uploaded_file.path}!")
+        return self.get_upload_response(serialized_instance)
 
-        if validation_status:
+    def dry_run_upload(self, request, uploaded_file):
+        try:
+            max_errors = int(request.query_params.get("max_errors", settings.FILE_DRY_RUN_MAX_ERRORS))
+        except ValueError:
+            max_errors = 0
+        if max_errors < 1:
+            raise_400_exception("max_errors must be a positive integer.")
+
+        is_valid, summary = FileService.dry_run_file(uploaded_file, max_errors)
+        if is_valid:
+            return response_ok(detail="File is valid.", data=summary)
+        return response_bad_request(detail="File validation failed.", data=summary)
+
+    def get_upload_response(self, upload):
+        if upload.is_valid:
             #
             # [TODO] Subtract qunatities from assets.
             #
 
             return response_ok(
                 detail="File validated succesfully. Qunatities updated.",
-                data=serialized_instance.uploaded_file.path,
+                data=upload.uploaded_file.path,
             )
         else:
             return response_bad_request(
                 detail=f"File validation failed.",
-                data={"message": "Please check the log csv files for more details.. "},
+                data={
+                    "message": "Please check the log csv files for more details.. ",
+                    "validated_file": reverse("asset-files-validated", args=[upload.pk]),
+                },
             )
+
+    @action(detail=True, methods=["GET"], url_path="validated", url_name="validated")
+    def download_validated_file(self, request, pk=None):
+        """
+        The validated file of an upload, with its "Status" column. Compressed files are sent as they are
+        stored, with `Content-Encoding: gzip`, to clients accepting gzip, and decompressed on the fly otherwise.
+        """
+        upload = get_object_or_404(AssetFileUploadHistory, pk=pk)
+        if not upload.validated_file or not os.path.isfile(upload.validated_file.path):
+            raise_404_exception(detail="The validated file has expired or was never written.")
+
+        path, filename = upload.validated_file.path, f"validated-upload-{upload.pk}.csv"
+        if not path.endswith(".gz"):
+            return FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type="text/csv")
+
+        if FileService.accepts_gzip(request.headers.get("Accept-Encoding", "")):
+            response = FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type="text/csv")
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = StreamingHttpResponse(FileWrapper(gzip.open(path, "rb"), 64 * 1024), content_type="text/csv")
+            response["Content-Disposition"] = content_disposition_header(True, filename)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
@@ -7,4 +9,19 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         from core.signals import assign_user_to_normal_group
+
+        if settings.METRICS_ENABLED:
+            from core.services.metrics import MetricsService
+
+            connection_created.connect(MetricsService.install_sql_execute_wrapper)
+
+        if settings.SQL_COMMENTER_ENABLED:
+            from core.services.sqlcomments import SqlCommentService
+
+            connection_created.connect(SqlCommentService.install_sql_execute_wrapper)
+
+        if settings.SLOW_QUERY_ENABLED:
+            from core.services.slowqueries import SlowQueryService
+
+            connection_created.connect(SlowQueryService.install_sql_execute_wrapper)
         return super().ready()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import json
+import logging
+import random
+
+from django.conf import settings
+
+
+# Attributes of every LogRecord. The other attributes of a record come from the `extra` of the call and are logged as fields.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+def get_fields(record) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and the `extra` fields of the call."""
+
+    def format(self, record):
+        entry = {"time": self.formatTime(record), "level": record.levelname, "logger": record.name, "message": record.getMessage()}
+        entry.update(get_fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class KeyValueFormatter(logging.Formatter):
+    """`time level logger message key=value ...`, for reading logs in a terminal."""
+
+    def format(self, record):
+        line = f"{self.formatTime(record)} {record.levelname} {record.name} {record.getMessage()}"
+        fields = " ".join(f"{key}={value}" for key, value in get_fields(record).items())
+        if fields:
+            line = f"{line} {fields}"
+        if record.exc_info:
+            line = f"{line}\n{self.formatException(record.exc_info)}"
+        return line
+
+
+def is_row_sampled(logger) -> bool:
+    """
+    Whether to log the DEBUG output of one row (or asset, or requisition) of a per-row loop.
+    Only a LOG_ROW_SAMPLE_RATE share of them is logged, and none unless DEBUG is enabled.
+    """
+    return logger.isEnabledFor(logging.DEBUG) and random.random() < settings.LOG_ROW_SAMPLE_RATE
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.services.archives import HistoryArchiveService
+
+
+class Command(BaseCommand):
+    help = "Moves closed requisitions older than the archive horizon out of the asset owner history into the archive and monthly rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=None, help="Archive requisitions that ended more than this many days ago. Defaults to ASSET_HISTORY_ARCHIVE_AFTER_DAYS.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Number of requisitions archived per transaction.")
+
+    def handle(self, *args, **options):
+        horizon = HistoryArchiveService.get_archive_horizon(options["older_than_days"])
+        self.stdout.write(f"Archiving requisitions that ended before {horizon.isoformat()}...")
+
+        archived_rows = HistoryArchiveService.archive(horizon, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived_rows} requisition(s)."))
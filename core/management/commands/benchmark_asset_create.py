@@ -0,0 +1,69 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from core.models import Asset, AssetType
+
+
+class Command(BaseCommand):
+    help = "Benchmarks creating assets one request at a time against the batch create endpoint. All created rows are rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=int, default=20_000, help="Number of assets created by each path.")
+        parser.add_argument("--single-sample", type=int, default=1_000, help="Number of single create requests actually timed; the total is extrapolated.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic data.")
+
+    def get_rows(self, total, asset_type_ids, seed):
+        generator = random.Random(seed)
+        return [
+            {
+                "name": f"Benchmark asset {idx}",
+                "description": f"Benchmark asset number {idx}",
+                "quantity": generator.randint(1, 500),
+                "location": generator.choice(["Bangalore", "Pune", "Hyderabad"]),
+                "manufacturer": generator.choice(["Dell", "Lenovo", "Cisco"]),
+                "asset_type_id": generator.choice(asset_type_ids),
+            }
+            for idx in range(total)
+        ]
+
+    def handle(self, *args, **options):
+        client = APIClient(SERVER_NAME="localhost")
+
+        with transaction.atomic():
+            superuser = get_user_model().objects.bulk_create(
+                [get_user_model()(email="benchmark-create@example.com", password="!", is_staff=True, is_superuser=True)]
+            )[0]
+            client.force_authenticate(user=superuser)
+
+            asset_type_ids = [
+                asset_type.id for asset_type in AssetType.objects.bulk_create(
+                    [AssetType(type=f"Type {idx}(T{idx})", sub_type="Cable(CBL)", group="Ethernet(ETH)") for idx in range(10)]
+                )
+            ]
+            rows = self.get_rows(options["assets"], asset_type_ids, options["seed"])
+            single_rows = rows[:options["single_sample"]]
+
+            start = time.perf_counter()
+            for row in single_rows:
+                response = client.post("/asset", row, format="json")
+                if response.status_code != 201:
+                    raise CommandError(f"Single create failed: {response.content}")
+            single_seconds = (time.perf_counter() - start) * len(rows) / len(single_rows)
+
+            start = time.perf_counter()
+            response = client.post("/asset/batch", rows, format="json")
+            if response.status_code != 201:
+                raise CommandError(f"Batch create failed: {response.content}")
+            batch_seconds = time.perf_counter() - start
+
+            created_assets = Asset.objects.filter(asset_type_id__in=asset_type_ids).count()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Single create: {single_seconds:.1f}s for {len(rows)} assets (extrapolated from {len(single_rows)} requests).")
+        self.stdout.write(f"Batch create:  {batch_seconds:.1f}s for {len(rows)} assets.")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {single_seconds / batch_seconds:.1f}x ({created_assets} assets created and rolled back)."))
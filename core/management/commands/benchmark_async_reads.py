@@ -0,0 +1,109 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Asset
+from core.services.users import UserService
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests a sync (WSGI) and an async (ASGI) deployment of the asset read endpoints at high concurrency "
+        "and reports their throughput. Both servers must be running, e.g. the `web` and `web-asgi` compose services. "
+        "By default the detail endpoint of one of the user's assets, taken from the database, is requested from both."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync-url", default="http://localhost:8000", help="Base URL of the WSGI server.")
+        parser.add_argument("--async-url", default="http://localhost:8001", help="Base URL of the ASGI server.")
+        parser.add_argument("--email", required=True, help="Email of the user the requests are made as.")
+        parser.add_argument("--password", required=True, help="Password of the user the requests are made as.")
+        parser.add_argument("--concurrency", type=int, default=200, help="Number of concurrent connections.")
+        parser.add_argument("--requests", type=int, default=5_000, help="Number of requests sent to each server.")
+        parser.add_argument(
+            "--path",
+            help="Path of the sync endpoint; the async endpoint is the same path under /async. Both must return the same "
+            "rows, so `limit` and `offset`, which only the async list supports, are rejected. Defaults to /asset/<id>.",
+        )
+
+    def get_default_path(self, email):
+        """The detail endpoint of the first asset the user can read, so both servers return the same asset."""
+        assets = Asset.objects.order_by("id")
+        user = UserService.get_user_by_email(email)
+        if user != "User not found" and UserService.is_user_in_group(user, "Asset User"):
+            assets = assets.filter(current_owner=user)
+        asset_id = assets.values_list("id", flat=True).first()
+        if asset_id is None:
+            raise CommandError(f"{email} cannot read any asset, pass a --path.")
+        return f"/asset/{asset_id}"
+
+    def get_token(self, base_url, email, password):
+        request = Request(
+            f"{base_url}/login/jwt/create/",
+            data=json.dumps({"email": email, "password": password}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urlopen(request) as response:
+            return json.load(response)["access"]
+
+    async def send_requests(self, url, token, total, results):
+        """Send requests over one keep-alive connection until `total` requests have been sent by all connections."""
+        parts = urlsplit(url)
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        request = (
+            f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nAuthorization: JWT {token}\r\nConnection: keep-alive\r\n\r\n"
+        ).encode()
+
+        try:
+            while results["sent"] < total:
+                results["sent"] += 1
+                writer.write(request)
+                await writer.drain()
+
+                status = int((await reader.readline()).split()[1])
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+
+                results["ok" if status == 200 else "failed"] += 1
+                if headers.get("connection") == "close":
+                    break
+        finally:
+            writer.close()
+
+    async def load_test(self, url, token, concurrency, total):
+        results = {"sent": 0, "ok": 0, "failed": 0}
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(self.send_requests(url, token, total, results) for _ in range(concurrency)), return_exceptions=True
+        )
+        results["seconds"] = time.perf_counter() - start
+        results["errors"] = sum(isinstance(outcome, Exception) for outcome in outcomes)
+        return results
+
+    def handle(self, *args, **options):
+        try:
+            token = self.get_token(options["sync_url"], options["email"], options["password"])
+        except OSError as error:
+            raise CommandError(f"Could not log in: {error}")
+
+        path = options["path"] or self.get_default_path(options["email"])
+        if {"limit", "offset"} & parse_qs(urlsplit(path).query).keys():
+            raise CommandError("The sync list is not paginated, so `limit` and `offset` would compare different workloads.")
+
+        for name, url in (
+            ("sync (WSGI)", f"{options['sync_url']}{path}"),
+            ("async (ASGI)", f"{options['async_url']}/async{path}"),
+        ):
+            results = asyncio.run(self.load_test(url, token, options["concurrency"], options["requests"]))
+            self.stdout.write(
+                f"{name}: {results['ok'] / results['seconds']:.0f} req/s, {results['ok']} ok, {results['failed']} failed, "
+                f"{results['errors']} broken connections in {results['seconds']:.1f}s"
+            )
@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+from core.models import Asset, AssetType
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks requests/sec of GET /asset/<pk> with a new connection per request, with the connection pool, "
+        "and with the pool and server side prepared statements. Needs PostgreSQL and psycopg 3."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2_000, help="Number of requests sent in each mode.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Number of threads sending requests.")
+
+    def get_modes(self):
+        pool = {"min_size": settings.DB_POOL_MIN_SIZE, "max_size": settings.DB_POOL_MAX_SIZE, "timeout": settings.DB_POOL_TIMEOUT}
+        prepared = {"server_side_binding": True, "prepare_threshold": settings.DB_PREPARE_THRESHOLD or 5}
+        return [
+            ("connection per request", {}),
+            ("connection pool", {"pool": pool}),
+            ("connection pool + prepared statements", {"pool": pool, **prepared}),
+        ]
+
+    def configure(self, options):
+        """Switch the connection options of the default database. New connections and pools pick them up."""
+        connections.close_all()
+        connection.close_pool()
+        connection.settings_dict["CONN_MAX_AGE"] = 0
+        connection.settings_dict["OPTIONS"] = options
+
+    def send_requests(self, user, path, total):
+        client = APIClient(SERVER_NAME="localhost")
+        client.force_authenticate(user=user)
+        try:
+            for _ in range(total):
+                response = client.get(path)
+                if response.status_code != 200:
+                    raise CommandError(f"Request failed: {response.content}")
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The connection pool benchmark needs PostgreSQL.")
+
+        original_options = connection.settings_dict["OPTIONS"]
+        user = get_user_model().objects.bulk_create(
+            [get_user_model()(email="benchmark-pool@example.com", password="!", is_staff=True, is_superuser=True)]
+        )[0]
+        asset_type = AssetType.objects.create(type="Benchmark(BMK)", sub_type="Pool(POL)", group="Request(REQ)")
+        asset = Asset.objects.create(
+            name="Benchmark asset", quantity=1, current_owner=user, asset_type=asset_type, location="Pune", manufacturer="Dell"
+        )
+
+        try:
+            per_thread = options["requests"] // options["concurrency"]
+            for name, database_options in self.get_modes():
+                self.configure(database_options)
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+                    for future in [
+                        executor.submit(self.send_requests, user, f"/asset/{asset.pk}", per_thread)
+                        for _ in range(options["concurrency"])
+                    ]:
+                        future.result()
+                seconds = time.perf_counter() - start
+                self.stdout.write(f"{name}: {per_thread * options['concurrency'] / seconds:.0f} req/s")
+        finally:
+            self.configure(original_options)
+            asset.delete()
+            asset_type.delete()
+            user.delete()
@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Asset, AssetType, Profile
+
+
+class Command(BaseCommand):
+    help = "Benchmarks Asset and Profile writes with and without full_clean(). All created rows are rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writes", type=int, default=2_000, help="Number of writes per model and save path.")
+
+    def run_writes(self, label, writes, write):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for idx in range(writes):
+                write(idx)
+            seconds = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{label}: {writes / seconds:.0f} writes/s, {len(queries) / writes:.1f} queries per write"
+        )
+
+    def handle(self, *args, **options):
+        writes = options["writes"]
+
+        with transaction.atomic():
+            users = get_user_model().objects.bulk_create(
+                [get_user_model()(email=f"benchmark-save-{idx}@example.com", password="!") for idx in range(writes * 2)]
+            )
+            asset_type = AssetType.objects.create(type="Hardware(HDW)", sub_type="Cable(CBL)", group="Ethernet(ETH)")
+
+            for validate in (True, False):
+                label = "full_clean()" if validate else "constraints only"
+                offset = 0 if validate else writes
+
+                self.run_writes(
+                    f"Asset create ({label})",
+                    writes,
+                    lambda idx: Asset(
+                        name=f"Benchmark asset {idx}", quantity=10, current_owner=users[0], asset_type=asset_type,
+                        location="Pune", manufacturer="Dell",
+                    ).save(validate=validate),
+                )
+                self.run_writes(
+                    f"Profile create ({label})",
+                    writes,
+                    lambda idx: Profile(
+                        first_name="Benchmark", designation="Engineer", qualification="B.Tech",
+                        phone_number=f"{offset + idx:010d}", user=users[offset + idx],
+                    ).save(validate=validate),
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished. Created rows rolled back."))
@@ -0,0 +1,101 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from core.models import Asset, AssetType
+from core.services.search import AssetSearchService
+
+
+ASSET_TYPES = ["Hardware(HDW)", "Software(SFW)", "Furniture(FRN)", "Vehicle(VHC)"]
+ASSET_SUB_TYPES = ["Cable(CBL)", "Laptop(LPT)", "Monitor(MON)", "Chair(CHR)", "License(LIC)", "Router(RTR)"]
+ASSET_GROUPS = ["Ethernet(ETH)", "Office(OFC)", "Network(NET)", "Storage(STG)"]
+NAME_WORDS = ["dell", "lenovo", "cisco", "ergonomic", "wireless", "standing", "ultrawide", "rack", "fiber", "usb", "adapter", "switch", "desk", "server"]
+LOCATIONS = ["Bangalore", "Pune", "Hyderabad", "Chennai", "Delhi", "Mumbai", "Kolkata"]
+MANUFACTURERS = ["Dell", "Lenovo", "Cisco", "HP", "Herman Miller", "Logitech", "Samsung"]
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the full-text asset search against the icontains search it replaces, on synthetic assets that are rolled back afterwards."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=int, default=1_000_000, help="Number of synthetic assets to create.")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Number of assets inserted per bulk insert.")
+        parser.add_argument("--repeat", type=int, default=5, help="Number of times each query is run.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic data.")
+        parser.add_argument("--query", action="append", dest="queries", help="Search text to benchmark. Can be given multiple times.")
+
+    def create_assets(self, total, batch_size, seed):
+        generator = random.Random(seed)
+        owner = get_user_model().objects.bulk_create([get_user_model()(email="benchmark-search@example.com", password="!")])[0]
+        asset_types = AssetType.objects.bulk_create(
+            [
+                AssetType(type=type_name, sub_type=sub_type, group=group)
+                for type_name in ASSET_TYPES
+                for sub_type in ASSET_SUB_TYPES
+                for group in ASSET_GROUPS
+            ]
+        )
+
+        for offset in range(0, total, batch_size):
+            Asset.objects.bulk_create(
+                [
+                    Asset(
+                        name=" ".join(generator.sample(NAME_WORDS, 3)),
+                        description=f"Synthetic asset number {offset + idx}",
+                        quantity=generator.randint(0, 500),
+                        current_owner=owner,
+                        asset_type=generator.choice(asset_types),
+                        location=generator.choice(LOCATIONS),
+                        manufacturer=generator.choice(MANUFACTURERS),
+                    )
+                    for idx in range(min(batch_size, total - offset))
+                ]
+            )
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE "{Asset._meta.db_table}"')
+
+    def time_query(self, repeat, run_query):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run_query()
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings), sorted(timings)[len(timings) // 2]
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or ["cisco", "dell laptop", "pune network", "ETH"]
+
+        with transaction.atomic():
+            self.stdout.write(f"Creating {options['assets']} synthetic assets...")
+            start = time.perf_counter()
+            self.create_assets(options["assets"], options["batch_size"], options["seed"])
+            self.stdout.write(f"Created in {time.perf_counter() - start:.1f}s (search vectors maintained by the trigger).")
+
+            for query in queries:
+                icontains_filter = Q()
+                for field in ("location", "manufacturer", "asset_type__type", "asset_type__sub_type", "asset_type__group"):
+                    icontains_filter |= Q(**{f"{field}__icontains": query})
+
+                icontains_min, icontains_median = self.time_query(
+                    options["repeat"], lambda: list(Asset.objects.filter(icontains_filter).distinct().order_by("-quantity")[:20])
+                )
+                search_min, search_median = self.time_query(
+                    options["repeat"], lambda: list(AssetSearchService.search(Asset.objects.all(), query)[:20])
+                )
+                autocomplete_min, autocomplete_median = self.time_query(
+                    options["repeat"], lambda: list(AssetSearchService.autocomplete(Asset.objects.all(), query[:-1]))
+                )
+
+                self.stdout.write(
+                    f"{query!r}: icontains min {icontains_min:.1f}ms / median {icontains_median:.1f}ms, "
+                    f"full-text min {search_min:.1f}ms / median {search_median:.1f}ms, "
+                    f"autocomplete min {autocomplete_min:.1f}ms / median {autocomplete_median:.1f}ms"
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished. Synthetic assets rolled back."))
@@ -0,0 +1,338 @@
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser as IsSuperUser
+
+from asset.serializers import AssetSerializer
+from core.models import Asset, AssetOwnerHistory, AssetType
+from core.permissions import IsAssetAdmin, IsAssetModerator
+from core.services.assets import AssetService
+from core.services.files import FileService, FileValidationService
+
+
+BENCHMARKS = (
+    "file.validate_file",
+    "file.parse",
+    "file.totality_check",
+    "assets.validate_requisitions",
+    "assets.assign",
+    "permissions.has_permission",
+    "serializers.asset_list",
+)
+
+
+def get_scales(value):
+    return [int(scale) for scale in value.split(",")]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the asset and file services on synthetic inventories of the given scales and writes the "
+        "results as JSON, optionally comparing them with the results of a previous run. All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=get_scales, default=[1_000], help="Comma separated asset counts, e.g. 1000,100000,1000000.")
+        parser.add_argument("--rows", type=get_scales, default=[1_000], help="Comma separated upload row counts, e.g. 10000,100000,1000000.")
+        parser.add_argument("--requisitions", type=int, default=100, help="Number of requisitions validated and assigned.")
+        parser.add_argument("--permission-checks", type=int, default=1_000, help="Number of permission checks per run.")
+        parser.add_argument("--list-size", type=int, default=1_000, help="Number of assets rendered by the list serializer.")
+        parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs of each benchmark.")
+        parser.add_argument("--benchmark", action="append", dest="benchmarks", choices=BENCHMARKS, help="Benchmark to run. Can be given multiple times, all by default.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic data.")
+        parser.add_argument("--output", help="Path of the JSON results file.")
+        parser.add_argument("--compare", help="Path of the JSON results of a previous run to compare with.")
+        parser.add_argument("--max-regression", type=float, default=0.2, help="Fail when a median is slower than the compared one by more than this share.")
+
+    def create_inventory(self, total_assets, generator):
+        users = get_user_model().objects.bulk_create(
+            [get_user_model()(email=f"benchmark-{idx}@example.com", password="!") for idx in range(max(10, total_assets // 100))]
+        )
+        Group.objects.get_or_create(name="Asset User")[0].user_set.add(users[0])
+
+        asset_types = AssetType.objects.bulk_create(
+            [AssetType(type=f"Benchmark {idx}(B{idx})", sub_type="Cable(CBL)", group="Ethernet(ETH)") for idx in range(20)]
+        )
+        for offset in range(0, total_assets, 10_000):
+            Asset.objects.bulk_create(
+                [
+                    Asset(
+                        name=f"Benchmark asset {offset + idx}",
+                        quantity=1_000_000,
+                        current_owner=generator.choice(users),
+                        asset_type=generator.choice(asset_types),
+                        location=generator.choice(["Bangalore", "Pune", "Hyderabad"]),
+                        manufacturer=generator.choice(["Dell", "Lenovo", "Cisco"]),
+                    )
+                    for idx in range(min(10_000, total_assets - offset))
+                ]
+            )
+        asset_ids = list(Asset.objects.filter(asset_type__in=asset_types).values_list("id", flat=True))
+
+        # Open requisitions the totality check has to take into account.
+        now = timezone.now()
+        for offset in range(0, len(asset_ids) // 10, 10_000):
+            AssetOwnerHistory.objects.bulk_create(
+                [
+                    AssetOwnerHistory(
+                        asset_id=asset_id,
+                        user=generator.choice(users),
+                        start_date=now - timedelta(days=generator.randint(0, 60)),
+                        end_date=now + timedelta(days=generator.randint(1, 60)),
+                        requisition_qunatity=generator.randint(1, 10),
+                    )
+                    for asset_id in asset_ids[offset:min(offset + 10_000, len(asset_ids) // 10)]
+                ]
+            )
+        return users, asset_ids
+
+    def get_requisition_rows(self, total, users, asset_ids, generator):
+        today = timezone.now().date()
+        for _ in range(total):
+            start_date = today + timedelta(days=generator.randint(1, 29))
+            yield {
+                "User Id": generator.choice(users).id,
+                "Asset ID": generator.choice(asset_ids),
+                "Asset Quantity": generator.randint(1, 5),
+                "Start Date": start_date.isoformat(),
+                "End Date": (start_date + timedelta(days=generator.randint(1, 60))).isoformat(),
+            }
+
+    def get_upload(self, rows):
+        content = io.StringIO()
+        writer = csv.DictWriter(content, fieldnames=["User Id", "Asset ID", "Asset Quantity", "Start Date", "End Date"])
+        writer.writeheader()
+        writer.writerows(rows)
+        return SimpleUploadedFile("requisitions.csv", content.getvalue().encode(), content_type="text/csv")
+
+    def get_xlsx_upload(self, rows):
+        from openpyxl import Workbook
+
+        # A write-only workbook streams the rows to the file, like the read-only one reads them.
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(["User Id", "Asset ID", "Asset Quantity", "Start Date", "End Date"])
+        for row in rows:
+            sheet.append(list(row.values()))
+        content = io.BytesIO()
+        workbook.save(content)
+        return SimpleUploadedFile(
+            "requisitions.xlsx", content.getvalue(), content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+    def get_arrow_uploads(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {column: [row[column] for row in rows] for column in ("User Id", "Asset ID", "Asset Quantity")}
+        for column in ("Start Date", "End Date"):
+            columns[column] = pa.array([date.fromisoformat(row[column]) for row in rows], pa.date32())
+        table = pa.table(columns)
+
+        parquet_content, arrow_content = pa.BufferOutputStream(), pa.BufferOutputStream()
+        pq.write_table(table, parquet_content)
+        with pa.ipc.new_file(arrow_content, table.schema) as writer:
+            writer.write_table(table)
+        return self.get_spooled_upload("requisitions.parquet", parquet_content.getvalue().to_pybytes()), self.get_spooled_upload(
+            "requisitions.arrow", arrow_content.getvalue().to_pybytes()
+        )
+
+    def get_spooled_upload(self, name, content):
+        """An upload spooled to a temporary file, as Django stores uploads over FILE_UPLOAD_MAX_MEMORY_SIZE."""
+        upload = TemporaryUploadedFile(name, "application/octet-stream", len(content), None)
+        upload.write(content)
+        upload.seek(0)
+        return upload
+
+    def measure(self, name, scale, run, setup=None, teardown=None, trace_memory=False):
+        """Times `run`. With `trace_memory`, the peak memory it allocated is recorded too, from extra untimed runs under tracemalloc."""
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        timings = []
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            with connection.execute_wrapper(count_queries):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+            if teardown:
+                teardown()
+
+        result = {
+            "benchmark": name,
+            "scale": scale,
+            "repeat": self.repeat,
+            "min_s": round(min(timings), 6),
+            "median_s": round(statistics.median(timings), 6),
+            "max_s": round(max(timings), 6),
+            "queries": queries // self.repeat,
+        }
+        if trace_memory:
+            if setup:
+                setup()
+            tracemalloc.start()
+            try:
+                run()
+                result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            if teardown:
+                teardown()
+        self.results.append(result)
+        memory = f", peak {result['peak_memory_bytes'] / 2 ** 20:.1f} MiB" if trace_memory else ""
+        self.stdout.write(f"{name} {json.dumps(scale)}: median {result['median_s'] * 1000:.1f}ms, {result['queries']} queries{memory}")
+
+    def run_asset_benchmarks(self, total_assets, options, generator):
+        scale = {"assets": total_assets}
+        users, asset_ids = self.create_inventory(total_assets, generator)
+
+        requisitions = [
+            {"asset_id": row["Asset ID"], "quantity": row["Asset Quantity"], "start_date": row["Start Date"], "end_date": row["End Date"]}
+            for row in self.get_requisition_rows(options["requisitions"], users, asset_ids, generator)
+        ]
+        if self.selected("assets.validate_requisitions"):
+            self.measure("assets.validate_requisitions", {**scale, "requisitions": len(requisitions)}, lambda: AssetService.validate_requisitions(requisitions))
+
+        if self.selected("assets.assign"):
+            validation_success, validation_result = AssetService.validate_requisitions(requisitions)
+            if not validation_success:
+                raise CommandError(f"The synthetic requisitions are invalid: {validation_result}")
+            savepoint = {}
+            self.measure(
+                "assets.assign",
+                {**scale, "requisitions": len(requisitions)},
+                lambda: AssetService.assign(users[1], validation_result),
+                setup=lambda: savepoint.update(id=transaction.savepoint()),
+                teardown=lambda: transaction.savepoint_rollback(savepoint["id"]),
+            )
+
+        if self.selected("permissions.has_permission"):
+            # An "Asset User" asking for a moderator action fails every check, the most expensive path.
+            request, permission = SimpleNamespace(user=users[0]), (IsAssetModerator | IsAssetAdmin | IsSuperUser)()
+            self.measure(
+                "permissions.has_permission",
+                {**scale, "checks": options["permission_checks"]},
+                lambda: [permission.has_permission(request, None) for _ in range(options["permission_checks"])],
+            )
+
+        if self.selected("serializers.asset_list"):
+            # Same queryset as the /asset list view.
+            self.measure(
+                "serializers.asset_list",
+                {**scale, "list_size": options["list_size"]},
+                lambda: AssetSerializer(Asset.objects.all().order_by("-quantity")[:options["list_size"]], many=True).data,
+            )
+
+        for total_rows in options["rows"]:
+            self.run_file_benchmarks({**scale, "rows": total_rows}, users, asset_ids, generator)
+
+    def run_file_benchmarks(self, scale, users, asset_ids, generator):
+        rows = list(self.get_requisition_rows(scale["rows"], users, asset_ids, generator))
+        upload = self.get_upload(rows)
+
+        if self.selected("file.validate_file"):
+            self.measure("file.validate_file", scale, lambda: FileService.validate_file(upload), setup=lambda: upload.seek(0))
+
+        if self.selected("file.parse"):
+            # The same rows in every upload format, spooled to disk and read the way /file/upload reads them.
+            parquet_upload, arrow_upload = self.get_arrow_uploads(rows)
+            parsed_uploads = (
+                ("csv", self.get_spooled_upload("requisitions.csv", upload.file.getvalue())),
+                ("xlsx", self.get_spooled_upload("requisitions.xlsx", self.get_xlsx_upload(rows).read())),
+                ("parquet", parquet_upload),
+                ("arrow", arrow_upload),
+            )
+            for file_format, parsed_upload in parsed_uploads:
+                self.measure(
+                    "file.parse",
+                    {**scale, "format": file_format},
+                    lambda: FileValidationService._FileValidationService__read_uploaded_file(parsed_upload),
+                    setup=lambda: parsed_upload.seek(0),
+                    trace_memory=True,
+                )
+
+        if self.selected("file.totality_check"):
+            from pandas import read_csv
+
+            upload.seek(0)
+            uploaded_file_df = read_csv(upload)
+            asset_ids_in_file = set(uploaded_file_df["Asset ID"])
+            self.measure(
+                "file.totality_check",
+                scale,
+                lambda: FileValidationService._FileValidationService__check_file_in_totality(asset_ids_in_file, uploaded_file_df),
+            )
+
+    def selected(self, benchmark):
+        return benchmark in self.benchmarks
+
+    def get_environment(self):
+        try:
+            commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "recorded_at": timezone.now().isoformat(),
+        }
+
+    def compare(self, path, max_regression):
+        with open(path) as baseline_file:
+            baseline = {(result["benchmark"], json.dumps(result["scale"], sort_keys=True)): result for result in json.load(baseline_file)["results"]}
+
+        regressions = []
+        for result in self.results:
+            previous = baseline.get((result["benchmark"], json.dumps(result["scale"], sort_keys=True)))
+            if previous is None or not previous["median_s"]:
+                continue
+            change = result["median_s"] / previous["median_s"] - 1
+            self.stdout.write(f"{result['benchmark']} {json.dumps(result['scale'])}: {change:+.1%} against {path}")
+            if change > max_regression:
+                regressions.append(result["benchmark"])
+        return regressions
+
+    def handle(self, *args, **options):
+        self.repeat, self.results = options["repeat"], []
+        self.benchmarks = options["benchmarks"] or BENCHMARKS
+        generator = random.Random(options["seed"])
+
+        for total_assets in options["assets"]:
+            with transaction.atomic():
+                self.run_asset_benchmarks(total_assets, options, generator)
+                transaction.set_rollback(True)
+
+        document = {"environment": self.get_environment(), "results": self.results}
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                json.dump(document, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
+
+        if options["compare"]:
+            regressions = self.compare(options["compare"], options["max_regression"])
+            if regressions:
+                raise CommandError(f"Slower by more than {options['max_regression']:.0%}: {', '.join(sorted(set(regressions)))}")
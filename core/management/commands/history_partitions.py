@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.services.partitions import HistoryPartitionService
+
+
+def parse_month(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}'. Expected format: YYYY-MM")
+
+
+class Command(BaseCommand):
+    help = "Pre-creates the monthly partitions of the asset owner history table and detaches (or drops) old ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=3, help="Number of months after the current one to pre-create partitions for.")
+        parser.add_argument("--from", dest="from_month", help="First month (YYYY-MM) to create partitions for. Defaults to the current month.")
+        parser.add_argument("--detach-before", dest="detach_before", help="Detach the partitions of all months before this month (YYYY-MM).")
+        parser.add_argument("--drop", action="store_true", help="Drop the detached partitions instead of keeping them as standalone tables.")
+        parser.add_argument("--force", action="store_true", help="Detach partitions even if they still hold open requisitions.")
+
+    def handle(self, *args, **options):
+        if not HistoryPartitionService.is_partitioned():
+            raise CommandError("The asset owner history table is not partitioned. Run the migrations first.")
+
+        current_month = HistoryPartitionService.get_month(timezone.now().date())
+        month = parse_month(options["from_month"]) if options["from_month"] else current_month
+        last_month = HistoryPartitionService.add_months(current_month, options["ahead"])
+
+        while month <= last_month:
+            if HistoryPartitionService.create_partition(month):
+                self.stdout.write(self.style.SUCCESS(f"Created partition {HistoryPartitionService.get_partition_name(month)}"))
+            month = HistoryPartitionService.add_months(month, 1)
+
+        if options["detach_before"]:
+            detach_before = parse_month(options["detach_before"])
+            for partition in HistoryPartitionService.get_partitions():
+                if partition == HistoryPartitionService.get_default_partition():
+                    continue
+                partition_month = datetime.strptime(partition.rsplit("_", 1)[-1], "y%Ym%m").date()
+                if partition_month >= detach_before:
+                    continue
+
+                detached, message = HistoryPartitionService.detach_partition(partition_month, drop=options["drop"], force=options["force"])
+                self.stdout.write(self.style.SUCCESS(message) if detached else self.style.WARNING(message))
@@ -0,0 +1,246 @@
+import asyncio
+import csv
+import io
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import Asset, AssetType
+
+
+# Route -> roles allowed to call it, as in the permission classes of the views.
+ROUTES = {
+    "asset-list": ("Asset User", "Asset Moderator", "Asset Admin"),
+    "asset-retrieve": ("Asset User", "Asset Moderator", "Asset Admin"),
+    "asset-assign": ("Asset Moderator", "Asset Admin"),
+    "asset-type-code": ("Asset Moderator", "Asset Admin"),
+    "file-upload": ("Asset Admin",),
+}
+DEFAULT_MIX = "asset-list=40,asset-retrieve=40,asset-assign=5,asset-type-code=10,file-upload=5"
+
+
+def get_mix(value):
+    mix = {}
+    for item in value.split(","):
+        route, _, weight = item.partition("=")
+        if route not in ROUTES:
+            raise ValueError(f"Unknown route {route}.")
+        mix[route] = float(weight)
+    return mix
+
+
+def percentile(sorted_values, share):
+    """Nearest-rank percentile of already sorted values."""
+    return sorted_values[max(0, math.ceil(share * len(sorted_values)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests a running server with a weighted mix of asset list and retrieve, asset assign, asset type code and "
+        "file upload requests, made by users of each role over concurrent keep-alive connections, and reports the "
+        "latency percentiles, throughput and error rate of every route. The ids used in the requests are sampled from "
+        "the database of this deployment, which must be the one the server uses (e.g. seeded with seed_inventory)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the server.")
+        parser.add_argument("--user", help="Email of an \"Asset User\" to make requests as.")
+        parser.add_argument("--moderator", help="Email of an \"Asset Moderator\" to make requests as.")
+        parser.add_argument("--admin", help="Email of an \"Asset Admin\" to make requests as.")
+        parser.add_argument("--password", default="Seed@1234", help="Password of the users, by default the one of seed_inventory.")
+        parser.add_argument("--mix", type=get_mix, default=get_mix(DEFAULT_MIX), help=f"Weights of the routes, default {DEFAULT_MIX}.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Number of concurrent connections.")
+        parser.add_argument("--requests", type=int, default=2_000, help="Total number of requests.")
+        parser.add_argument("--upload-rows", type=int, default=100, help="Rows of each uploaded requisition file.")
+        parser.add_argument("--sample", type=int, default=1_000, help="Number of assets sampled from the database for the requests.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed of the request mix.")
+        parser.add_argument("--output", help="Path of a JSON file to write the results to.")
+
+    def get_token(self, email, password):
+        request = Request(
+            f"{self.base_url}/login/jwt/create/",
+            data=json.dumps({"email": email, "password": password}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urlopen(request) as response:
+                return json.load(response)["access"]
+        except OSError as error:
+            raise CommandError(f"Could not log in as {email}: {error}")
+
+    def load_data(self, options):
+        """Tokens of every role, and the assets and asset types the requests are about."""
+        self.tokens = {
+            role: self.get_token(options[option], options["password"])
+            for role, option in (("Asset User", "user"), ("Asset Moderator", "moderator"), ("Asset Admin", "admin"))
+            if options[option]
+        }
+        for route in self.mix:
+            if not set(ROUTES[route]) & set(self.tokens):
+                raise CommandError(f"{route} needs one of {', '.join(ROUTES[route])}.")
+
+        # An "Asset User" only sees their own assets.
+        self.assets = {role: list(Asset.objects.order_by("id").values_list("id", "current_owner_id")[:options["sample"]]) for role in self.tokens}
+        if options["user"]:
+            self.assets["Asset User"] = list(
+                Asset.objects.filter(current_owner__email=options["user"]).order_by("id").values_list("id", "current_owner_id")[:options["sample"]]
+            )
+        self.asset_types = list(AssetType.objects.order_by("id").values_list("type", "sub_type", "group")[:options["sample"]])
+        if not all(self.assets.values()) or not self.asset_types:
+            raise CommandError("The users need assets and the database needs asset types, see seed_inventory.")
+
+    def get_requisition(self, asset_id, quantity):
+        start_date = timezone.now().date() + timedelta(days=self.generator.randint(1, 29))
+        return asset_id, quantity, start_date.isoformat(), (start_date + timedelta(days=self.generator.randint(1, 60))).isoformat()
+
+    def build_request(self, route):
+        """Method, target, body and headers of a request to the route, made by a random user allowed to call it."""
+        role = self.generator.choice([role for role in ROUTES[route] if role in self.tokens])
+        headers = {"Authorization": f"JWT {self.tokens[role]}"}
+        asset_id, owner_id = self.generator.choice(self.assets[role])
+
+        if route == "asset-list":
+            target = "/asset" if role == "Asset User" else f"/asset?current_owner={owner_id}"
+            return "GET", target, b"", headers
+        if route == "asset-retrieve":
+            return "GET", f"/asset/{asset_id}", b"", headers
+        if route == "asset-assign":
+            requisition = dict(zip(("asset_id", "quantity", "start_date", "end_date"), self.get_requisition(asset_id, 1)))
+            body = json.dumps({"user_id": owner_id, "requisitions": [requisition]}).encode()
+            return "POST", "/asset/assign", body, {**headers, "Content-Type": "application/json"}
+        if route == "asset-type-code":
+            body = json.dumps(dict(zip(("type", "sub_type", "group"), self.generator.choice(self.asset_types)))).encode()
+            return "POST", "/asset-type/code", body, {**headers, "Content-Type": "application/json"}
+
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(["User Id", "Asset ID", "Asset Quantity", "Start Date", "End Date"])
+        for _ in range(self.upload_rows):
+            asset_id, owner_id = self.generator.choice(self.assets[role])
+            requisition = self.get_requisition(asset_id, self.generator.randint(1, 5))
+            writer.writerow([owner_id, *requisition])
+        boundary = uuid.uuid4().hex
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="uploaded_file"; filename="requisitions.csv"\r\n'
+            f"Content-Type: text/csv\r\n\r\n{content.getvalue()}\r\n--{boundary}--\r\n"
+        ).encode()
+        return "POST", "/file/upload", body, {**headers, "Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+    async def read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("The server closed the connection.")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                await reader.readexactly(size + 2)
+            await reader.readline()
+        else:
+            await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers
+
+    async def send_requests(self, total):
+        """Send requests over one keep-alive connection, reconnecting after errors, until `total` requests were sent."""
+        parts = urlsplit(self.base_url)
+        connection = None
+        try:
+            while self.sent < total:
+                self.sent += 1
+                route = self.generator.choices(list(self.mix), weights=list(self.mix.values()))[0]
+                method, target, body, headers = self.build_request(route)
+                request = "".join(
+                    [f"{method} {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: keep-alive\r\nContent-Length: {len(body)}\r\n"]
+                    + [f"{name}: {value}\r\n" for name, value in headers.items()]
+                    + ["\r\n"]
+                ).encode() + body
+
+                start = time.perf_counter()
+                try:
+                    if connection is None:
+                        connection = await asyncio.open_connection(parts.hostname, parts.port or 80)
+                    reader, writer = connection
+                    writer.write(request)
+                    await writer.drain()
+                    status, response_headers = await self.read_response(reader)
+                except (OSError, ValueError, asyncio.IncompleteReadError) as error:
+                    self.results[route]["statuses"][type(error).__name__] += 1
+                    if connection is not None:
+                        connection[1].close()
+                    connection = None
+                    continue
+
+                self.results[route]["latencies"].append(time.perf_counter() - start)
+                self.results[route]["statuses"][str(status)] += 1
+                if response_headers.get("connection") == "close":
+                    connection[1].close()
+                    connection = None
+        finally:
+            if connection is not None:
+                connection[1].close()
+
+    async def load_test(self, concurrency, total):
+        self.sent = 0
+        self.results = {route: {"latencies": [], "statuses": Counter()} for route in self.mix}
+        start = time.perf_counter()
+        await asyncio.gather(*(self.send_requests(total) for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+    def get_report(self, seconds):
+        report = {}
+        for route, results in self.results.items():
+            latencies = sorted(results["latencies"])
+            requests = sum(results["statuses"].values())
+            errors = sum(count for status, count in results["statuses"].items() if not status.startswith("2"))
+            report[route] = {
+                "requests": requests,
+                "throughput": round(requests / seconds, 1),
+                "error_rate": round(errors / requests, 4) if requests else 0.0,
+                "statuses": dict(results["statuses"]),
+                **{
+                    f"p{share}_ms": round(percentile(latencies, share / 100) * 1000, 1) if latencies else None
+                    for share in (50, 95, 99)
+                },
+            }
+        return report
+
+    def handle(self, *args, **options):
+        self.base_url, self.mix, self.upload_rows = options["url"].rstrip("/"), options["mix"], options["upload_rows"]
+        self.generator = random.Random(options["seed"])
+        self.load_data(options)
+
+        seconds = asyncio.run(self.load_test(options["concurrency"], options["requests"]))
+        report = self.get_report(seconds)
+
+        self.stdout.write(f"{'route':<16}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+        for route, results in report.items():
+            self.stdout.write(
+                f"{route:<16}{results['requests']:>10}{results['throughput']:>10}{results['p50_ms'] or '-':>10}"
+                f"{results['p95_ms'] or '-':>10}{results['p99_ms'] or '-':>10}{results['error_rate']:>9.1%}"
+            )
+            failures = {status: count for status, count in results["statuses"].items() if not status.startswith("2")}
+            if failures:
+                self.stdout.write(f"  failures: {json.dumps(failures)}")
+        self.stdout.write(f"{options['requests']} requests over {options['concurrency']} connections in {seconds:.1f}s, {options['requests'] / seconds:.0f} req/s")
+
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                json.dump(
+                    {"url": self.base_url, "concurrency": options["concurrency"], "mix": self.mix, "seconds": round(seconds, 3), "routes": report},
+                    output_file,
+                    indent=2,
+                )
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.services.retention import UploadRetentionService
+
+
+class Command(BaseCommand):
+    help = "Deletes the uploaded and validated files of uploads older than the retention horizon, keeping the upload history records."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=None, help="Delete the files of uploads made more than this many days ago. Defaults to UPLOAD_FILE_RETENTION_DAYS.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of uploads handled per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+
+    def handle(self, *args, **options):
+        horizon = UploadRetentionService.get_retention_horizon(options["older_than_days"])
+        self.stdout.write(f"{'Checking' if options['dry_run'] else 'Deleting'} the files of uploads made before {horizon.isoformat()}...")
+
+        uploads, freed_bytes = UploadRetentionService.purge(horizon, batch_size=options["batch_size"], dry_run=options["dry_run"])
+        verb = "Would free" if options["dry_run"] else "Freed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {freed_bytes / 1024 / 1024:.1f} MiB from {uploads} upload(s)."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.summary import InventorySummaryService
+
+
+class Command(BaseCommand):
+    help = "Recomputes the asset inventory summary table from the assets. The summary is normally kept up to date by a database trigger."
+
+    def handle(self, *args, **options):
+        summary_rows = InventorySummaryService.rebuild_summary()
+        self.stdout.write(self.style.SUCCESS(f"Inventory summary rebuilt with {summary_rows} row(s)."))
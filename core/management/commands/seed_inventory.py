@@ -0,0 +1,302 @@
+import csv
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.models import Asset, AssetOwnerHistory, AssetType, Profile
+from core.services.summary import InventorySummaryService
+
+
+FIRST_NAMES = ("Aarav", "Ananya", "Arjun", "Diya", "Ishaan", "Kavya", "Meera", "Neha", "Priya", "Rahul", "Rohan", "Sanjay", "Sneha", "Vikram", "Zoya")
+LAST_NAMES = ("Agarwal", "Bose", "Das", "Gupta", "Iyer", "Joshi", "Kapoor", "Khan", "Menon", "Nair", "Patel", "Rao", "Reddy", "Sharma", "Singh")
+DESIGNATIONS = ("Software Engineer", "Senior Software Engineer", "QA Engineer", "DevOps Engineer", "Data Analyst", "Product Manager", "Team Lead", "IT Support")
+QUALIFICATIONS = ("B.Tech", "B.E.", "B.Sc", "BCA", "M.Tech", "MCA", "MBA", "M.Sc")
+LOCATIONS = ("Bangalore", "Pune", "Hyderabad", "Chennai", "Noida", "Mumbai", "Kolkata", "Ahmedabad")
+MANUFACTURERS = ("Dell", "Lenovo", "HP", "Apple", "Cisco", "Logitech", "Samsung", "Asus")
+
+TYPES = ("Laptop(LPT)", "Desktop(DSK)", "Monitor(MON)", "Keyboard(KBD)", "Mouse(MSE)", "Headset(HST)", "Router(RTR)", "Switch(SWT)", "Cable(CBL)", "Docking Station(DCK)")
+SUB_TYPES = ("Standard(STD)", "Premium(PRM)", "Refurbished(RFB)", "Loaner(LNR)")
+GROUPS = ("Hardware(HW)", "Peripherals(PRP)", "Networking(NET)")
+
+# Every user is in exactly one of the groups, as after UserService.make_user_mod / make_user_admin.
+ROLES = ("Asset User", "Asset Moderator", "Asset Admin")
+
+# End date of requisitions without one, as the AssetOwnerHistory.end_date default.
+OPEN_END_DATE = datetime(2999, 1, 1, tzinfo=dt_timezone.utc)
+
+# Row triggers of the assets (migrations 0006 and 0007). Fired from parallel batches, the summary trigger
+# upserts the same few summary rows from every batch and deadlocks, so both are disabled for the load
+# and their work is done once afterwards.
+ASSET_ROW_TRIGGERS = ("core_asset_search_vector_trigger", "core_asset_inventory_summary_trigger")
+
+REQUISITION_HEADERS = ["User Id", "Asset ID", "Asset Quantity", "Start Date", "End Date"]
+
+
+def get_role(user_number):
+    if user_number % 50 == 0:
+        return "Asset Admin"
+    if user_number % 10 == 0:
+        return "Asset Moderator"
+    return "Asset User"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds users, profiles, asset types, assets and asset owner history with realistic, reproducible data, "
+        "inserted in parallel batches with COPY (PostgreSQL) or bulk_create, bypassing the model signals and "
+        "validation. The asset triggers are disabled during the load; the inventory summary and search vectors are rebuilt after it. Optionally writes a requisition CSV of any size, against the seeded data, for upload testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000, help="Number of users (and profiles) to create.")
+        parser.add_argument("--asset-types", type=int, default=40, help="Number of asset types to create.")
+        parser.add_argument("--assets", type=int, default=10_000, help="Number of assets to create.")
+        parser.add_argument("--history", type=int, default=20_000, help="Number of asset owner history rows to create.")
+        parser.add_argument("--history-days", type=int, default=730, help="How far back the history goes, in days.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed of the generated data. The same seed on an empty database gives the same rows.")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per batch. Each batch is inserted in its own transaction.")
+        parser.add_argument("--workers", type=int, default=4, help="Number of batches inserted in parallel (1 on SQLite).")
+        parser.add_argument("--method", choices=("copy", "bulk_create"), default="copy", help="Insert with COPY (PostgreSQL only) or bulk_create.")
+        parser.add_argument("--password", default="Seed@1234", help="Password of every seeded user.")
+        parser.add_argument("--requisitions-csv", help="Path of a requisition CSV to write for /file/upload, against the assets and users in the database.")
+        parser.add_argument("--requisition-rows", type=int, default=1_000, help="Number of rows of the requisition CSV.")
+        parser.add_argument("--invalid-share", type=float, default=0.0, help="Share of requisition rows that fail validation (unknown asset, past start date or too large a quantity).")
+
+    def get_next_id(self, model):
+        return (model.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+
+    def insert(self, model, fields, rows):
+        """Inserts the rows, tuples of the values of `fields` (attnames), in one transaction."""
+        with transaction.atomic():
+            if self.method == "copy":
+                columns = ", ".join(connection.ops.quote_name(model._meta.get_field(field).column) for field in fields)
+                with connection.cursor() as cursor:
+                    with cursor.cursor.copy(f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN") as copy:
+                        for row in rows:
+                            copy.write_row(row)
+            else:
+                model.objects.bulk_create((model(**dict(zip(fields, row))) for row in rows), batch_size=2_000)
+
+    @contextmanager
+    def asset_row_triggers_disabled(self):
+        """Disables ASSET_ROW_TRIGGERS (PostgreSQL only) until the block exits, even on errors."""
+        if connection.vendor != "postgresql":
+            yield
+            return
+
+        table = connection.ops.quote_name(Asset._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {table} " + ", ".join(f"DISABLE TRIGGER {trigger}" for trigger in ASSET_ROW_TRIGGERS))
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {table} " + ", ".join(f"ENABLE TRIGGER {trigger}" for trigger in ASSET_ROW_TRIGGERS))
+
+    def update_asset_search_vectors(self, first_asset_id):
+        """Fills the search vector of the seeded assets in one statement, through the search vector trigger."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {connection.ops.quote_name(Asset._meta.db_table)} SET name = name WHERE id >= %s", [first_asset_id])
+
+    def run_batches(self, name, total, model, fields, generate_rows):
+        """
+        Inserts `total` rows in batches of --batch-size, --workers at a time. Each batch has its own
+        random generator, seeded from --seed and the batch offset, so the generated rows do not depend
+        on the order in which the batches run.
+        """
+        def run_batch(offset):
+            generator = random.Random(f"{self.seed}:{name}:{offset}")
+            try:
+                self.insert(model, fields, generate_rows(range(offset, min(offset + self.batch_size, total)), generator))
+            finally:
+                if self.workers > 1:
+                    connection.close()
+
+        start = time.perf_counter()
+        offsets = range(0, total, self.batch_size)
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(run_batch, offsets))
+        else:
+            for offset in offsets:
+                run_batch(offset)
+        if total:
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{name}: {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+    def seed_inventory(self, options):
+        total_users, total_types, total_assets = options["users"], options["asset_types"], options["assets"]
+        if options["history"] and not (total_users and total_assets):
+            raise CommandError("History rows need seeded users and assets.")
+        if total_assets and not (total_users and total_types):
+            raise CommandError("Assets need seeded users and asset types.")
+
+        User = get_user_model()
+        first_user_id, first_type_id, first_asset_id = self.get_next_id(User), self.get_next_id(AssetType), self.get_next_id(Asset)
+        now = timezone.now()
+        # Hashing is slow on purpose; every seeded user shares one hash.
+        password = make_password(options["password"])
+        group_ids = {name: Group.objects.get_or_create(name=name)[0].id for name in ROLES}
+
+        self.run_batches(
+            "users", total_users, User,
+            ("id", "email", "password", "is_active", "is_staff", "is_superuser"),
+            lambda numbers, generator: (
+                (first_user_id + number, f"seed-{first_user_id + number}@example.com", password, True, False, False)
+                for number in numbers
+            ),
+        )
+        self.run_batches(
+            "user groups", total_users, User.groups.through,
+            ("user_id", "group_id"),
+            lambda numbers, generator: ((first_user_id + number, group_ids[get_role(number)]) for number in numbers),
+        )
+        self.run_batches(
+            "profiles", total_users, Profile,
+            ("id", "first_name", "last_name", "designation", "qualification", "phone_number", "address", "user_id", "created_at", "modified_at"),
+            lambda numbers, generator: (
+                (
+                    uuid.UUID(int=generator.getrandbits(128), version=4),
+                    generator.choice(FIRST_NAMES),
+                    generator.choice(LAST_NAMES),
+                    generator.choice(DESIGNATIONS),
+                    generator.choice(QUALIFICATIONS),
+                    f"+91{7_000_000_000 + first_user_id + number}",
+                    f"{generator.randint(1, 999)}, {generator.choice(LOCATIONS)}",
+                    first_user_id + number,
+                    now,
+                    now,
+                )
+                for number in numbers
+            ),
+        )
+        self.run_batches(
+            "asset types", total_types, AssetType,
+            ("id", "type", "sub_type", "group", "description", "created_at", "modified_at"),
+            lambda numbers, generator: (
+                (
+                    first_type_id + number,
+                    TYPES[number % len(TYPES)] if number < len(TYPES) * len(SUB_TYPES) else f"{TYPES[number % len(TYPES)][:-1]}{number})",
+                    SUB_TYPES[number // len(TYPES) % len(SUB_TYPES)],
+                    GROUPS[number % len(GROUPS)],
+                    None,
+                    now,
+                    now,
+                )
+                for number in numbers
+            ),
+        )
+
+        def asset_rows(numbers, generator):
+            for number in numbers:
+                manufacturer = generator.choice(MANUFACTURERS)
+                yield (
+                    first_asset_id + number,
+                    f"{manufacturer} asset {first_asset_id + number}",
+                    generator.choice((None, f"Seeded asset from {manufacturer}, batch {number // self.batch_size}")),
+                    generator.randint(100, 10_000),
+                    first_user_id + generator.randrange(total_users),
+                    first_type_id + generator.randrange(total_types),
+                    generator.choice(LOCATIONS),
+                    manufacturer,
+                    now,
+                    now,
+                )
+
+        with self.asset_row_triggers_disabled():
+            self.run_batches(
+                "assets", total_assets, Asset,
+                ("id", "name", "description", "quantity", "current_owner_id", "asset_type_id", "location", "manufacturer", "created_at", "modified_at"),
+                asset_rows,
+            )
+        if total_assets and connection.vendor == "postgresql":
+            self.update_asset_search_vectors(first_asset_id)
+            InventorySummaryService.rebuild_summary()
+
+        def history_rows(numbers, generator):
+            for _ in numbers:
+                start_date = now - timedelta(days=generator.randint(0, options["history_days"]), minutes=generator.randint(0, 1_439))
+                end_date = start_date + timedelta(days=generator.randint(1, 90))
+                if generator.random() < 0.02:
+                    end_date = OPEN_END_DATE
+                yield (
+                    first_user_id + generator.randrange(total_users),
+                    first_asset_id + generator.randrange(total_assets),
+                    start_date,
+                    end_date,
+                    generator.randint(1, 5),
+                    now,
+                    now,
+                )
+
+        self.run_batches(
+            "asset owner history", options["history"], AssetOwnerHistory,
+            ("user_id", "asset_id", "start_date", "end_date", "requisition_qunatity", "created_at", "modified_at"),
+            history_rows,
+        )
+
+        # Ids were given explicitly, move the sequences past them.
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [User, AssetType, Asset]):
+                cursor.execute(sql)
+
+        if total_users:
+            for number, role in ((1, "Asset User"), (10, "Asset Moderator"), (0, "Asset Admin")):
+                if number < total_users:
+                    self.stdout.write(f"{role}: seed-{first_user_id + number}@example.com / {options['password']}")
+
+    def write_requisitions_csv(self, path, total_rows, invalid_share):
+        """
+        Streams `total_rows` requisitions of the users and assets in the database to `path`, in the
+        upload template format. Valid rows start within the next month and ask for a few units.
+        """
+        user_ids = list(get_user_model().objects.order_by("id").values_list("id", flat=True))
+        asset_ids = list(Asset.objects.order_by("id").values_list("id", flat=True))
+        if not (user_ids and asset_ids):
+            raise CommandError("The requisition CSV needs users and assets in the database.")
+
+        generator = random.Random(f"{self.seed}:requisitions")
+        today = timezone.now().date()
+        missing_asset_id = asset_ids[-1] + 1
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(REQUISITION_HEADERS)
+            for _ in range(total_rows):
+                start_date = today + timedelta(days=generator.randint(1, 29))
+                row = [generator.choice(user_ids), generator.choice(asset_ids), generator.randint(1, 5), start_date, start_date + timedelta(days=generator.randint(1, 60))]
+                if generator.random() < invalid_share:
+                    mistake = generator.randrange(3)
+                    if mistake == 0:
+                        row[1] = missing_asset_id
+                    elif mistake == 1:
+                        row[3] = today - timedelta(days=generator.randint(1, 30))
+                    else:
+                        row[2] = 10_000_000
+                writer.writerow([value.isoformat() if hasattr(value, "isoformat") else value for value in row])
+        self.stdout.write(f"{total_rows} requisitions written to {path}.")
+
+    def handle(self, *args, **options):
+        self.seed, self.batch_size = options["seed"], options["batch_size"]
+        self.method = options["method"]
+        if self.method == "copy" and connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING("COPY needs PostgreSQL, using bulk_create."))
+            self.method = "bulk_create"
+        # SQLite allows a single writer at a time.
+        self.workers = 1 if connection.vendor == "sqlite" else options["workers"]
+
+        self.seed_inventory(options)
+        if options["requisitions_csv"]:
+            self.write_requisitions_csv(options["requisitions_csv"], options["requisition_rows"], options["invalid_share"])
+        self.stdout.write(self.style.SUCCESS("Inventory seeded."))
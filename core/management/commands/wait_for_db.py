@@ -1,12 +1,29 @@
 from django.core.management.base import BaseCommand
+from django.db import connection
 from django.db.utils import OperationalError
-from psycopg2.errors import OperationalError as PostgresOperationalError
+from psycopg import OperationalError as PostgresOperationalError
 import time
 
 
 class Command(BaseCommand):
     help = "Command which checks and waits untill DB service is up and ready to accept connections."
 
+    def wait_for_pool(self):
+        """
+        With connection pooling, wait until the pool holds its minimum number of connections.
+        A pool which could not connect is closed, so the next attempt starts from a fresh one.
+        """
+        if getattr(connection, "pool", None) is None:
+            return
+        try:
+            connection.pool.open()
+            connection.pool.wait(timeout=connection.pool.timeout)
+        except Exception:
+            connection.close_pool()
+            raise
+        stats = connection.pool.get_stats()
+        self.stdout.write(f"Connection pool ready: {stats['pool_size']} connections ({stats['pool_available']} available).")
+
     def handle(self, *args, **options):
         db_ready = False
         self.stdout.write("Waiting for database service...")
@@ -14,8 +31,9 @@ class Command(BaseCommand):
         while db_ready is not True:
             try:
                 self.check(databases=["default"])
+                self.wait_for_pool()
                 db_ready = True
             except (PostgresOperationalError, OperationalError):
                 self.stdout.write(self.style.ERROR("Database connection failed!!! Waiting for 1 sec....") )
                 time.sleep(1.0)
-        self.stdout.write(self.style.SUCCESS("Connected to database service!!"))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS("Connected to database service!!"))
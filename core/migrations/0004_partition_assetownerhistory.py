@@ -0,0 +1,63 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+TABLE = "core_assetownerhistory"
+
+
+def rebuild_history_table(schema_editor, partitioned):
+    """
+    Rebuild the history table as a plain or a range partitioned (by start_date) table.
+    Existing rows, identity values and foreign keys are carried over.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    partition_clause = "PARTITION BY RANGE (start_date)" if partitioned else ""
+    primary_key = "id, start_date" if partitioned else "id"
+
+    statements = [
+        f'ALTER TABLE "{TABLE}" RENAME TO "{TABLE}_old"',
+        f'CREATE TABLE "{TABLE}" (LIKE "{TABLE}_old" INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) {partition_clause}',
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey_rebuilt" PRIMARY KEY ({primary_key})',
+    ]
+    if partitioned:
+        statements += [f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT']
+
+    statements += [
+        f'INSERT INTO "{TABLE}" OVERRIDING SYSTEM VALUE SELECT * FROM "{TABLE}_old"',
+        f"SELECT setval(pg_get_serial_sequence('\"{TABLE}\"', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM \"{TABLE}\"",
+        f'DROP TABLE "{TABLE}_old" CASCADE',
+        f'ALTER TABLE "{TABLE}" RENAME CONSTRAINT "{TABLE}_pkey_rebuilt" TO "{TABLE}_pkey"',
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_asset_id_fk_core_asset_id" FOREIGN KEY (asset_id) REFERENCES "core_asset" (id) DEFERRABLE INITIALLY DEFERRED',
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_user_id_fk_core_user_id" FOREIGN KEY (user_id) REFERENCES "core_user" (id) DEFERRABLE INITIALLY DEFERRED',
+        f'CREATE INDEX "{TABLE}_asset_id_idx" ON "{TABLE}" (asset_id)',
+        f'CREATE INDEX "{TABLE}_user_id_idx" ON "{TABLE}" (user_id)',
+    ]
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def partition_history(apps, schema_editor):
+    rebuild_history_table(schema_editor, partitioned=True)
+
+
+def unpartition_history(apps, schema_editor):
+    rebuild_history_table(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_assetfileuploadhistory_uploaded_file_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_history, unpartition_history),
+        migrations.AddIndex(
+            model_name='assetownerhistory',
+            index=models.Index(fields=['asset', 'end_date'], name='history_asset_end_date_idx'),
+        ),
+    ]
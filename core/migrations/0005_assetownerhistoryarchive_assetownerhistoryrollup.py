@@ -0,0 +1,44 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_partition_assetownerhistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetOwnerHistoryArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('history_id', models.BigIntegerField()),
+                ('asset_id', models.BigIntegerField(db_index=True, null=True)),
+                ('user_id', models.BigIntegerField(null=True)),
+                ('start_date', models.DateTimeField()),
+                ('end_date', models.DateTimeField()),
+                ('requisition_qunatity', models.PositiveIntegerField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AssetOwnerHistoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('requisition_count', models.PositiveIntegerField(default=0)),
+                ('total_quantity', models.PositiveBigIntegerField(default=0)),
+                ('first_start_date', models.DateTimeField()),
+                ('last_end_date', models.DateTimeField()),
+                ('asset', models.ForeignKey(null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='history_rollups', to='core.asset')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='asset_history_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('asset', 'user', 'month'), name='unique_history_rollup', nulls_distinct=False)],
+            },
+        ),
+    ]
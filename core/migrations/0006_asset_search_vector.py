@@ -0,0 +1,91 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:52
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Mirrors AssetType.code: the text inside the last "(...)" of type, sub_type and group.
+ASSET_TYPE_CODE_SQL = """concat_ws('-',
+    left(regexp_replace(asset_type.type, '^.*\\(', ''), -1),
+    left(regexp_replace(asset_type.sub_type, '^.*\\(', ''), -1),
+    left(regexp_replace(asset_type."group", '^.*\\(', ''), -1)
+)"""
+
+CREATE_TRIGGERS_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION core_asset_search_vector_update() RETURNS trigger AS $$
+    DECLARE
+        asset_type core_assettype%ROWTYPE;
+    BEGIN
+        SELECT * INTO asset_type FROM core_assettype WHERE id = NEW.asset_type_id;
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('english', concat_ws(' ', asset_type.type, asset_type.sub_type, asset_type."group", {ASSET_TYPE_CODE_SQL})), 'B') ||
+            setweight(to_tsvector('english', concat_ws(' ', NEW.description, NEW.location, NEW.manufacturer)), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER core_asset_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, location, manufacturer, asset_type_id ON core_asset
+    FOR EACH ROW EXECUTE FUNCTION core_asset_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION core_assettype_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE core_asset SET asset_type_id = asset_type_id WHERE asset_type_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER core_assettype_search_vector_trigger
+    AFTER UPDATE OF type, sub_type, "group" ON core_assettype
+    FOR EACH ROW EXECUTE FUNCTION core_assettype_search_vector_update()
+    """,
+    # Backfill the search vector of the existing assets.
+    "UPDATE core_asset SET asset_type_id = asset_type_id",
+]
+
+DROP_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS core_assettype_search_vector_trigger ON core_assettype",
+    "DROP FUNCTION IF EXISTS core_assettype_search_vector_update()",
+    "DROP TRIGGER IF EXISTS core_asset_search_vector_trigger ON core_asset",
+    "DROP FUNCTION IF EXISTS core_asset_search_vector_update()",
+]
+
+
+def create_search_vector_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in CREATE_TRIGGERS_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+def drop_search_vector_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in DROP_TRIGGERS_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_assetownerhistoryarchive_assetownerhistoryrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='asset_search_vector_idx'),
+        ),
+        migrations.RunPython(create_search_vector_triggers, drop_search_vector_triggers),
+    ]
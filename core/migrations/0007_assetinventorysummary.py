@@ -0,0 +1,93 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+CREATE_TRIGGER_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION core_asset_inventory_summary_update() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.asset_type_id = NEW.asset_type_id AND OLD.location = NEW.location THEN
+            IF NEW.quantity <> OLD.quantity THEN
+                UPDATE core_assetinventorysummary
+                SET total_quantity = total_quantity + NEW.quantity - OLD.quantity
+                WHERE asset_type_id = NEW.asset_type_id AND location = NEW.location;
+            END IF;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE core_assetinventorysummary
+            SET total_quantity = total_quantity - OLD.quantity, asset_count = asset_count - 1
+            WHERE asset_type_id = OLD.asset_type_id AND location = OLD.location;
+            DELETE FROM core_assetinventorysummary
+            WHERE asset_type_id = OLD.asset_type_id AND location = OLD.location AND asset_count = 0;
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO core_assetinventorysummary (asset_type_id, location, total_quantity, asset_count)
+            VALUES (NEW.asset_type_id, NEW.location, NEW.quantity, 1)
+            ON CONFLICT (asset_type_id, location) DO UPDATE SET
+                total_quantity = core_assetinventorysummary.total_quantity + EXCLUDED.total_quantity,
+                asset_count = core_assetinventorysummary.asset_count + 1;
+        END IF;
+
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER core_asset_inventory_summary_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF quantity, location, asset_type_id ON core_asset
+    FOR EACH ROW EXECUTE FUNCTION core_asset_inventory_summary_update()
+    """,
+    # Summarise the existing assets.
+    """
+    INSERT INTO core_assetinventorysummary (asset_type_id, location, total_quantity, asset_count)
+    SELECT asset_type_id, location, SUM(quantity), COUNT(*) FROM core_asset GROUP BY asset_type_id, location
+    """,
+]
+
+DROP_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS core_asset_inventory_summary_trigger ON core_asset",
+    "DROP FUNCTION IF EXISTS core_asset_inventory_summary_update()",
+]
+
+
+def create_summary_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in CREATE_TRIGGER_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_summary_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in DROP_TRIGGER_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_asset_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetInventorySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=100)),
+                ('total_quantity', models.PositiveBigIntegerField(default=0)),
+                ('asset_count', models.PositiveIntegerField(default=0)),
+                ('asset_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory_summary', to='core.assettype')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('asset_type', 'location'), name='unique_inventory_summary')],
+            },
+        ),
+        migrations.RunPython(create_summary_trigger, drop_summary_trigger),
+    ]
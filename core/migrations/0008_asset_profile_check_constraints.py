@@ -0,0 +1,39 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:55
+
+import django.db.models.functions.text
+import django.db.models.lookups
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_assetinventorysummary'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='asset',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('name'), 5), name='asset_name_min_length'),
+        ),
+        migrations.AddConstraint(
+            model_name='asset',
+            constraint=models.CheckConstraint(condition=models.Q(('description__isnull', True), ('description', ''), django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('description'), 10), _connector='OR'), name='asset_description_min_length'),
+        ),
+        migrations.AddConstraint(
+            model_name='asset',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('location'), 1), name='asset_location_min_length'),
+        ),
+        migrations.AddConstraint(
+            model_name='asset',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('manufacturer'), 1), name='asset_manufacturer_min_length'),
+        ),
+        migrations.AddConstraint(
+            model_name='profile',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('first_name'), 1), name='profile_first_name_min_length'),
+        ),
+        migrations.AddConstraint(
+            model_name='profile',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.GreaterThanOrEqual(django.db.models.functions.text.Length('designation'), 1), name='profile_designation_min_length'),
+        ),
+    ]
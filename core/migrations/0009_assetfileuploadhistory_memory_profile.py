@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_asset_profile_check_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetfileuploadhistory',
+            name='memory_profile',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
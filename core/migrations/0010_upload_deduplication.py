@@ -0,0 +1,79 @@
+# Generated by Django 5.1.5 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+# Tables whose rows the file validation reads. Every statement writing to them moves the inventory
+# generation forward. A sequence is not transactional and takes no row lock, so concurrent writers
+# do not queue on the counter.
+TRACKED_TABLES = ["core_asset", "core_assetownerhistory", "core_user"]
+
+CREATE_GENERATION_SQL = [
+    "CREATE SEQUENCE IF NOT EXISTS core_inventory_generation",
+    """
+    CREATE OR REPLACE FUNCTION core_inventory_generation_bump() RETURNS trigger AS $$
+    BEGIN
+        PERFORM nextval('core_inventory_generation');
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+] + [
+    f"""
+    CREATE TRIGGER {table}_inventory_generation_trigger
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+    FOR EACH STATEMENT EXECUTE FUNCTION core_inventory_generation_bump()
+    """
+    for table in TRACKED_TABLES
+]
+
+DROP_GENERATION_SQL = [
+    f"DROP TRIGGER IF EXISTS {table}_inventory_generation_trigger ON {table}" for table in TRACKED_TABLES
+] + [
+    "DROP FUNCTION IF EXISTS core_inventory_generation_bump()",
+    "DROP SEQUENCE IF EXISTS core_inventory_generation",
+]
+
+
+def create_generation_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in CREATE_GENERATION_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_generation_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in DROP_GENERATION_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_assetfileuploadhistory_memory_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetfileuploadhistory',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='assetfileuploadhistory',
+            name='inventory_generation',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='assetfileuploadhistory',
+            name='is_valid',
+            field=models.BooleanField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='assetfileuploadhistory',
+            index=models.Index(fields=['uploaded_by', 'content_hash'], name='upload_user_content_hash_idx'),
+        ),
+        migrations.RunPython(create_generation_triggers, drop_generation_triggers),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_upload_deduplication'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetfileuploadhistory',
+            name='validation_results',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
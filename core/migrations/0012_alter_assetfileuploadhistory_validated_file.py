@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_assetfileuploadhistory_validation_results'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assetfileuploadhistory',
+            name='validated_file',
+            field=models.FileField(null=True, upload_to=''),
+        ),
+    ]
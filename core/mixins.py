@@ -0,0 +1,24 @@
+from .routers import replica_reads
+from .services.replicas import ReplicaService
+
+
+class ReplicaReadMixin:
+    """
+    Runs the `replica_read_actions` of a viewset against a read replica. Authentication and
+    permission checks still read from the primary, and so does a user pinned to the primary
+    right after a write.
+    """
+
+    replica_read_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_read_actions and not ReplicaService.is_user_pinned(request.user):
+            self.replica_reads_token = replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "replica_reads_token", None)
+        if token is not None:
+            replica_reads.reset(token)
+            self.replica_reads_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
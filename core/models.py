@@ -3,8 +3,13 @@
 
 import datetime
 import uuid
-from django.db import models
+from django.db import IntegrityError, models
+from django.db.models.functions import Length
+from django.db.models.lookups import GreaterThanOrEqual
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator
 from django.utils import timezone
 from .managers import UserManager
@@ -23,6 +28,69 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ValidatedModel(BaseModel):
+    """
+    Abstract model for models whose rules are enforced both by full_clean() and by database constraints.
+
+    Trusted internal writers can call `save(validate=False)` to skip full_clean() and its extra queries.
+    The database constraints still apply, and their violations are raised as the same ValidationError
+    full_clean() would have raised.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, validate=True, **kwargs):
+        """
+        Save the instance, after performing full validation unless `validate` is False.
+
+        Args:
+            *args: Variable length argument list.
+            validate (bool): Whether to run full_clean() before saving. Defaults to True.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            The saved instance.
+        """
+        if validate:
+            # The check constraints mirror the field validators, so checking them again here would only add queries.
+            self.full_clean(validate_constraints=False)
+            return super().save(*args, **kwargs)
+
+        try:
+            return super().save(*args, **kwargs)
+        except IntegrityError as error:
+            validation_error = self.get_constraint_validation_error(error)
+            if validation_error is None:
+                raise
+            raise validation_error from error
+
+    def get_constraint_validation_error(self, error: IntegrityError) -> ValidationError | None:
+        """
+        Translate a database constraint violation into the ValidationError full_clean() would raise.
+        Does not query the database, as the transaction may already be aborted.
+        """
+        try:
+            # Relation fields are excluded, validating them would look the related rows up.
+            self.clean_fields(exclude=[field.name for field in self._meta.fields if field.is_relation])
+        except ValidationError as validation_error:
+            return validation_error
+
+        constraint_name = getattr(getattr(error.__cause__, "diag", None), "constraint_name", None) or ""
+
+        for field in self._meta.fields:
+            if field.unique and constraint_name.startswith(f"{self._meta.db_table}_{field.column}_"):
+                return ValidationError({field.name: [self.unique_error_message(type(self), (field.name,))]})
+
+        for constraint in self._meta.constraints:
+            if constraint.name == constraint_name:
+                return ValidationError(constraint.get_violation_error_message(), code=constraint.violation_error_code)
+
+        return None
+
+
 class User(AbstractBaseUser, PermissionsMixin):
     """
 
@@ -55,7 +123,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["password"]
 
-class Profile(BaseModel):
+class Profile(ValidatedModel):
 
     """
     Profile model to store additional information about the user.
@@ -79,19 +147,11 @@ class Profile(BaseModel):
     address = models.TextField(blank=True, null=True)
     user = models.OneToOneField(to="core.User", on_delete=models.CASCADE, related_name="profile")
 
-    def save(self, *args, **kwargs):
-        """
-        Save the Profile instance after performing full validation.
-
-        Args:
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
-
-        Returns:
-            The saved Profile instance.
-        """
-        self.full_clean()
-        return super().save(*args, **kwargs)
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=GreaterThanOrEqual(Length("first_name"), 1), name="profile_first_name_min_length"),
+            models.CheckConstraint(condition=GreaterThanOrEqual(Length("designation"), 1), name="profile_designation_min_length"),
+        ]
 
 class AssetType(BaseModel):
     """
@@ -118,7 +178,7 @@ class AssetType(BaseModel):
         return type_code
 
 
-class Asset(BaseModel):
+class Asset(ValidatedModel):
     """
     Asset model represents individual assets in the inventory management system.
     Attributes:
@@ -129,6 +189,7 @@ class Asset(BaseModel):
         asset_type (AssetType): The type of asset. It is a required field and is linked to the AssetType model.
         location (str): The location where the asset is stored. It is a required field with a maximum length of 100 characters.
         manufacturer (str): The manufacturer of the asset. It is a required field with a maximum length of 100 characters.
+        search_vector (SearchVectorField): Full-text search document over the asset and its type. Maintained by a database trigger.
     """
 
     name = models.CharField(max_length=100, null=False, blank=False, validators=[MinLengthValidator(5)])
@@ -138,29 +199,54 @@ class Asset(BaseModel):
     asset_type = models.ForeignKey(to="core.AssetType", on_delete=models.CASCADE, related_name="assets")
     location = models.CharField(max_length=100, null=False, blank=False, validators=[MinLengthValidator(1)])
     manufacturer = models.CharField(max_length=100, null=False, blank=False, validators=[MinLengthValidator(1)])
+    search_vector = SearchVectorField(null=True, editable=False)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="asset_search_vector_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=GreaterThanOrEqual(Length("name"), 5), name="asset_name_min_length"),
+            models.CheckConstraint(
+                condition=models.Q(description__isnull=True) | models.Q(description="") | models.Q(GreaterThanOrEqual(Length("description"), 10)),
+                name="asset_description_min_length",
+            ),
+            models.CheckConstraint(condition=GreaterThanOrEqual(Length("location"), 1), name="asset_location_min_length"),
+            models.CheckConstraint(condition=GreaterThanOrEqual(Length("manufacturer"), 1), name="asset_manufacturer_min_length"),
+        ]
+
+
+
+class AssetInventorySummary(models.Model):
+    """
+    AssetInventorySummary model holds the asset totals per asset type and location.
+    Rows are maintained incrementally by a database trigger on every Asset insert, update and delete,
+    so grouped totals are computed from this small table instead of the assets themselves.
+    Attributes:
+        asset_type (ForeignKey): The type of the summarised assets.
+        location (CharField): The location of the summarised assets.
+        total_quantity (PositiveBigIntegerField): The sum of the quantities of the summarised assets.
+        asset_count (PositiveIntegerField): The number of summarised assets.
+    """
 
+    asset_type = models.ForeignKey(to="core.AssetType", on_delete=models.CASCADE, related_name="inventory_summary")
+    location = models.CharField(max_length=100)
+    total_quantity = models.PositiveBigIntegerField(default=0)
+    asset_count = models.PositiveIntegerField(default=0)
 
-    def save(self, *args, **kwargs):
-        """
-        Save the Asset instance after performing full validation.
-
-        Args:
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
-
-        Returns:
-            The saved Asset instance.
-        """
-        self.full_clean()
-        return super().save(*args, **kwargs)
-
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["asset_type", "location"], name="unique_inventory_summary"),
+        ]
 
 
 class AssetOwnerHistory(BaseModel):
 
     """
     AssetOwnerHistory model to track the ownership history of assets.
+
+    The underlying table is range partitioned by month of `start_date` (see the
+    `history_partitions` management command), so its primary key is (id, start_date).
     Attributes:
         user (ForeignKey): A reference to the User who owns the asset.
         asset (ForeignKey): A reference to the Asset being owned.
@@ -174,6 +260,64 @@ class AssetOwnerHistory(BaseModel):
     end_date = models.DateTimeField(default=datetime.datetime(2999, 1, 1))
     requisition_qunatity = models.PositiveIntegerField(null=False, blank=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["asset", "end_date"], name="history_asset_end_date_idx"),
+        ]
+
+
+
+class AssetOwnerHistoryArchive(models.Model):
+
+    """
+    AssetOwnerHistoryArchive model keeps a compact copy of closed requisitions moved out of AssetOwnerHistory.
+    Rows are written by the `archive_history` management command and are only read for audits.
+    Attributes:
+        history_id (BigIntegerField): The id of the archived AssetOwnerHistory row.
+        asset_id (BigIntegerField): The id of the asset that was owned.
+        user_id (BigIntegerField): The id of the user who owned the asset.
+        start_date (DateTimeField): The date and time when the user started owning the asset.
+        end_date (DateTimeField): The date and time when the user stopped owning the asset.
+        requisition_qunatity (PositiveIntegerField): The quantity of the asset that was owned.
+        archived_at (DateTimeField): The date and time when the row was archived. Auto-generated.
+    """
+
+    history_id = models.BigIntegerField()
+    asset_id = models.BigIntegerField(null=True, db_index=True)
+    user_id = models.BigIntegerField(null=True)
+    start_date = models.DateTimeField()
+    end_date = models.DateTimeField()
+    requisition_qunatity = models.PositiveIntegerField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class AssetOwnerHistoryRollup(models.Model):
+
+    """
+    AssetOwnerHistoryRollup model summarises the archived requisitions of an asset per user and month.
+    History endpoints union these rollups with the live AssetOwnerHistory rows.
+    Attributes:
+        asset (ForeignKey): A reference to the Asset that was owned.
+        user (ForeignKey): A reference to the User who owned the asset.
+        month (DateField): The first day of the month the requisitions started in.
+        requisition_count (PositiveIntegerField): The number of archived requisitions.
+        total_quantity (PositiveBigIntegerField): The sum of the archived requisition quantities.
+        first_start_date (DateTimeField): The earliest start date of the archived requisitions.
+        last_end_date (DateTimeField): The latest end date of the archived requisitions.
+    """
+
+    asset = models.ForeignKey(to="core.Asset", related_name="history_rollups", on_delete=models.DO_NOTHING, null=True)
+    user = models.ForeignKey(to="core.User", related_name="asset_history_rollups", on_delete=models.DO_NOTHING, null=True)
+    month = models.DateField()
+    requisition_count = models.PositiveIntegerField(default=0)
+    total_quantity = models.PositiveBigIntegerField(default=0)
+    first_start_date = models.DateTimeField()
+    last_end_date = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["asset", "user", "month"], name="unique_history_rollup", nulls_distinct=False),
+        ]
 
 
 class AssetFileUploadHistory(models.Model):
@@ -181,5 +325,19 @@ class AssetFileUploadHistory(models.Model):
     uploaded_by = models.ForeignKey(to="core.User", related_name="file_upload_history", on_delete=models.DO_NOTHING, null=True)
     uploaded_file = models.FileField(upload_to="uploaded-files")
     validated_file = models.FileField(null=True)
+    # Memory usage per stage of the validation, when FILE_MEMORY_PROFILING is on (see MemoryService).
+    memory_profile = models.JSONField(null=True, blank=True)
+    # SHA-256 of the uploaded bytes, the inventory generation the file was validated at and the
+    # outcome, so a re-upload of the same file can reuse the result (see UploadDeduplicationService).
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    inventory_generation = models.BigIntegerField(null=True, blank=True)
+    is_valid = models.BooleanField(null=True, blank=True)
+    # Per row and per asset results, kept on the user's latest upload for the incremental validation of the next one.
+    validation_results = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["uploaded_by", "content_hash"], name="upload_user_content_hash_idx"),
+        ]
 
 
@@ -1,13 +1,25 @@
 from rest_framework.permissions import BasePermission
 
-class IsAssetAdmin(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.groups.filter(name="Asset Admin").exists()
 
-class IsAssetNormalUser(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.groups.filter(name="Asset User").exists()
+class GroupPermission(BasePermission):
+    """
+    Grants access to the members of `group_name`.
+    `ahas_permission` is the async variant used by the async views.
+    """
+
+    group_name = None
 
-class IsAssetModerator(BasePermission):
     def has_permission(self, request, view):
-        return request.user.groups.filter(name="Asset Moderator").exists()
+        return request.user.groups.filter(name=self.group_name).exists()
+
+    async def ahas_permission(self, request, view):
+        return await request.user.groups.filter(name=self.group_name).aexists()
+
+class IsAssetAdmin(GroupPermission):
+    group_name = "Asset Admin"
+
+class IsAssetNormalUser(GroupPermission):
+    group_name = "Asset User"
+
+class IsAssetModerator(GroupPermission):
+    group_name = "Asset Moderator"
@@ -0,0 +1,19 @@
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from core.services.metrics import current_request_metrics
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer recording the time spent rendering the response data of sampled requests (see MetricsService)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        metrics = current_request_metrics.get()
+        if metrics is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        start = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics.render_time += time.perf_counter() - start
@@ -0,0 +1,30 @@
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS
+
+from .services.replicas import ReplicaService
+
+
+# Set while a view reads data that may come from a read replica (see ReplicaReadMixin).
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of views which asked for it to an available read replica.
+    All writes, and all other reads, go to the primary. Migrations only run on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get():
+            return ReplicaService.get_available_replica()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
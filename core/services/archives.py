@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import AssetOwnerHistory, AssetOwnerHistoryArchive, AssetOwnerHistoryRollup
+
+
+class HistoryArchiveService:
+    """
+    Moves closed requisitions out of the live AssetOwnerHistory table.
+    Every archived row is copied to AssetOwnerHistoryArchive and added to the
+    (asset, user, month) AssetOwnerHistoryRollup it belongs to.
+    """
+
+    @staticmethod
+    def get_archive_horizon(days: int | None = None):
+        if days is None:
+            days = settings.ASSET_HISTORY_ARCHIVE_AFTER_DAYS
+        return timezone.now() - timedelta(days=days)
+
+    @staticmethod
+    def archive_batch(horizon, batch_size: int) -> int:
+        """
+        Archive up to `batch_size` requisitions that ended before `horizon`.
+        The delete, the archive insert and the rollup upsert run as a single statement.
+        Returns the number of archived rows.
+        """
+        history = AssetOwnerHistory._meta.db_table
+        archive = AssetOwnerHistoryArchive._meta.db_table
+        rollup = AssetOwnerHistoryRollup._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM "{history}"
+                    WHERE id IN (SELECT id FROM "{history}" WHERE end_date < %s ORDER BY id LIMIT %s)
+                    RETURNING id, asset_id, user_id, start_date, end_date, requisition_qunatity
+                ),
+                archived AS (
+                    INSERT INTO "{archive}" (history_id, asset_id, user_id, start_date, end_date, requisition_qunatity, archived_at)
+                    SELECT id, asset_id, user_id, start_date, end_date, requisition_qunatity, now() FROM moved
+                ),
+                rolled_up AS (
+                    INSERT INTO "{rollup}" AS rollup (asset_id, user_id, month, requisition_count, total_quantity, first_start_date, last_end_date)
+                    SELECT asset_id, user_id, date_trunc('month', start_date AT TIME ZONE 'UTC')::date,
+                           COUNT(*), SUM(requisition_qunatity), MIN(start_date), MAX(end_date)
+                    FROM moved
+                    GROUP BY 1, 2, 3
+                    ON CONFLICT ON CONSTRAINT unique_history_rollup DO UPDATE SET
+                        requisition_count = rollup.requisition_count + EXCLUDED.requisition_count,
+                        total_quantity = rollup.total_quantity + EXCLUDED.total_quantity,
+                        first_start_date = LEAST(rollup.first_start_date, EXCLUDED.first_start_date),
+                        last_end_date = GREATEST(rollup.last_end_date, EXCLUDED.last_end_date)
+                )
+                SELECT COUNT(*) FROM moved
+                """,
+                [horizon, batch_size],
+            )
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def archive(horizon, batch_size: int = 5000) -> int:
+        archived_rows = 0
+        while True:
+            batch_rows = HistoryArchiveService.archive_batch(horizon, batch_size)
+            archived_rows += batch_rows
+            if batch_rows < batch_size:
+                return archived_rows
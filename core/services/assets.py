@@ -1,8 +1,15 @@
-from core.models import Asset, AssetOwnerHistory
+from core.log import is_row_sampled
+from core.models import Asset, AssetOwnerHistory, AssetOwnerHistoryRollup, AssetType
+from core.services.users import UserService
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import BooleanField, Count, F, IntegerField, Max, Value
 
 from datetime import datetime, timedelta
+import logging
+
+logger = logging.getLogger("inventory.assets")
 
 
 class AssetService:
@@ -30,6 +37,50 @@ class AssetService:
     def get_user_assets(user: get_user_model):
         return user.assets
 
+    @staticmethod
+    def get_default_owner():
+        """New assets are owned by the first superuser until they are assigned."""
+        return UserService.filter_user(is_superuser=True).order_by("id").first()
+
+    @staticmethod
+    def get_existing_asset_type_ids(asset_type_ids) -> set:
+        return set(AssetType.objects.filter(id__in=set(asset_type_ids)).values_list("id", flat=True))
+
+    @staticmethod
+    def bulk_create_assets(asset_rows: list, owner, chunk_size: int) -> int:
+        """
+        Insert already validated asset rows in chunks, all or nothing.
+        Skips Asset.save() (and its full_clean()), so the rows must have been validated beforehand.
+        The database constraints still apply.
+        """
+        with transaction.atomic():
+            for offset in range(0, len(asset_rows), chunk_size):
+                Asset.objects.bulk_create(
+                    [Asset(current_owner=owner, **asset_row) for asset_row in asset_rows[offset:offset + chunk_size]]
+                )
+        return len(asset_rows)
+
+    @staticmethod
+    def get_asset_states(asset_ids) -> dict:
+        """
+        A fingerprint of everything the file validation reads about each existing asset: its last
+        modification and the last modification and number of its open requisitions. Two queries for all the assets.
+        """
+        asset_ids = {int(asset_id) for asset_id in asset_ids}
+        modified = dict(Asset.objects.filter(id__in=asset_ids).values_list("id", "modified_at"))
+        open_requisitions = {
+            row["asset"]: row
+            for row in AssetOwnerHistory.objects.filter(asset__in=asset_ids, end_date__gte=datetime.now())
+            .values("asset")
+            .annotate(last_modified=Max("modified_at"), count=Count("id"))
+        }
+
+        states = {}
+        for asset_id, modified_at in modified.items():
+            requisitions = open_requisitions.get(asset_id)
+            states[asset_id] = f"{modified_at.isoformat()}|{requisitions['last_modified'].isoformat()}|{requisitions['count']}" if requisitions else modified_at.isoformat()
+        return states
+
     def get_date(date:str):
         year, month, day = tuple(map(int, date.split("-")))
         return datetime(year, month, day)
@@ -68,7 +119,6 @@ class AssetService:
 
         for requisition in requisitions:
             requisition_values = requisition.values()
-            print("requisition_values", requisition_values)
             if len(requisition_values) == 4:
                 asset_id, requisition_quantity, requisition_start_date, requisition_end_date = requisition.values()
             elif len(requisition_values) == 3:
@@ -82,7 +132,8 @@ class AssetService:
                 validation_quantity_res = AssetService.validate_requisition_quantity(asset, requisition_quantity)
                 validation_dates_res = AssetService.validate_requisition_dates(asset, requisition_start_date, requisition_end_date)
 
-                print(validation_quantity_res, validation_dates_res)
+                if is_row_sampled(logger):
+                    logger.debug("Validated requisition %s: quantity %s, dates %s", list(requisition_values), validation_quantity_res, validation_dates_res)
 
                 if validation_quantity_res != "ok" :
                     quantity_validation_errors += validation_quantity_res
@@ -116,6 +167,16 @@ class AssetService:
             validation_result = {
                 "assets_and_requisitions": assets_and_requisitions,
             }
+        logger.info(
+            "Validated %d requisitions: %d assets not found, %d quantity errors, %d date errors",
+            len(requisitions), len(asset_not_found_errors), len(quantity_validation_errors), len(date_validation_error),
+            extra={
+                "requisitions": len(requisitions),
+                "assets_not_found": len(asset_not_found_errors),
+                "quantity_errors": len(quantity_validation_errors),
+                "date_errors": len(date_validation_error),
+            },
+        )
         return (validation_success, validation_result)
 
     def create_requisition_record(
@@ -131,16 +192,17 @@ class AssetService:
 
     def assign_asset_to_user(asset, user, requisition_quantity):
         asset.current_owner = user
-        print("Before:- ", asset.quantity)
         asset.quantity -= requisition_quantity
-        print("After:- ", asset.quantity)
-        asset.save()
+        if is_row_sampled(logger):
+            logger.debug("Assigned %s of asset %s to user %s, %s left", requisition_quantity, asset.pk, user.pk, asset.quantity)
+        # Trusted write: the quantity was validated with the requisition, the database constraints cover the rest.
+        asset.save(validate=False, update_fields=["current_owner", "quantity", "modified_at"])
 
     @staticmethod
     def assign(user, validation_result):
 
         assets_and_requisitions = validation_result.get("assets_and_requisitions")
-        print(assets_and_requisitions)
+        logger.info("Assigning %d requisitions to user %s", len(assets_and_requisitions), user.pk, extra={"requisitions": len(assets_and_requisitions), "user_id": user.pk})
 
         # assigning asset(s) to user
         set(
@@ -163,7 +225,35 @@ class AssetOwnerHistoryService:
 
     @staticmethod
     def get_asset_owner_history(asset_id: int):
-        if AssetOwnerHistory.objects.filter(asset=asset_id).exists():
-            return AssetOwnerHistory.objects.filter(asset=asset_id)
-        else:
-            return AssetOwnerHistory.objects.none()
+        return AssetOwnerHistory.objects.filter(asset=asset_id)
+
+    @staticmethod
+    def get_asset_owner_timeline(asset_id: int):
+        """
+        Live requisitions of the asset unioned with the monthly rollups of its archived requisitions,
+        newest first. Each entry has the keys: owner_id, period_start, period_end, quantity, requisitions, archived.
+        """
+        live_requisitions = AssetOwnerHistory.objects.filter(asset=asset_id).annotate(
+            owner_id=F("user_id"),
+            period_start=F("start_date"),
+            period_end=F("end_date"),
+            quantity=F("requisition_qunatity"),
+            requisitions=Value(1, output_field=IntegerField()),
+            archived=Value(False, output_field=BooleanField()),
+        )
+        archived_requisitions = AssetOwnerHistoryRollup.objects.filter(asset=asset_id).annotate(
+            owner_id=F("user_id"),
+            period_start=F("first_start_date"),
+            period_end=F("last_end_date"),
+            quantity=F("total_quantity"),
+            requisitions=F("requisition_count"),
+            archived=Value(True, output_field=BooleanField()),
+        )
+        fields = ("owner_id", "period_start", "period_end", "quantity", "requisitions", "archived")
+
+        return live_requisitions.values(*fields).union(archived_requisitions.values(*fields), all=True).order_by("-period_start")
+
+    @staticmethod
+    def get_open_requisitions(asset_id: int):
+        # Served by the (asset, end_date) index; closed months are detached by `history_partitions`.
+        return AssetOwnerHistory.objects.filter(asset=asset_id, end_date__gte=datetime.now())
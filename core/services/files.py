@@ -1,20 +1,27 @@
-from datetime import datetime
+from datetime import date, datetime
+import hashlib
+import logging
 import os
+import time
+import zipfile
 from django.conf import settings
-from pandas import DataFrame as df, read_csv
 from operator import attrgetter
 from itertools import chain
 from typing import Dict
 
 from core.exceptions import raise_400_exception
+from core.log import is_row_sampled
 from core.services.assets import AssetService, AssetOwnerHistoryService
+from core.services.memory import MemoryService
 from core.services.users import UserService
 
+logger = logging.getLogger("inventory.files")
+
 class TimeLineUnit:
     def __init__(self, date, start_date_qunatity=0, end_date_qunatity=0):
         self.date = date
-        self.start_date_qunatity += start_date_qunatity
-        self.end_date_qunatity += end_date_qunatity
+        self.start_date_qunatity = start_date_qunatity
+        self.end_date_qunatity = end_date_qunatity
 
     def __str__(self):
         return f'{self.date.__str__()}::{self.start_date_qunatity}::{self.end_date_qunatity}\n'
@@ -22,12 +29,17 @@ class TimeLineUnit:
 
 
 class FileValidationService:
+    ROW_COLUMNS = ["User Id", "Asset ID", "Asset Quantity", "Start Date", "End Date"]
+    EXTENSIONS = ("csv", "xlsx", "parquet", "arrow")
+    # Rows of a spreadsheet collected before they are turned into typed DataFrame columns.
+    XLSX_CHUNK_ROWS = 10_000
+
     def __create_timeline(assets_to_be_assigned, assets_to_be_returned):
         timeline: Dict[datetime.date, TimeLineUnit] = {}
 
         # creating a timeline for the assets to be assigned.
         for idx, row in assets_to_be_assigned.iterrows():
-            start_date, end_date = datetime.strptime(row["Start Date"], "%Y-%m-%d"), datetime.strptime( row["Start Date"], "%Y-%m-%d")
+            start_date, end_date = datetime.strptime(row["Start Date"], "%Y-%m-%d").date(), datetime.strptime(row["End Date"], "%Y-%m-%d").date()
 
             if start_date not in timeline:
                 timeline[start_date] = TimeLineUnit(date=start_date, start_date_qunatity=row["Asset Quantity"])
@@ -68,16 +80,15 @@ class FileValidationService:
         """
         # Find the current quantity of the asset in the db.
         asset = AssetService.get_asset_by_id(asset_id)
+        if asset is None:
+            # Unknown assets are already reported by the row wise validation.
+            return True, []
         current_quantity, current_date = asset.quantity, datetime.now().date()
         totality_check = True
 
-        print("Current Asset ID: ", asset_id)
-        print("Current Date: ", current_date)
-        print("Current Quantity: ", current_quantity)
-
         timeline = FileValidationService.__create_timeline(assets_to_be_assigned, assets_to_be_returned)
-        [print(time_unit) for time_unit in timeline]
-
+        if is_row_sampled(logger):
+            logger.debug("Totality check of asset %s on %s, current quantity %s, timeline:\n%s", asset_id, current_date, current_quantity, "".join(map(str, timeline)))
 
         error_messages = []
 
@@ -87,67 +98,65 @@ class FileValidationService:
                 continue
             current_quantity += (-time_unit.start_date_qunatity + time_unit.end_date_qunatity)
 
-            print(f"On {time_unit.date.__str__()}, New quantity : {current_quantity}")
-
             # Check if the requisition quantity is less than the current quantity of the asset in the db at all times.
             if current_quantity < 0:
-                error_messages += f"Asset ID: {asset_id} has a requisition quantity of {time_unit.start_date_qunatity} on {time_unit.date.__str__()} but the current quantity will be {current_quantity} then."
-                print(error_messages)
+                error_messages += [f"Asset ID: {asset_id} has a requisition quantity of {time_unit.start_date_qunatity} on {time_unit.date.__str__()} but the current quantity will be {current_quantity} then."]
                 totality_check = False
 
         return totality_check, error_messages  # Return totality_check and error_message
 
-    def __check_file_in_totality(asset_ids, uploaded_file_df):
-        totality_check = set()
-        totality_error_messages = list()
+    def __check_assets_in_totality(asset_ids, uploaded_file_df, max_errors=None):
+        """The totality check error messages of each asset, of the assets checked before `max_errors` messages were found."""
+        totality_error_messages = dict()
 
         for asset_id in asset_ids:
+            if max_errors is not None and sum(map(len, totality_error_messages.values())) >= max_errors:
+                break
             # get assets from uploaded_file_df
             assets_to_be_assigned = uploaded_file_df[uploaded_file_df["Asset ID"] == asset_id]
 
             # get asset from db where end date is < today's date[i.e not returned yet]
-            assets_to_be_returned = AssetOwnerHistoryService.get_asset_owner_history(asset_id).filter(end_date__gte=datetime.now())
+            assets_to_be_returned = AssetOwnerHistoryService.get_open_requisitions(asset_id)
 
             # Run totality check on the assets.
             check_success, error_messages = FileValidationService.__run_totality_check(asset_id, assets_to_be_assigned, assets_to_be_returned)
+            totality_error_messages[asset_id] = error_messages
 
-            if not check_success:
-                print(f"Totality check failed for Asset ID {asset_id}: {"\n".join(error_messages)}")
-                totality_check.add(False)
-                totality_error_messages += error_messages
-            else:
-                print(f"Totality check passed for Asset ID {asset_id}.")
-                totality_check.add(True)
+        return totality_error_messages
 
-        return all(totality_check), totality_error_messages
+    def __check_file_in_totality(asset_ids, uploaded_file_df):
+        totality_error_messages = list(chain.from_iterable(FileValidationService.__check_assets_in_totality(asset_ids, uploaded_file_df).values()))
+        return not totality_error_messages, totality_error_messages
 
     def __file_extension_validation(uploaded_file):
         """
-        Check if the file is a csv file or not.
+        Check if the file is a csv, xlsx, parquet or arrow file or not.
         """
 
-        if "." not in uploaded_file:
-            print("Not a valid file! Please upload files with '.csv' extensions only!!")
-            return False, "Not a valid file! Please upload files with '.csv' extensions only!!"
+        if "." not in uploaded_file.name:
+            logger.info("Rejected upload %s without an extension", uploaded_file.name)
+            return False, "Not a valid file! Please upload files with '.csv', '.xlsx', '.parquet' or '.arrow' extensions only!!"
 
         extension_name = uploaded_file.name.split(".")[-1]
-        print("File extension name: ", extension_name)
 
-        if extension_name != "csv":
-            print("Not a valid file! Please upload csv files only!!")
-            return False, "Not a valid file! Please upload csv files only!!"
+        if extension_name not in FileValidationService.EXTENSIONS:
+            logger.info("Rejected upload %s with the extension %s", uploaded_file.name, extension_name)
+            return False, "Not a valid file! Please upload csv, xlsx, parquet or arrow files only!!"
 
         return True, None
 
-    def __row_wise_validation(uploaded_file_df):
+    def __row_wise_validation(uploaded_file_df, max_errors=None):
         """
         Check if the row data is valid or not.
+        With `max_errors`, stops at the row giving that many invalid rows; the following rows get no "Status".
         """
-        error_mssgs, row_wise_status = [], []
+        row_wise_status, invalid_rows = [], 0
         asset_ids = set()
         for idx, row in uploaded_file_df.iterrows():
-            print(idx, row)
-            row_validation_status = True
+            if max_errors is not None and invalid_rows >= max_errors:
+                break
+
+            row_validation_status, error_mssgs = True, []
 
             user_id, asset_id, start_date, end_date, quantity = int(row["User Id"]), int(row["Asset ID"]), row["Start Date"], row["End Date"], row["Asset Quantity"]
             asset_ids.add(asset_id)
@@ -165,27 +174,199 @@ class FileValidationService:
                 validation_quantity_res = AssetService.validate_requisition_quantity(asset, quantity)
                 validation_dates_res = AssetService.validate_requisition_dates(asset, start_date, end_date)
 
-                print(validation_quantity_res, validation_dates_res)
-
                 if validation_quantity_res != "ok" :
                     row_validation_status = False
-                    error_mssgs += list(map(lambda message: message[1], validation_quantity_res))
+                    error_mssgs += list(map(lambda message: message[0], validation_quantity_res))
                 if validation_dates_res != "ok":
                     row_validation_status = False
-                    error_mssgs += list(map(lambda message: message[1], validation_dates_res))
+                    error_mssgs += list(map(lambda message: message[0], validation_dates_res))
 
             row_wise_status += [row_validation_status]
+            invalid_rows += not row_validation_status
             uploaded_file_df.at[idx, "Status"] = "OK" if row_validation_status is True else "; ".join(error_mssgs)
+            if is_row_sampled(logger):
+                logger.debug("Validated row %s %s: %s", idx, row.to_dict(), uploaded_file_df.at[idx, "Status"])
+
+        # The annotated rows are returned either way, their "Status" column tells what to fix.
+        return all(row_wise_status), uploaded_file_df
+
+    def __get_cell_value(value):
+        # Date cells are read as datetimes; the validations expect the "%Y-%m-%d" text of the csv files.
+        if isinstance(value, date):
+            return value.strftime("%Y-%m-%d")
+        return value
 
-        if all(row_wise_status) is True:
-            return True, uploaded_file_df
+    def __read_xlsx(uploaded_file):
+        """
+        Reads the first sheet of a workbook in openpyxl's read-only mode, which streams the rows from the sheet's
+        XML instead of loading the workbook. Every XLSX_CHUNK_ROWS rows are turned into a DataFrame, so the
+        rows are held as typed columns rather than Python objects. Returns the rows, or an error message.
+        """
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+        from pandas import DataFrame, concat
+
+        try:
+            workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        except (InvalidFileException, zipfile.BadZipFile, KeyError):
+            logger.info("Rejected upload %s which is not a valid workbook", uploaded_file.name)
+            return "Not a valid file! The xlsx file could not be read!!"
+
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, ())
+            columns = [str(column).strip() if column is not None else f"Unnamed: {idx}" for idx, column in enumerate(header)]
+
+            chunks, chunk = [], []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                row = row[:len(columns)] + (None,) * (len(columns) - len(row))
+                chunk.append(tuple(map(FileValidationService.__get_cell_value, row)))
+                if len(chunk) == FileValidationService.XLSX_CHUNK_ROWS:
+                    chunks.append(DataFrame.from_records(chunk, columns=columns))
+                    chunk = []
+            if chunk or not chunks:
+                chunks.append(DataFrame.from_records(chunk, columns=columns))
+        finally:
+            workbook.close()
+
+        return concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+    def __read_arrow(uploaded_file, extension):
+        """
+        Reads a Parquet or Arrow IPC (file or stream format) upload. Uploads spooled to a temporary file are
+        memory-mapped, so Arrow IPC columns are used in place and Parquet pages are decoded straight from the
+        mapping, without text parsing. Date and timestamp columns become the "%Y-%m-%d" text of the csv files.
+        Returns the rows, or an error message.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        if hasattr(uploaded_file, "temporary_file_path"):
+            source = pa.memory_map(uploaded_file.temporary_file_path(), "r")
         else:
-            return False, None
+            source = pa.BufferReader(uploaded_file.read())
+
+        try:
+            if extension == "parquet":
+                table = pq.read_table(source)
+            else:
+                try:
+                    table = pa.ipc.open_file(source).read_all()
+                except pa.ArrowInvalid:
+                    source.seek(0)
+                    table = pa.ipc.open_stream(source).read_all()
+        except pa.ArrowException:
+            logger.info("Rejected upload %s which is not a valid %s file", uploaded_file.name, extension)
+            return f"Not a valid file! The {extension} file could not be read!!"
+        finally:
+            source.close()
+
+        for idx, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type):
+                table = table.set_column(idx, field.name, pc.strftime(table.column(idx), format="%Y-%m-%d"))
+            elif pa.types.is_date(field.type):
+                table = table.set_column(idx, field.name, pc.cast(table.column(idx), pa.string()))
+
+        return table.to_pandas()
+
+    def __read_uploaded_file(uploaded_file):
+        """The rows of a csv, xlsx, parquet or arrow upload, or an error message."""
+        extension = uploaded_file.name.split(".")[-1]
+        if extension == "xlsx":
+            return FileValidationService.__read_xlsx(uploaded_file)
+        if extension in ("parquet", "arrow"):
+            return FileValidationService.__read_arrow(uploaded_file, extension)
+
+        # pandas is only needed by the file endpoints, so it is imported on first use rather than at worker startup.
+        from pandas import read_csv
+
+        return read_csv(uploaded_file, sep=",")
+
+    def __get_row_hashes(uploaded_file_df):
+        """A hash of the requisition columns of every row. The "Status" column of a re-uploaded validated file is left out."""
+        from pandas.util import hash_pandas_object
+
+        return hash_pandas_object(uploaded_file_df[FileValidationService.ROW_COLUMNS], index=False).astype(str)
+
+    def __get_file_state(uploaded_file_df, previous_results):
+        """The row hashes of the file and the current state of its assets and users, to compare with `previous_results`."""
+        row_user_ids = uploaded_file_df["User Id"].astype(int)
+        return {
+            "previous": previous_results or {"rows": {}, "assets": {}, "missing_users": []},
+            "row_hashes": FileValidationService.__get_row_hashes(uploaded_file_df),
+            "row_asset_ids": uploaded_file_df["Asset ID"].astype(int),
+            "row_user_ids": row_user_ids,
+            "asset_states": AssetService.get_asset_states(set(uploaded_file_df["Asset ID"])),
+            "missing_user_ids": set(row_user_ids) - UserService.get_existing_user_ids(row_user_ids),
+        }
+
+    def __incremental_row_wise_validation(uploaded_file_df, file_state):
+        """
+        Validates the rows which are new, or whose asset or user changed since the previous upload, and takes the
+        "Status" of the others from it. Returns the row wise check, the annotated rows and the number of rows validated.
+        """
+        previous_rows, previous_assets = file_state["previous"]["rows"], file_state["previous"]["assets"]
+        asset_states, missing_user_ids = file_state["asset_states"], file_state["missing_user_ids"]
+        previous_missing_user_ids = set(file_state["previous"]["missing_users"])
+
+        previous_statuses = file_state["row_hashes"].map(previous_rows)
+        asset_unchanged = file_state["row_asset_ids"].map(
+            lambda asset_id: str(asset_id) in previous_assets and previous_assets[str(asset_id)]["state"] == asset_states.get(asset_id)
+        )
+        user_unchanged = file_state["row_user_ids"].map(lambda user_id: (user_id in missing_user_ids) == (user_id in previous_missing_user_ids))
+        to_validate = ~(previous_statuses.notna() & asset_unchanged & user_unchanged)
+
+        uploaded_file_df["Status"] = previous_statuses.where(~to_validate, None).astype(object)
+        if to_validate.any():
+            _, validated_rows_df = FileValidationService.__row_wise_validation(uploaded_file_df[to_validate].copy())
+            uploaded_file_df.loc[to_validate, "Status"] = validated_rows_df["Status"]
+
+        return bool((uploaded_file_df["Status"] == "OK").all()), uploaded_file_df, int(to_validate.sum())
+
+    def __incremental_totality_check(uploaded_file_df, file_state):
+        """
+        Checks in totality the assets whose rows in the file or whose state changed since the previous upload, and
+        takes the error messages of the others from it. Returns the totality check, its error messages, the number of
+        assets checked and the results of this file for the next upload.
+        """
+        previous_assets, asset_states = file_state["previous"]["assets"], file_state["asset_states"]
+        row_hashes = file_state["row_hashes"]
+        asset_ids = set(file_state["row_asset_ids"])
+
+        asset_row_digests = row_hashes.groupby(file_state["row_asset_ids"]).agg(lambda hashes: hashlib.sha1(",".join(sorted(hashes)).encode()).hexdigest())
+        affected_asset_ids = {
+            asset_id
+            for asset_id in asset_ids
+            if str(asset_id) not in previous_assets
+            or previous_assets[str(asset_id)]["rows"] != asset_row_digests[asset_id]
+            or previous_assets[str(asset_id)]["state"] != asset_states.get(asset_id)
+        }
+        totality_error_messages = FileValidationService.__check_assets_in_totality(affected_asset_ids, uploaded_file_df)
+        for asset_id in asset_ids - affected_asset_ids:
+            totality_error_messages[asset_id] = previous_assets[str(asset_id)]["errors"]
+
+        validation_results = {
+            "rows": dict(zip(row_hashes, uploaded_file_df["Status"])),
+            "assets": {
+                str(asset_id): {"state": asset_states.get(asset_id), "rows": asset_row_digests[asset_id], "errors": totality_error_messages[asset_id]}
+                for asset_id in asset_ids
+            },
+            "missing_users": sorted(int(user_id) for user_id in file_state["missing_user_ids"]),
+        }
+        messages = list(chain.from_iterable(totality_error_messages.values()))
+        return not messages, messages, len(affected_asset_ids), validation_results
 
     @staticmethod
-    def run_validations(uploaded_file):
+    def run_validations(uploaded_file, previous_results=None, max_errors=None):
         """
         Run all the validations on the uploaded file.
+        With FILE_INCREMENTAL_VALIDATION, `previous_results` are the `validation_results` of the user's previous
+        upload, reused for the unchanged rows and assets, and the results of this file are returned as well.
+        With `max_errors` (dry runs), the validations stop once that many invalid rows and totality errors are found;
+        the last value returned tells whether every row was validated and every asset checked in totality.
         """
         # Check if the file is a csv file or not.
         file_extension_validation_check, file_extension_check_error_message = FileValidationService.__file_extension_validation(uploaded_file)
@@ -194,16 +375,77 @@ class FileValidationService:
             return (file_extension_check_error_message)
 
         # Check if the row data is valid or not.
-        uploaded_file_df = read_csv(uploaded_file, sep=",") # Read the uploaded file
-        row_wise_data_check, uploaded_file_df = FileValidationService.__row_wise_validation(uploaded_file_df)
+        start = time.perf_counter()
+        with MemoryService.stage("parse") as stage:
+            uploaded_file_df = FileValidationService.__read_uploaded_file(uploaded_file) # Read the uploaded file
+            if type(uploaded_file_df) == str:
+                return uploaded_file_df
+            stage["dataframe"] = uploaded_file_df
+        parsed = time.perf_counter()
+
+        missing_columns = [column for column in FileValidationService.ROW_COLUMNS if column not in uploaded_file_df.columns]
+        if missing_columns:
+            return f"Not a valid file! The columns {', '.join(missing_columns)} are missing!!"
+
+        incremental = settings.FILE_INCREMENTAL_VALIDATION and max_errors is None and len(uploaded_file_df) > 0
+        with MemoryService.stage("validate") as stage:
+            if incremental:
+                file_state = FileValidationService.__get_file_state(uploaded_file_df, previous_results)
+                row_wise_data_check, uploaded_file_df, validated_rows = FileValidationService.__incremental_row_wise_validation(uploaded_file_df, file_state)
+            else:
+                # The "Status" of a re-uploaded validated file is not kept for the rows a dry run does not reach.
+                uploaded_file_df["Status"] = None
+                row_wise_data_check, uploaded_file_df = FileValidationService.__row_wise_validation(uploaded_file_df, max_errors)
+                validated_rows = int(uploaded_file_df["Status"].notna().sum())
+            stage["dataframe"] = uploaded_file_df
+        row_validated = time.perf_counter()
+        invalid_rows = int((uploaded_file_df["Status"].notna() & (uploaded_file_df["Status"] != "OK")).sum())
 
         # Check the file in totality for each asset.
         asset_ids = set(uploaded_file_df["Asset ID"])
-        totality_check, totality_check_error_messages = FileValidationService.__check_file_in_totality(asset_ids, uploaded_file_df)
+        validation_results, complete = None, True
+        with MemoryService.stage("totality"):
+            if incremental:
+                totality_check, totality_check_error_messages, checked_assets, validation_results = FileValidationService.__incremental_totality_check(uploaded_file_df, file_state)
+            elif max_errors is not None:
+                # A dry run stopped by the invalid rows does not check the file in totality.
+                totality_error_messages = FileValidationService.__check_assets_in_totality(asset_ids if invalid_rows < max_errors else (), uploaded_file_df, max_errors - invalid_rows)
+                all_totality_error_messages = list(chain.from_iterable(totality_error_messages.values()))
+                totality_check_error_messages = all_totality_error_messages[:max(max_errors - invalid_rows, 0)]
+                totality_check, checked_assets = not totality_check_error_messages, len(totality_error_messages)
+                # Stopped early if rows were left without a "Status", assets left unchecked or messages cut off.
+                complete = (
+                    validated_rows == len(uploaded_file_df)
+                    and checked_assets == len(asset_ids)
+                    and len(totality_check_error_messages) == len(all_totality_error_messages)
+                )
+            else:
+                totality_check, totality_check_error_messages = FileValidationService.__check_file_in_totality(asset_ids, uploaded_file_df)
+                checked_assets = len(asset_ids)
+        end = time.perf_counter()
+
+        logger.info(
+            "Validated %s: %d rows, %d invalid, %d totality errors",
+            uploaded_file.name, len(uploaded_file_df), invalid_rows, len(totality_check_error_messages),
+            extra={
+                "file": uploaded_file.name,
+                "rows": len(uploaded_file_df),
+                "invalid_rows": invalid_rows,
+                "validated_rows": validated_rows,
+                "assets": len(asset_ids),
+                "checked_assets": checked_assets,
+                "totality_errors": len(totality_check_error_messages),
+                "parse_ms": round((parsed - start) * 1000, 1),
+                "row_validation_ms": round((row_validated - parsed) * 1000, 1),
+                "totality_ms": round((end - row_validated) * 1000, 1),
+            },
+        )
 
         return (
                     (row_wise_data_check, uploaded_file_df),
-                    (totality_check, totality_check_error_messages)
+                    (totality_check, totality_check_error_messages),
+                    validation_results,
+                    complete,
                 )
 
 class FileService:
@@ -212,21 +454,23 @@ class FileService:
     def download_template_file():
         headers = ["User Id" ,"Asset ID", "Asset Quantity", "Start Date", "End Date"]
 
+        from pandas import DataFrame as df
+
         template_dataframe = df(columns=headers)
         template_dataframe.loc[1] = [1, 12, 9, datetime.now().strftime('%Y-%m-%d'), '2999-12-31']
 
         return template_dataframe
 
     @staticmethod
-    def validate_file(uploaded_file):
-        validation_result = FileValidationService.run_validations(uploaded_file)
+    def validate_file(uploaded_file, previous_results=None):
+        validation_result = FileValidationService.run_validations(uploaded_file, previous_results)
 
         if type(validation_result) == str:
             raise_400_exception(validation_result)
 
         else:
             # unpack the validation result
-            row_wise_validation, totality_check_validation = validation_result
+            row_wise_validation, totality_check_validation, validation_results, _ = validation_result
 
 
             row_wise_data_check, uploaded_file_df = row_wise_validation
@@ -238,19 +482,75 @@ class FileService:
                 uploaded_file_df,
                 totality_check, # totality check status
                 totality_check_error_messages, # error messages from totality check
+                validation_results, # per row and per asset results, for the next upload of the user
             )
 
+    @staticmethod
+    def dry_run_file(uploaded_file, max_errors: int):
+        """
+        Validates the file without keeping anything, stopping once `max_errors` invalid rows and totality errors
+        are found. Returns whether the file is valid and a summary of its errors; `complete` is false when the
+        validation stopped before the end of the file.
+        """
+        validation_result = FileValidationService.run_validations(uploaded_file, max_errors=max_errors)
+
+        if type(validation_result) == str:
+            raise_400_exception(validation_result)
+
+        (row_wise_data_check, uploaded_file_df), (totality_check, totality_check_error_messages), _, complete = validation_result
+        statuses = uploaded_file_df["Status"]
+        invalid_statuses = statuses[statuses.notna() & (statuses != "OK")]
+
+        return (
+            row_wise_data_check and totality_check,
+            {
+                "rows": len(uploaded_file_df),
+                "validated_rows": int(statuses.notna().sum()),
+                "complete": complete,
+                # Rows are numbered from 1, the header not counted.
+                "errors": [{"row": int(idx) + 1, "errors": status.split("; ")} for idx, status in invalid_statuses.items()],
+                "totality_errors": totality_check_error_messages,
+            },
+        )
+
     @staticmethod
     def generate_file_path(request):
         dirpath = os.path.join(settings.MEDIA_ROOT, "validated-files")
         os.makedirs(dirpath, exist_ok=True)
 
         filename = f"{request.user.email}##{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}##Asset_Upload.csv"
+        if settings.VALIDATED_FILE_COMPRESSION == "gzip":
+            filename += ".gz"
         file_path = os.path.join(dirpath, filename)
 
-        print(file_path)
+        logger.debug("Validated file path %s", file_path)
         return file_path
 
+    @staticmethod
+    def write_validated_file(uploaded_file_df, file_path) -> str:
+        """
+        Writes the rows with their "Status" column to `file_path`, gzip compressed while they are written when
+        the path ends with ".gz". Returns the name of the file relative to MEDIA_ROOT, for the FileField.
+        """
+        compression = None
+        if file_path.endswith(".gz"):
+            compression = {"method": "gzip", "compresslevel": settings.VALIDATED_FILE_COMPRESSLEVEL, "mtime": 0}
+        uploaded_file_df.to_csv(file_path, index=False, compression=compression)
+        return os.path.relpath(file_path, settings.MEDIA_ROOT)
+
+    @staticmethod
+    def accepts_gzip(accept_encoding: str) -> bool:
+        """Whether an Accept-Encoding header value allows a gzip encoded response."""
+        for coding in accept_encoding.split(","):
+            name, _, parameters = coding.strip().partition(";")
+            if name.strip().lower() in ("gzip", "*"):
+                quality = parameters.strip().removeprefix("q=").strip()
+                try:
+                    return not quality or float(quality) > 0
+                except ValueError:
+                    return False
+        return False
+
 
 
 
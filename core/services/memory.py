@@ -0,0 +1,129 @@
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+class FileJobMemory:
+    """Memory usage of the stages (parse, validate, totality, write) of one file job."""
+
+    def __init__(self):
+        self.stages = []
+
+    def as_dict(self) -> dict:
+        return {
+            "stages": self.stages,
+            "tracemalloc_peak_bytes": max((stage["tracemalloc_peak_bytes"] for stage in self.stages), default=0),
+            "max_rss_bytes": max((stage["max_rss_bytes"] for stage in self.stages), default=0),
+        }
+
+
+# Set while an instrumented file job runs (see MemoryService.job).
+current_file_job_memory = ContextVar("current_file_job_memory", default=None)
+
+
+class MemoryService:
+    """
+    Optional (FILE_MEMORY_PROFILING) memory instrumentation of file jobs. Every stage records its
+    tracemalloc peak above the memory allocated when it started, the allocation sites that grew the
+    most during the stage, the resident set size and the memory of the DataFrame it produced. tracemalloc is process wide and slows allocations down,
+    so only one job per worker process is instrumented at a time.
+    """
+
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_rss_bytes() -> int | None:
+        """Current resident set size, on Linux."""
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def get_max_rss_bytes() -> int:
+        """Peak resident set size of the process so far (ru_maxrss is in kilobytes on Linux)."""
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    @staticmethod
+    def take_snapshot():
+        return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    @staticmethod
+    def get_top_sites(snapshot, start_snapshot, limit: int) -> list[dict]:
+        """The allocation sites which grew the most between the snapshots."""
+        differences = sorted(snapshot.compare_to(start_snapshot, "lineno"), key=lambda difference: difference.size_diff, reverse=True)
+        return [
+            {
+                "site": f"{difference.traceback[0].filename}:{difference.traceback[0].lineno}",
+                "size_bytes": difference.size_diff,
+                "count": difference.count_diff,
+            }
+            for difference in differences[:limit]
+            if difference.size_diff > 0
+        ]
+
+    @staticmethod
+    @contextmanager
+    def job():
+        """
+        Instruments the stages run inside the block, when FILE_MEMORY_PROFILING is on and no other job is
+        instrumented. Yields the FileJobMemory of the job, or None when it is not instrumented.
+        """
+        if not settings.FILE_MEMORY_PROFILING or not MemoryService._lock.acquire(blocking=False):
+            yield None
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        memory = FileJobMemory()
+        token = current_file_job_memory.set(memory)
+        try:
+            yield memory
+        finally:
+            current_file_job_memory.reset(token)
+            if started_tracing:
+                tracemalloc.stop()
+            MemoryService._lock.release()
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str):
+        """
+        Records the memory of a stage of the current job, if it is instrumented. The block can set
+        `stage["dataframe"]` to the DataFrame the stage produced to record its memory usage.
+        """
+        memory = current_file_job_memory.get()
+        stage = {}
+        if memory is None:
+            yield stage
+            return
+
+        start_snapshot = MemoryService.take_snapshot()
+        start_current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield stage
+        duration = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+
+        dataframe = stage.pop("dataframe", None)
+        memory.stages.append(
+            {
+                "stage": name,
+                "duration_ms": round(duration * 1000, 1),
+                "tracemalloc_allocated_bytes": current - start_current,
+                "tracemalloc_peak_bytes": peak - start_current,
+                "rss_bytes": MemoryService.get_rss_bytes(),
+                "max_rss_bytes": MemoryService.get_max_rss_bytes(),
+                "dataframe_bytes": int(dataframe.memory_usage(deep=True).sum()) if dataframe is not None else None,
+                "top_sites": MemoryService.get_top_sites(MemoryService.take_snapshot(), start_snapshot, settings.FILE_MEMORY_TOP_SITES),
+            }
+        )
@@ -0,0 +1,150 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class RequestMetrics:
+    """SQL, render and view timings (in seconds) of one sampled request."""
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.view_start = None
+
+
+# Set while a sampled request is being handled.
+current_request_metrics = ContextVar("current_request_metrics", default=None)
+
+
+class MetricsService:
+    """
+    Per route histograms of request timings, kept in the memory of the worker process and
+    rendered in the Prometheus text format. Every request counts towards the request duration;
+    only sampled requests record SQL, render and view timings.
+    """
+
+    DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+    HISTOGRAMS = {
+        "inventory_request_duration_seconds": ("Time spent handling the request.", DURATION_BUCKETS),
+        "inventory_view_duration_seconds": ("Time spent in the view, sampled requests only.", DURATION_BUCKETS),
+        "inventory_sql_duration_seconds": ("Time spent running SQL queries, sampled requests only.", DURATION_BUCKETS),
+        "inventory_render_duration_seconds": ("Time spent rendering response data, sampled requests only.", DURATION_BUCKETS),
+        "inventory_sql_queries": ("Number of SQL queries run, sampled requests only.", QUERY_COUNT_BUCKETS),
+    }
+
+    _lock = threading.Lock()
+    # (metric, labels) -> [cumulative bucket counts..., sum, count]
+    _histograms = {}
+    # labels -> number of requests
+    _requests = {}
+
+    @staticmethod
+    def is_sampled() -> bool:
+        return random.random() < settings.METRICS_SAMPLE_RATE
+
+    @staticmethod
+    def is_allowed(request) -> bool:
+        """
+        Whether /metrics may be read: by scrapers sending `Authorization: Bearer <METRICS_TOKEN>`, when the
+        token is set, and by superusers, whose JWT is checked here as /metrics is not a DRF view.
+        """
+        authorization = request.headers.get("Authorization", "")
+        if settings.METRICS_TOKEN and constant_time_compare(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+            return True
+        try:
+            user, _ = JWTAuthentication().authenticate(request) or (None, None)
+        except AuthenticationFailed:
+            return False
+        return user is not None and user.is_superuser
+
+    @staticmethod
+    def observe(metric: str, labels: tuple, value: float):
+        buckets = MetricsService.HISTOGRAMS[metric][1]
+        with MetricsService._lock:
+            histogram = MetricsService._histograms.setdefault((metric, labels), [0] * (len(buckets) + 2))
+            for idx, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[idx] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    @staticmethod
+    def record_request(route: str, method: str, status: int, duration: float, metrics: RequestMetrics | None, end: float):
+        labels = (("route", route), ("method", method))
+        with MetricsService._lock:
+            counter_labels = labels + (("status", str(status)),)
+            MetricsService._requests[counter_labels] = MetricsService._requests.get(counter_labels, 0) + 1
+
+        MetricsService.observe("inventory_request_duration_seconds", labels, duration)
+        if metrics is not None:
+            if metrics.view_start is not None:
+                MetricsService.observe("inventory_view_duration_seconds", labels, end - metrics.view_start)
+            MetricsService.observe("inventory_sql_duration_seconds", labels, metrics.sql_time)
+            MetricsService.observe("inventory_render_duration_seconds", labels, metrics.render_time)
+            MetricsService.observe("inventory_sql_queries", labels, metrics.sql_count)
+
+    @staticmethod
+    def get_server_timing(metrics: RequestMetrics, duration: float, end: float) -> str:
+        timings = [
+            f'sql;dur={metrics.sql_time * 1000:.1f};desc="{metrics.sql_count} queries"',
+            f"render;dur={metrics.render_time * 1000:.1f}",
+        ]
+        if metrics.view_start is not None:
+            timings.append(f"view;dur={(end - metrics.view_start) * 1000:.1f}")
+        timings.append(f"total;dur={duration * 1000:.1f}")
+        return ", ".join(timings)
+
+    @staticmethod
+    def format_labels(labels: tuple) -> str:
+        return ",".join(f'{name}="{value}"' for name, value in labels)
+
+    @staticmethod
+    def render() -> str:
+        with MetricsService._lock:
+            histograms = {key: list(values) for key, values in MetricsService._histograms.items()}
+            requests = dict(MetricsService._requests)
+
+        lines = ["# HELP inventory_requests_total Number of requests handled.", "# TYPE inventory_requests_total counter"]
+        for labels, count in sorted(requests.items()):
+            lines.append(f"inventory_requests_total{{{MetricsService.format_labels(labels)}}} {count}")
+
+        for metric, (description, buckets) in MetricsService.HISTOGRAMS.items():
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} histogram"]
+            for (name, labels), values in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                label_text = MetricsService.format_labels(labels)
+                for bound, count in zip(buckets, values):
+                    lines.append(f'{metric}_bucket{{{label_text},le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{{label_text},le="+Inf"}} {values[-1]}')
+                lines.append(f"{metric}_sum{{{label_text}}} {values[-2]}")
+                lines.append(f"{metric}_count{{{label_text}}} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def sql_execute_wrapper(execute, sql, params, many, context):
+        """Database execute wrapper timing the queries of sampled requests."""
+        metrics = current_request_metrics.get()
+        if metrics is None:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics.sql_count += 1
+            metrics.sql_time += time.perf_counter() - start
+
+    @staticmethod
+    def install_sql_execute_wrapper(sender, connection, **kwargs):
+        """`connection_created` receiver. Wrappers stay installed for the lifetime of the connection object."""
+        if MetricsService.sql_execute_wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(MetricsService.sql_execute_wrapper)
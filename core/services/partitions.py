@@ -0,0 +1,118 @@
+from datetime import date
+
+from django.db import connection, transaction
+
+from core.models import AssetOwnerHistory
+
+
+class HistoryPartitionService:
+    """
+    Manages the monthly range partitions of the AssetOwnerHistory table.
+    Partitions are named `<table>_y<YYYY>m<MM>` and hold the rows whose start_date falls in that month.
+    Rows that do not fall in any monthly partition land in the `<table>_default` partition.
+    """
+
+    @staticmethod
+    def get_parent_table() -> str:
+        return AssetOwnerHistory._meta.db_table
+
+    @staticmethod
+    def get_default_partition() -> str:
+        return f"{HistoryPartitionService.get_parent_table()}_default"
+
+    @staticmethod
+    def get_month(value: date) -> date:
+        return date(value.year, value.month, 1)
+
+    @staticmethod
+    def add_months(month: date, months: int) -> date:
+        month_index = month.year * 12 + month.month - 1 + months
+        return date(month_index // 12, month_index % 12 + 1, 1)
+
+    @staticmethod
+    def get_partition_name(month: date) -> str:
+        return f"{HistoryPartitionService.get_parent_table()}_y{month.year}m{month.month:02d}"
+
+    @staticmethod
+    def get_partition_bounds(month: date) -> tuple:
+        next_month = HistoryPartitionService.add_months(month, 1)
+        return f"{month.isoformat()} 00:00:00+00", f"{next_month.isoformat()} 00:00:00+00"
+
+    @staticmethod
+    def is_partitioned() -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+                [HistoryPartitionService.get_parent_table()],
+            )
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def get_partitions() -> list:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+                ORDER BY child.relname
+                """,
+                [HistoryPartitionService.get_parent_table()],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def create_partition(month: date) -> bool:
+        """
+        Create and attach the partition for the given month.
+        Rows of that month already sitting in the default partition are moved into the new partition.
+        Returns False if the partition already exists.
+        """
+        parent, default = HistoryPartitionService.get_parent_table(), HistoryPartitionService.get_default_partition()
+        partition = HistoryPartitionService.get_partition_name(month)
+        start, end = HistoryPartitionService.get_partition_bounds(month)
+
+        if partition in HistoryPartitionService.get_partitions():
+            return False
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'CREATE TABLE "{partition}" (LIKE "{parent}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM "{default}" WHERE start_date >= %s AND start_date < %s RETURNING *) '
+                f'INSERT INTO "{partition}" SELECT * FROM moved',
+                [start, end],
+            )
+            # DDL does not take bind parameters under server side binding; the bounds are generated timestamps.
+            cursor.execute(f'ALTER TABLE "{parent}" ATTACH PARTITION "{partition}" FOR VALUES FROM (\'{start}\') TO (\'{end}\')')
+        return True
+
+    @staticmethod
+    def count_open_requisitions(partition: str) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{partition}" WHERE end_date >= now()')
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def detach_partition(month: date, drop: bool = False, force: bool = False) -> tuple:
+        """
+        Detach the partition for the given month from the history table, and optionally drop it.
+        Partitions that still hold open requisitions are kept attached unless `force` is set,
+        as the totality check relies on every open requisition being visible.
+        """
+        parent, partition = HistoryPartitionService.get_parent_table(), HistoryPartitionService.get_partition_name(month)
+
+        if partition not in HistoryPartitionService.get_partitions():
+            return False, f"Partition {partition} is not attached."
+
+        open_requisitions = HistoryPartitionService.count_open_requisitions(partition)
+        if open_requisitions and not force:
+            return False, f"Partition {partition} still has {open_requisitions} open requisition(s)."
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{parent}" DETACH PARTITION "{partition}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{partition}"')
+
+        return True, f"Partition {partition} {'dropped' if drop else 'detached'}."
@@ -0,0 +1,117 @@
+import io
+import os
+import pstats
+import re
+import threading
+import uuid
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class ProfilingService:
+    """
+    Runs single requests of superusers under cProfile, on demand (`?profile=1` or an `X-Profile: 1`
+    header), and keeps the last PROFILING_MAX_FILES profiles in pstats format under MEDIA_ROOT/profiles.
+    Only one request per worker process is profiled at a time, as Python allows a single active profiler.
+    """
+
+    PROFILE_NAME = re.compile(r"^(?P<recorded_at>\d{8}T\d{6})_(?P<method>[A-Z]+)_(?P<route>[A-Za-z0-9-]+)_(?P<duration_ms>\d+)ms_[0-9a-f]{8}\.prof$")
+
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_profile_dir() -> str:
+        return os.path.join(settings.MEDIA_ROOT, "profiles")
+
+    @staticmethod
+    def is_requested(request) -> bool:
+        return request.headers.get("X-Profile") == "1" or request.GET.get("profile") == "1"
+
+    @staticmethod
+    def is_allowed(request) -> bool:
+        """
+        Whether the user making the request is a superuser. JWT authentication normally happens in the
+        DRF view, after the middlewares, so the token is checked here; only for requests asking for a profile.
+        """
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            try:
+                user, _ = JWTAuthentication().authenticate(request) or (None, None)
+            except AuthenticationFailed:
+                return False
+        return user is not None and user.is_superuser
+
+    @staticmethod
+    def is_async_view(request) -> bool:
+        """Whether the request resolves to an async view, which runs in the event loop under ASGI rather than in a thread."""
+        try:
+            return iscoroutinefunction(resolve(request.path_info, getattr(request, "urlconf", None)).func)
+        except Resolver404:
+            return False
+
+    @staticmethod
+    def acquire() -> bool:
+        return ProfilingService._lock.acquire(blocking=False)
+
+    @staticmethod
+    def release():
+        ProfilingService._lock.release()
+
+    @staticmethod
+    def save(profiler, request, duration: float) -> str:
+        """Writes the profile and returns its name, e.g. `20250101T120000_POST_asset-files-upload_1532ms_3f2a9c1d.prof`."""
+        route = request.resolver_match.view_name if request.resolver_match else "unmatched"
+        name = (
+            f"{timezone.now().strftime('%Y%m%dT%H%M%S')}_{request.method}_{re.sub(r'[^A-Za-z0-9-]', '-', route)}"
+            f"_{duration * 1000:.0f}ms_{uuid.uuid4().hex[:8]}.prof"
+        )
+        os.makedirs(ProfilingService.get_profile_dir(), exist_ok=True)
+        profiler.dump_stats(os.path.join(ProfilingService.get_profile_dir(), name))
+        ProfilingService.prune()
+        return name
+
+    @staticmethod
+    def prune():
+        """Deletes the oldest profiles beyond PROFILING_MAX_FILES."""
+        for profile in ProfilingService.list_profiles()[settings.PROFILING_MAX_FILES:]:
+            os.remove(os.path.join(ProfilingService.get_profile_dir(), profile["name"]))
+
+    @staticmethod
+    def list_profiles() -> list[dict]:
+        """Stored profiles, newest first."""
+        profile_dir = ProfilingService.get_profile_dir()
+        if not os.path.isdir(profile_dir):
+            return []
+
+        profiles = []
+        for name in os.listdir(profile_dir):
+            match = ProfilingService.PROFILE_NAME.match(name)
+            if match is None:
+                continue
+            stat = os.stat(os.path.join(profile_dir, name))
+            profiles.append(
+                (
+                    stat.st_mtime_ns,
+                    {**match.groupdict(), "name": name, "duration_ms": int(match["duration_ms"]), "size": stat.st_size},
+                )
+            )
+        return [profile for _, profile in sorted(profiles, key=lambda item: item[0], reverse=True)]
+
+    @staticmethod
+    def get_profile_path(name: str) -> str | None:
+        if not ProfilingService.PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(ProfilingService.get_profile_dir(), name)
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def get_stats_text(path: str, limit: int = 100) -> str:
+        """The `limit` functions with the highest cumulative time, as printed by pstats."""
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return output.getvalue()
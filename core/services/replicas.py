@@ -0,0 +1,62 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import Error
+
+from ..models import User
+
+
+class ReplicaService:
+    """
+    Picks the read replica a request reads from. Replicas lagging more than REPLICA_MAX_LAG_SECONDS
+    behind the primary, or not reachable, are skipped; without an available replica reads stay on the primary.
+    """
+
+    # alias -> (monotonic time of the check, lag in seconds or None if the replica is unreachable)
+    _lag_checks = {}
+
+    @staticmethod
+    def get_replica_aliases() -> list[str]:
+        return [alias for alias in settings.DATABASES if alias.startswith("replica_")]
+
+    @staticmethod
+    def get_replica_lag(alias: str) -> float | None:
+        """Seconds the replica is behind the primary. A replica that has replayed everything it received is not lagging."""
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT CASE
+                        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                    END
+                    """
+                )
+                return float(cursor.fetchone()[0])
+        except Error:
+            return None
+
+    @staticmethod
+    def is_replica_available(alias: str) -> bool:
+        checked_at, lag = ReplicaService._lag_checks.get(alias, (None, None))
+        if checked_at is None or time.monotonic() - checked_at > settings.REPLICA_LAG_CHECK_INTERVAL:
+            lag = ReplicaService.get_replica_lag(alias)
+            ReplicaService._lag_checks[alias] = (time.monotonic(), lag)
+        return lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+    @staticmethod
+    def get_available_replica() -> str:
+        replicas = [alias for alias in ReplicaService.get_replica_aliases() if ReplicaService.is_replica_available(alias)]
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    @staticmethod
+    def pin_user_to_primary(user: User):
+        """Read-your-writes: the user's reads go to the primary for REPLICA_STICKY_SECONDS after a write."""
+        cache.set(f"replica:pinned:{user.pk}", True, timeout=settings.REPLICA_STICKY_SECONDS)
+
+    @staticmethod
+    def is_user_pinned(user: User) -> bool:
+        return user.is_authenticated and cache.get(f"replica:pinned:{user.pk}", False)
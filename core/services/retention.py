@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import AssetFileUploadHistory
+
+
+class UploadRetentionService:
+    """
+    Deletes the uploaded and validated files of uploads older than the retention horizon from the
+    media storage. The AssetFileUploadHistory records are kept, with their file fields emptied.
+    """
+
+    @staticmethod
+    def get_retention_horizon(days: int | None = None):
+        if days is None:
+            days = settings.UPLOAD_FILE_RETENTION_DAYS
+        return timezone.now() - timedelta(days=days)
+
+    @staticmethod
+    def get_expired_uploads(horizon):
+        return AssetFileUploadHistory.objects.filter(uploaded_at__lt=horizon).filter(
+            ~Q(uploaded_file="") | (Q(validated_file__isnull=False) & ~Q(validated_file=""))
+        )
+
+    @staticmethod
+    def purge_batch(horizon, batch_size: int, after_id: int = 0, dry_run: bool = False) -> tuple[int, int, int]:
+        """
+        Deletes the files of up to `batch_size` expired uploads with an id above `after_id`.
+        Returns the number of uploads, the bytes freed (or to free) and the id of the last upload.
+        """
+        uploads = list(UploadRetentionService.get_expired_uploads(horizon).filter(id__gt=after_id).order_by("id")[:batch_size])
+        freed_bytes = 0
+        for upload in uploads:
+            for field_file in (upload.uploaded_file, upload.validated_file):
+                if not field_file or not field_file.storage.exists(field_file.name):
+                    continue
+                freed_bytes += field_file.size
+                if not dry_run:
+                    field_file.storage.delete(field_file.name)
+
+        if uploads and not dry_run:
+            AssetFileUploadHistory.objects.filter(id__in=[upload.id for upload in uploads]).update(uploaded_file="", validated_file=None)
+        return len(uploads), freed_bytes, uploads[-1].id if uploads else after_id
+
+    @staticmethod
+    def purge(horizon, batch_size: int, dry_run: bool = False) -> tuple[int, int]:
+        """Deletes the files of every expired upload, batch by batch. Returns the number of uploads and the bytes freed."""
+        total_uploads, total_bytes, last_id = 0, 0, 0
+        while True:
+            uploads, freed_bytes, last_id = UploadRetentionService.purge_batch(horizon, batch_size, last_id, dry_run)
+            if not uploads:
+                return total_uploads, total_bytes
+            total_uploads, total_bytes = total_uploads + uploads, total_bytes + freed_bytes
@@ -0,0 +1,46 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, QuerySet
+
+
+class AssetSearchService:
+    """
+    Full-text search over the `Asset.search_vector` document, which covers the asset's name,
+    description, location, manufacturer and the type, sub-type, group and code of its asset type.
+    """
+
+    SEARCH_CONFIG = "english"
+    AUTOCOMPLETE_LIMIT = 10
+
+    @staticmethod
+    def get_search_terms(text: str) -> list:
+        return re.findall(r"\w+", text or "")
+
+    @staticmethod
+    def search(queryset: QuerySet, text: str) -> QuerySet:
+        """Filter the queryset to the assets matching `text` (web search syntax), best matches first."""
+        if not AssetSearchService.get_search_terms(text):
+            return queryset
+
+        search_query = SearchQuery(text, search_type="websearch", config=AssetSearchService.SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-quantity")
+        )
+
+    @staticmethod
+    def autocomplete(queryset: QuerySet, text: str, limit: int = AUTOCOMPLETE_LIMIT) -> QuerySet:
+        """Assets whose search document contains every term of `text`, the last term matched as a prefix."""
+        terms = AssetSearchService.get_search_terms(text)
+        if not terms:
+            return queryset.none()
+
+        raw_query = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+        search_query = SearchQuery(raw_query, search_type="raw", config=AssetSearchService.SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "name")[:limit]
+        )
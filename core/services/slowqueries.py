@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+
+from .sqlcomments import SqlCommentService, current_sql_context
+
+
+class SlowQueryService:
+    """
+    Records the queries running longer than SLOW_QUERY_THRESHOLD_MS, with their parameters, the
+    service method that ran them and their PostgreSQL plan, in a bounded in-memory ring buffer
+    of the worker process. Only SLOW_QUERY_SAMPLE_RATE of the slow queries are recorded, since
+    getting the plan of a SELECT runs it a second time (EXPLAIN ANALYZE).
+    """
+
+    _lock = threading.Lock()
+    _queries = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+
+    @staticmethod
+    def get_slow_queries() -> list[dict]:
+        """Recorded slow queries, newest first."""
+        with SlowQueryService._lock:
+            return list(reversed(SlowQueryService._queries))
+
+    @staticmethod
+    def clear():
+        with SlowQueryService._lock:
+            SlowQueryService._queries.clear()
+
+    @staticmethod
+    def is_read_only(sql: str) -> bool:
+        """Only plain reads are safe to run again under EXPLAIN ANALYZE."""
+        statement = sql.lstrip().upper()
+        if statement.startswith("SELECT"):
+            return " FOR UPDATE" not in statement and " FOR SHARE" not in statement
+        return statement.startswith("WITH") and not any(
+            keyword in statement for keyword in ("INSERT ", "UPDATE ", "DELETE ")
+        )
+
+    @staticmethod
+    def explain(connection, sql: str, params) -> str | None:
+        """
+        Plan of the query, from a separate raw cursor so the results of the original query and the
+        execute wrappers are left alone. Inside a transaction, a failing EXPLAIN is rolled back to a
+        savepoint so the transaction stays usable.
+        """
+        if connection.vendor != "postgresql" or not settings.SLOW_QUERY_EXPLAIN:
+            return None
+        options = "ANALYZE, BUFFERS" if SlowQueryService.is_read_only(sql) else "COSTS"
+
+        with connection.connection.cursor() as cursor:
+            if connection.in_atomic_block:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(f"EXPLAIN ({options}) {sql}", params)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except Exception as error:
+                plan = f"EXPLAIN failed: {error}"
+                if connection.in_atomic_block:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            if connection.in_atomic_block:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+
+    @staticmethod
+    def record(connection, sql: str, params, duration: float):
+        sql_context = current_sql_context.get() or {}
+        slow_query = {
+            "recorded_at": timezone.now().isoformat(),
+            "duration_ms": round(duration * 1000, 1),
+            "database": connection.alias,
+            "route": sql_context.get("route"),
+            "request_id": sql_context.get("request_id"),
+            "service": SqlCommentService.get_service_name(),
+            "sql": sql,
+            "params": repr(params)[:1000],
+            "plan": SlowQueryService.explain(connection, sql, params),
+        }
+        with SlowQueryService._lock:
+            SlowQueryService._queries.append(slow_query)
+
+    @staticmethod
+    def sql_execute_wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        if (
+            not many
+            and duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS
+            and random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+        ):
+            SlowQueryService.record(context["connection"], sql, params, duration)
+        return result
+
+    @staticmethod
+    def install_sql_execute_wrapper(sender, connection, **kwargs):
+        """`connection_created` receiver. Wrappers stay installed for the lifetime of the connection object."""
+        if SlowQueryService.sql_execute_wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(SlowQueryService.sql_execute_wrapper)
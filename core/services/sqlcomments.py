@@ -0,0 +1,67 @@
+import sys
+from contextvars import ContextVar
+from urllib.parse import quote
+
+from django.conf import settings
+
+
+# Route, view action and request id of the request being handled (see SqlCommenterMiddleware).
+current_sql_context = ContextVar("current_sql_context", default=None)
+
+
+class SqlCommentService:
+    """
+    Appends sqlcommenter style comments to SQL queries, e.g.
+    `SELECT ... /*action='retrieve',request_id='...',route='asset-detail',service='assets.AssetService.get_open_requisitions'*/`,
+    so the queries seen by PostgreSQL (pg_stat_activity, the slow query log, auto_explain) can be traced back to
+    the endpoint and the service method which ran them. Keys are sorted so the comment of a call site is stable.
+    """
+
+    # Modules whose functions are reported as the "service" of a query.
+    SERVICE_MODULES = ("core.services.", "core.permissions")
+    IGNORED_MODULES = ("core.services.sqlcomments", "core.services.metrics", "core.services.slowqueries")
+
+    @staticmethod
+    def get_service_name() -> str | None:
+        """The innermost service function or permission on the call stack."""
+        frame = sys._getframe(1)
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith(SqlCommentService.SERVICE_MODULES) and module not in SqlCommentService.IGNORED_MODULES:
+                code = frame.f_code
+                return f"{module.rsplit('.', 1)[-1]}.{getattr(code, 'co_qualname', code.co_name)}"
+            frame = frame.f_back
+        return None
+
+    @staticmethod
+    def get_comment(fields: dict) -> str:
+        pairs = (
+            f"{key}='{quote(str(value), safe='')}'"
+            for key, value in sorted(fields.items())
+            if key in settings.SQL_COMMENTER_FIELDS and value is not None
+        )
+        return ",".join(pairs)
+
+    @staticmethod
+    def add_comment(sql: str, fields: dict, has_params: bool = True) -> str:
+        """
+        Queries which already carry a comment are left alone, as sqlcommenter does. When the query
+        has parameters, "%" of the URL encoded values is escaped so it is not read as a placeholder.
+        """
+        if "/*" in sql or "--" in sql:
+            return sql
+        comment = SqlCommentService.get_comment(fields)
+        if has_params:
+            comment = comment.replace("%", "%%")
+        return f"{sql} /*{comment}*/" if comment else sql
+
+    @staticmethod
+    def sql_execute_wrapper(execute, sql, params, many, context):
+        fields = {**(current_sql_context.get() or {}), "service": SqlCommentService.get_service_name()}
+        return execute(SqlCommentService.add_comment(sql, fields, params is not None), params, many, context)
+
+    @staticmethod
+    def install_sql_execute_wrapper(sender, connection, **kwargs):
+        """`connection_created` receiver. Wrappers stay installed for the lifetime of the connection object."""
+        if SqlCommentService.sql_execute_wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(SqlCommentService.sql_execute_wrapper)
@@ -0,0 +1,76 @@
+from django.db import connection, transaction
+
+from core.models import Asset, AssetInventorySummary, AssetType
+
+
+class InventorySummaryService:
+    """
+    Grouped asset totals read from the AssetInventorySummary table, which the database keeps
+    up to date on every asset write. The cost of a summary depends on the number of
+    (asset type, location) pairs, not on the number of assets.
+    """
+
+    # GROUPING() bit masks over (type, sub_type, group, location); a set bit means "rolled up".
+    GROUPINGS = {
+        0b0111: "type",
+        0b0011: "sub_type",
+        0b0001: "group",
+        0b1110: "location",
+        0b1111: "total",
+    }
+
+    @staticmethod
+    def get_summary() -> dict:
+        summary = AssetInventorySummary._meta.db_table
+        asset_type = AssetType._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT t.type, t.sub_type, t."group", s.location,
+                       GROUPING(t.type, t.sub_type, t."group", s.location),
+                       COALESCE(SUM(s.total_quantity), 0), COALESCE(SUM(s.asset_count), 0)
+                FROM "{summary}" s
+                JOIN "{asset_type}" t ON t.id = s.asset_type_id
+                GROUP BY GROUPING SETS (
+                    (t.type, t.sub_type, t."group"),
+                    (t.type, t.sub_type),
+                    (t.type),
+                    (s.location),
+                    ()
+                )
+                ORDER BY 5, 1, 2, 3, 4
+                """
+            )
+            rows = cursor.fetchall()
+
+        result = {grouping: [] for grouping in InventorySummaryService.GROUPINGS.values()}
+        for type_name, sub_type, group, location, grouping_id, total_quantity, asset_count in rows:
+            grouping = InventorySummaryService.GROUPINGS[grouping_id]
+            keys = {
+                "type": {"type": type_name},
+                "sub_type": {"type": type_name, "sub_type": sub_type},
+                "group": {"type": type_name, "sub_type": sub_type, "group": group},
+                "location": {"location": location},
+                "total": {},
+            }[grouping]
+            result[grouping].append({**keys, "total_quantity": int(total_quantity), "asset_count": int(asset_count)})
+
+        result["total"] = result["total"][0] if result["total"] else {"total_quantity": 0, "asset_count": 0}
+        return result
+
+    @staticmethod
+    def rebuild_summary() -> int:
+        """Recompute the summary table from the assets. Only needed to repair it, e.g. after raw bulk loads with triggers disabled."""
+        summary, asset = AssetInventorySummary._meta.db_table, Asset._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE "{asset}" IN SHARE MODE')
+            cursor.execute(f'DELETE FROM "{summary}"')
+            cursor.execute(
+                f"""
+                INSERT INTO "{summary}" (asset_type_id, location, total_quantity, asset_count)
+                SELECT asset_type_id, location, SUM(quantity), COUNT(*) FROM "{asset}" GROUP BY asset_type_id, location
+                """
+            )
+            return cursor.rowcount
@@ -0,0 +1,98 @@
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from core.models import AssetFileUploadHistory, User
+from core.services.files import FileValidationService
+
+
+class UploadDeduplicationService:
+    """
+    Reuses the validation result of an earlier upload of the same bytes by the same user, instead of
+    validating the file again, while nothing the validation reads has changed since.
+
+    Changes are detected with the inventory generation, a sequence every statement writing to the
+    assets, the asset owner history or the users moves forward (see migration 0010). The date checks of
+    the validation depend on the current day, so only uploads of the same day are reused. A write whose
+    transaction is still open when the generation is read can go unnoticed, which UPLOAD_DEDUP_MAX_AGE_SECONDS bounds.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    @staticmethod
+    def get_content_hash(uploaded_file) -> str:
+        """SHA-256 of the uploaded bytes, read chunk by chunk. The file is rewound for the validation."""
+        content_hash = hashlib.sha256()
+        for chunk in uploaded_file.chunks(UploadDeduplicationService.CHUNK_SIZE):
+            content_hash.update(chunk)
+        uploaded_file.seek(0)
+        return content_hash.hexdigest()
+
+    @staticmethod
+    def get_inventory_generation() -> int | None:
+        """The current inventory generation, or None where it is not tracked (databases other than PostgreSQL)."""
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            # Until its first nextval() the sequence reports the value that call will return.
+            cursor.execute("SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM core_inventory_generation")
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def get_reusable_upload(user: User, file_name: str, content_hash: str, generation: int | None) -> AssetFileUploadHistory | None:
+        """
+        The latest upload of the same bytes by the user, validated at the current generation within the last
+        UPLOAD_DEDUP_MAX_AGE_SECONDS and today, whose validated file is still stored.
+        """
+        # Files with other extensions are rejected before they are validated, and never recorded. The same
+        # bytes under another extension are parsed differently, so only uploads of the same extension are reused.
+        extension = file_name.split(".")[-1]
+        if not settings.UPLOAD_DEDUP_ENABLED or generation is None or extension not in FileValidationService.EXTENSIONS:
+            return None
+
+        upload = (
+            AssetFileUploadHistory.objects.filter(
+                uploaded_by=user,
+                uploaded_file__endswith=f".{extension}",
+                content_hash=content_hash,
+                inventory_generation=generation,
+                is_valid__isnull=False,
+                uploaded_at__gte=timezone.now() - timedelta(seconds=settings.UPLOAD_DEDUP_MAX_AGE_SECONDS),
+                uploaded_at__date=timezone.localdate(),
+            )
+            .exclude(validated_file="")
+            .exclude(validated_file__isnull=True)
+            .order_by("-uploaded_at")
+            .first()
+        )
+        if upload is None or not os.path.isfile(upload.validated_file.path):
+            return None
+        return upload
+
+
+class UploadValidationResultService:
+    """
+    Keeps the per row and per asset results of the latest upload of each user, which the validation of
+    the user's next upload reuses for the rows and assets unchanged since (FILE_INCREMENTAL_VALIDATION).
+    """
+
+    @staticmethod
+    def get_previous_results(user: User) -> dict | None:
+        """The results of the user's latest upload, if it was made today; the date checks depend on the day."""
+        if not settings.FILE_INCREMENTAL_VALIDATION:
+            return None
+        return (
+            AssetFileUploadHistory.objects.filter(uploaded_by=user, validation_results__isnull=False, uploaded_at__date=timezone.localdate())
+            .order_by("-uploaded_at")
+            .values_list("validation_results", flat=True)
+            .first()
+        )
+
+    @staticmethod
+    def drop_previous_results(upload: AssetFileUploadHistory) -> None:
+        """Only the latest results of a user are reused, so the older ones are not kept."""
+        AssetFileUploadHistory.objects.filter(uploaded_by=upload.uploaded_by, validation_results__isnull=False).exclude(pk=upload.pk).update(validation_results=None)
@@ -20,6 +20,10 @@ class UserService:
         except User.DoesNotExist:
             return "User not found"
 
+    @staticmethod
+    def get_existing_user_ids(user_ids) -> set:
+        return set(get_user_model().objects.filter(id__in={int(user_id) for user_id in user_ids}).values_list("id", flat=True))
+
     @staticmethod
     def get_user_groups(user: User) -> List[models.Group]:
         return user.groups.all()
@@ -29,6 +33,10 @@ class UserService:
     def is_user_in_group(user: User, group_name: str) -> bool:
         return user.groups.filter(name=group_name).exists()
 
+    @staticmethod
+    async def ais_user_in_group(user: User, group_name: str) -> bool:
+        return await user.groups.filter(name=group_name).aexists()
+
     @staticmethod
     def add_user_to_group(user: User, group_name: str) -> None:
         group = models.Group.objects.get(name=group_name)
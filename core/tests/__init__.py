@@ -0,0 +1,5 @@
+import logging
+
+# The "inventory" loggers write to their own console handler and do not propagate; keep their output out of
+# the test run. Tests reading the logs use assertLogs, which attaches its own handler to the logger it watches.
+logging.getLogger("inventory").handlers = [logging.NullHandler()]
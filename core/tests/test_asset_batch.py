@@ -0,0 +1,85 @@
+"""Unit tests for the batch creation of assets."""
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from ..models import Asset, AssetType
+from ..services.users import UserService
+from .test_user_models import create_groups, create_user
+
+
+class TestAssetBatchCreate(TestCase):
+    """Test suite for /asset/batch, which creates every asset of a JSON list or CSV file, or none of them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.superuser = get_user_model().objects.create_superuser("admin@test.com", "test_password")
+        cls.moderator = create_user("moderator@test.com", "test_password")
+        UserService.make_user_mod(cls.moderator)
+        cls.asset_type = AssetType.objects.create(type="Hardware(HDW)", sub_type="Cable(CBL)", group="Ethernet(ETH)", description="Cables")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.moderator)
+
+    def get_row(self, name="Ethernet cable", **fields):
+        return {"name": name, "description": "Cat 6 ethernet cable", "quantity": 10, "location": "Pune", "manufacturer": "Dell", "asset_type_id": self.asset_type.id, **fields}
+
+    def test_json_rows(self):
+        """Test that the assets of a JSON list, or of an object with an `assets` list, are created for the default owner."""
+
+        response = self.client.post("/asset/batch", [self.get_row(), self.get_row("Ethernet switch")], format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()[0]["data"], {"created": 2})
+
+        response = self.client.post("/asset/batch", {"assets": [self.get_row("Ethernet router", description=None)]}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(Asset.objects.filter(current_owner=self.superuser).count(), 3)
+        self.assertIsNone(Asset.objects.get(name="Ethernet router").description)
+
+    def test_csv_rows(self):
+        """Test that the rows of a CSV file are created, a blank description stored as NULL."""
+
+        content = (
+            "name,description,quantity,location,manufacturer,asset_type_id\n"
+            f"Ethernet cable,Cat 6 ethernet cable,10,Pune,Dell,{self.asset_type.id}\n"
+            f"Ethernet switch,,2,Chennai,Cisco,{self.asset_type.id}\n"
+        )
+        response = self.client.post("/asset/batch", {"file": SimpleUploadedFile("assets.csv", content.encode("utf-8-sig"))}, format="multipart")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Asset.objects.get(name="Ethernet cable").description, "Cat 6 ethernet cable")
+        self.assertIsNone(Asset.objects.get(name="Ethernet switch").description)
+
+    def test_row_errors(self):
+        """Test that the errors are reported per row, unknown asset types included, and that no asset is created."""
+
+        rows = [self.get_row(quantity=0), self.get_row(name="Cab"), self.get_row(asset_type_id=self.asset_type.id + 1), self.get_row()]
+        response = self.client.post("/asset/batch", rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()[0]["data"]
+        self.assertEqual([row_error["row"] for row_error in errors], [1, 2, 3])
+        self.assertIn("quantity", errors[0]["errors"])
+        self.assertIn("name", errors[1]["errors"])
+        self.assertEqual(errors[2]["errors"], {"asset_type_id": ["Asset type not found."]})
+        self.assertFalse(Asset.objects.exists())
+
+    @override_settings(ASSET_BATCH_CREATE_MAX_ROWS=2)
+    def test_row_limit(self):
+        """Test that empty batches and batches over ASSET_BATCH_CREATE_MAX_ROWS are rejected."""
+
+        self.assertEqual(self.client.post("/asset/batch", [], format="json").status_code, 400)
+        self.assertEqual(self.client.post("/asset/batch", [self.get_row()] * 3, format="json").status_code, 400)
+        self.assertEqual(self.client.post("/asset/batch", {"assets": "cable"}, format="json").status_code, 400)
+        self.assertFalse(Asset.objects.exists())
+
+    def test_permissions(self):
+        """Test that an "Asset User" cannot create assets."""
+
+        self.client.force_authenticate(create_user("user@test.com", "test_password"))
+        self.assertEqual(self.client.post("/asset/batch", [self.get_row()], format="json").status_code, 403)
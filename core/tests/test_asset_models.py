@@ -7,7 +7,7 @@ from django.core.exceptions import ValidationError
 
 
 from ..models import Asset, AssetType
-from .test_user_models import create_user
+from .test_user_models import create_groups, create_user
 
 def create_asset(name, description, quantity, user, asset_type, location, manufacturer):
     """
@@ -147,6 +147,10 @@ class TestAssetModel(TestCase):
     location="Test Location"
     manufacturer="Test Manufacturer"
 
+    def setUp(self):
+        # New users are added to the "Asset User" group.
+        create_groups()
+
 
     def create_asset_type(self, asset_type="Test Asset Type(HDW)", asset_description="Test Asset Type Description", sub_type="Test Asset Sub Type(CABLE)", group="Test Asset Group(ETH)"):
         """
@@ -405,3 +409,27 @@ class TestAssetModel(TestCase):
 
 
 
+
+    def test_save_asset_without_validation(self):
+        """
+            Test that an asset saved with `validate=False` is still checked by the database constraints.
+            Steps:
+            1. Save an asset with a name shorter than five characters, skipping full_clean().
+            2. Verify that the constraint violation is raised as the same ValidationError full_clean() raises.
+            Expected Result:
+            A ValidationError on the `name` field is raised.
+        """
+
+        asset = Asset(
+            name="Some",
+            description=TestAssetModel.description,
+            quantity=TestAssetModel.quantity,
+            current_owner=self.create_new_user(),
+            asset_type=self.create_asset_type(),
+            location=TestAssetModel.location,
+            manufacturer=TestAssetModel.manufacturer
+        )
+
+        with self.assertRaises(ValidationError) as raised_error:
+            asset.save(validate=False)
+        self.assertIn("name", raised_error.exception.message_dict)
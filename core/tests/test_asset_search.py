@@ -0,0 +1,85 @@
+"""Unit tests for the full-text asset search."""
+
+from unittest import skipUnless
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..models import Asset, AssetType
+from ..services.users import UserService
+from .test_asset_models import create_asset
+from .test_user_models import create_groups, create_user
+
+
+def search_vector_matches(asset, text):
+    return Asset.objects.filter(pk=asset.pk, search_vector=SearchQuery(text, config="english")).exists()
+
+
+@skipUnless(connection.vendor == "postgresql", "The search vector is maintained by PostgreSQL triggers.")
+class TestAssetSearch(TestCase):
+    """Test suite for the search vector triggers, the ranked `search` filter and /asset/autocomplete."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.user = create_user("user@test.com", "test_password")
+        cls.moderator = create_user("moderator@test.com", "test_password")
+        UserService.make_user_mod(cls.moderator)
+        cls.asset_type = AssetType.objects.create(type="Hardware(HDW)", sub_type="Display(DSP)", group="Office(OFC)", description="Displays")
+        cls.named_asset = create_asset("Dell monitor", "24 inch office display", 5, cls.moderator, cls.asset_type, "Pune", "Samsung")
+        cls.made_asset = create_asset("Monitor", "27 inch office display", 50, cls.moderator, cls.asset_type, "Pune", "Dell")
+        cls.owned_asset = create_asset("Monitoring probe", "Network probe", 1, cls.user, cls.asset_type, "Chennai", "Cisco")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.moderator)
+
+    def test_trigger(self):
+        """Test that the search vector follows the asset and its asset type on every save."""
+
+        self.assertTrue(search_vector_matches(self.named_asset, "dell"))
+        self.assertTrue(search_vector_matches(self.named_asset, "DSP"))
+
+        self.named_asset.name = "Lenovo monitor"
+        self.named_asset.save()
+        self.assertTrue(search_vector_matches(self.named_asset, "lenovo"))
+        self.assertFalse(search_vector_matches(self.named_asset, "dell"))
+
+        self.asset_type.sub_type = "Screen(SCR)"
+        self.asset_type.save()
+        self.assertTrue(search_vector_matches(self.named_asset, "screen"))
+        self.assertFalse(search_vector_matches(self.named_asset, "DSP"))
+
+    def test_search_ranking(self):
+        """Test that name matches rank above manufacturer matches, whatever their quantity."""
+
+        response = self.client.get("/asset", {"search": "dell"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([asset["id"] for asset in response.json()["data"]], [self.named_asset.id, self.made_asset.id])
+
+        # Web search syntax: "monitor" also matches the stemmed "Monitoring", "-dell" excludes both Dell assets.
+        response = self.client.get("/asset", {"search": "monitor -dell"})
+        self.assertEqual([asset["id"] for asset in response.json()["data"]], [self.owned_asset.id])
+
+    def test_autocomplete(self):
+        """Test that the last term is matched as a prefix and the other terms in full."""
+
+        response = self.client.get("/asset/autocomplete", {"q": "moni"})
+        self.assertEqual({asset["id"] for asset in response.json()["data"]}, {self.named_asset.id, self.made_asset.id, self.owned_asset.id})
+
+        response = self.client.get("/asset/autocomplete", {"q": "dell moni"})
+        self.assertEqual({asset["id"] for asset in response.json()["data"]}, {self.named_asset.id, self.made_asset.id})
+
+        response = self.client.get("/asset/autocomplete", {"q": "  "})
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_autocomplete_own_assets(self):
+        """Test that an "Asset User" only gets their own assets."""
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get("/asset/autocomplete", {"q": "moni"})
+
+        self.assertEqual([asset["id"] for asset in response.json()["data"]], [self.owned_asset.id])
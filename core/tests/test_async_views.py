@@ -0,0 +1,141 @@
+"""Unit tests for the async asset read endpoints."""
+
+from django.test import AsyncClient, RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..authentication import AsyncJWTAuthentication
+from ..models import AssetType
+from ..permissions import IsAssetAdmin, IsAssetModerator
+from ..services.users import UserService
+from .test_asset_models import create_asset
+from .test_user_models import create_groups, create_user
+
+
+def get_auth_headers(user):
+    return {"Authorization": f"JWT {AccessToken.for_user(user)}"}
+
+
+class TestAsyncViews(TestCase):
+    """
+    Test suite for the async views, served through AsyncClient.
+    An "Asset User" only reads the assets they own, moderators and admins read every asset.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.user = create_user("user@test.com", "test_password")
+        cls.moderator = create_user("moderator@test.com", "test_password")
+        UserService.make_user_mod(cls.moderator)
+        asset_type = AssetType.objects.create(type="Hardware(HDW)", sub_type="Cable(CBL)", group="Ethernet(ETH)", description="Cables")
+        cls.assets = [
+            create_asset(f"Cable {idx}", "Ethernet cable", 10 + idx, cls.user if idx < 3 else cls.moderator, asset_type, "Pune", "Dell")
+            for idx in range(5)
+        ]
+
+    def setUp(self):
+        self.client = AsyncClient()
+
+    async def test_unauthenticated(self):
+        """Test that requests without a valid token are rejected."""
+
+        response = await self.client.get(reverse("async-asset-list"))
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.client.get(reverse("async-asset-list"), headers={"Authorization": "JWT invalid"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_asset_list(self):
+        """Test that the list is limited to the user's assets, ordered by quantity and paginated."""
+
+        response = await self.client.get(reverse("async-asset-list"), headers=get_auth_headers(self.user))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual([asset["id"] for asset in response.json()["data"]], [asset.id for asset in reversed(self.assets[:3])])
+
+        response = await self.client.get(reverse("async-asset-list"), {"offset": 1, "limit": 2}, headers=get_auth_headers(self.moderator))
+        self.assertEqual(response.json()["count"], 5)
+        self.assertEqual([asset["id"] for asset in response.json()["data"]], [self.assets[3].id, self.assets[2].id])
+
+    async def test_negative_pagination(self):
+        """Test that a negative offset or limit is rejected instead of reaching the queryset slicing."""
+
+        for params in ({"offset": -1}, {"limit": -1}, {"limit": "ten"}):
+            response = await self.client.get(reverse("async-asset-list"), params, headers=get_auth_headers(self.moderator))
+            self.assertEqual(response.status_code, 400)
+
+    async def test_asset_detail(self):
+        """Test that an "Asset User" can only read their own assets."""
+
+        response = await self.client.get(reverse("async-asset-detail", args=[self.assets[0].id]), headers=get_auth_headers(self.user))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["name"], "Cable 0")
+
+        response = await self.client.get(reverse("async-asset-detail", args=[self.assets[4].id]), headers=get_auth_headers(self.user))
+        self.assertEqual(response.status_code, 403)
+
+        response = await self.client.get(reverse("async-asset-detail", args=[self.assets[4].id + 1]), headers=get_auth_headers(self.moderator))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_asset_availability(self):
+        """Test the availability of an asset, without waiting."""
+
+        response = await self.client.get(
+            reverse("async-asset-availability", args=[self.assets[0].id]), {"min_quantity": 11}, headers=get_auth_headers(self.user)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], {"asset_id": self.assets[0].id, "quantity": 10, "available": False})
+
+    async def test_asset_type_list(self):
+        """Test that asset types are only listed to moderators and admins, and that other methods are not allowed."""
+
+        response = await self.client.get(reverse("async-asset-type-list"), headers=get_auth_headers(self.user))
+        self.assertEqual(response.status_code, 403)
+
+        response = await self.client.get(reverse("async-asset-type-list"), headers=get_auth_headers(self.moderator))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+
+        response = await self.client.post(reverse("async-asset-type-list"), headers=get_auth_headers(self.moderator))
+        self.assertEqual(response.status_code, 405)
+
+
+class TestAsyncAuthentication(TestCase):
+    """Test suite for AsyncJWTAuthentication and the async group permissions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.user = create_user("user@test.com", "test_password")
+
+    async def test_aauthenticate(self):
+        """Test that the user of a valid token is returned, and nothing without an Authorization header."""
+
+        request = RequestFactory().get("/", headers=get_auth_headers(self.user))
+        user, _ = await AsyncJWTAuthentication().aauthenticate(request)
+        self.assertEqual(user, self.user)
+
+        self.assertIsNone(await AsyncJWTAuthentication().aauthenticate(RequestFactory().get("/")))
+
+    async def test_aauthenticate_invalid(self):
+        """Test that invalid tokens, and tokens of inactive users, are rejected."""
+
+        with self.assertRaises(InvalidToken):
+            await AsyncJWTAuthentication().aauthenticate(RequestFactory().get("/", headers={"Authorization": "JWT invalid"}))
+
+        self.user.is_active = False
+        await self.user.asave(update_fields=["is_active"])
+        with self.assertRaises(AuthenticationFailed):
+            await AsyncJWTAuthentication().aauthenticate(RequestFactory().get("/", headers=get_auth_headers(self.user)))
+
+    async def test_ahas_permission(self):
+        """Test that the async permissions grant access to the members of their group only."""
+
+        request = RequestFactory().get("/")
+        request.user = self.user
+        self.assertFalse(await IsAssetModerator().ahas_permission(request, None))
+
+        await self.user.groups.aadd(await self.user.groups.model.objects.aget(name="Asset Admin"))
+        self.assertTrue(await IsAssetAdmin().ahas_permission(request, None))
@@ -1,11 +1,18 @@
 """Unit tests for the custom management commands."""
 
+from io import StringIO
+from unittest import skipUnless
 from unittest.mock import patch
 from django.core.management import call_command
-from django.test import SimpleTestCase
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test import SimpleTestCase, TransactionTestCase
 
 from django.db.utils import OperationalError
-from psycopg2.errors import OperationalError as PostgresOperationalError
+from psycopg import OperationalError as PostgresOperationalError
+from psycopg_pool import PoolTimeout
+
+from ..models import Asset, AssetInventorySummary
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -20,6 +27,8 @@ class TestCommands(SimpleTestCase):
             Test to check when the database service is already up.
         test_db_not_ready(patched_sleep, patched_result):
             Test to check when the database service is not up.
+        test_db_pool_not_ready(patched_connection, patched_sleep, patched_result):
+            Test to check when the connection pool cannot fill up yet.
     """
 
 
@@ -41,3 +50,47 @@ class TestCommands(SimpleTestCase):
         call_command("wait_for_db")
         self.assertEqual(patched_result.call_count, 5)
         patched_result.asset_called_with(databases=["defafult"])
+
+    @patch("time.sleep")
+    @patch("core.management.commands.wait_for_db.connection")
+    def test_db_pool_not_ready(self, patched_connection, patched_sleep, patched_result):
+        """Test to check when the connection pool cannot fill up yet."""
+
+        patched_result.return_value = True
+        patched_connection.pool.wait.side_effect = [PoolTimeout, None]
+        patched_connection.pool.get_stats.return_value = {"pool_size": 2, "pool_available": 2}
+        call_command("wait_for_db")
+        self.assertEqual(patched_connection.pool.wait.call_count, 2)
+        self.assertEqual(patched_connection.close_pool.call_count, 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "The inventory summary and search vector are maintained by PostgreSQL triggers.")
+class TestSeedInventoryCommand(TransactionTestCase):
+    """
+    Test suite for the `seed_inventory` command.
+    The assets are inserted by parallel batches on their own connections, so the test does not run in a transaction.
+    """
+
+    def test_seed_inventory(self):
+        """Test that a parallel seed leaves the summary matching the assets, and every asset searchable."""
+
+        call_command(
+            "seed_inventory", users=20, asset_types=4, assets=60, history=30,
+            batch_size=10, workers=4, stdout=StringIO(),
+        )
+
+        expected = {
+            (row["asset_type_id"], row["location"]): (row["total_quantity"], row["asset_count"])
+            for row in Asset.objects.values("asset_type_id", "location").annotate(total_quantity=Sum("quantity"), asset_count=Count("id"))
+        }
+        summary = {
+            (row.asset_type_id, row.location): (row.total_quantity, row.asset_count)
+            for row in AssetInventorySummary.objects.all()
+        }
+        self.assertEqual(Asset.objects.count(), 60)
+        self.assertEqual(summary, expected)
+        self.assertFalse(Asset.objects.filter(search_vector__isnull=True).exists())
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT tgname FROM pg_trigger WHERE tgrelid = 'core_asset'::regclass AND tgenabled = 'D'")
+            self.assertEqual(cursor.fetchall(), [])
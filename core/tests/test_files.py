@@ -0,0 +1,518 @@
+"""Unit tests for the file service helpers."""
+
+import hashlib
+import io
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import AssetFileUploadHistory, AssetOwnerHistory, AssetType
+from ..services.files import FileService, FileValidationService, TimeLineUnit
+from ..services.uploads import UploadDeduplicationService, UploadValidationResultService
+from .test_asset_models import create_asset
+from .test_user_models import create_groups, create_user
+
+
+def get_csv_upload(rows, name="upload.csv"):
+    """An uploaded csv file of the requisition rows."""
+    lines = [",".join(FileValidationService.ROW_COLUMNS)] + [",".join(map(str, row)) for row in rows]
+    return SimpleUploadedFile(name, "\n".join(lines).encode())
+
+
+def get_date(days):
+    """The "%Y-%m-%d" text of the day `days` days from today."""
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+class TestFileService(SimpleTestCase):
+    """Test suite for the content negotiation of the validated file downloads."""
+
+    def test_accepts_gzip(self):
+        """Test that gzip is only accepted when the Accept-Encoding header allows it."""
+
+        self.assertTrue(FileService.accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(FileService.accepts_gzip("br;q=1.0, *;q=0.5"))
+        self.assertFalse(FileService.accepts_gzip("gzip;q=0"))
+        self.assertFalse(FileService.accepts_gzip("identity"))
+        self.assertFalse(FileService.accepts_gzip(""))
+
+
+class TestFileValidationService(SimpleTestCase):
+    """Test suite for the parsing of the uploaded files."""
+
+    @patch.object(FileValidationService, "XLSX_CHUNK_ROWS", 2)
+    def test_read_xlsx(self):
+        """Test that the rows of a workbook are read in chunks, with their date cells as csv dates and without blank rows."""
+
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        workbook.active.append(FileValidationService.ROW_COLUMNS)
+        for idx in range(5):
+            workbook.active.append([idx, 10 + idx, 1, datetime(2026, 1, idx + 1), "2026-02-01"])
+        workbook.active.append([None] * 5)
+        content = io.BytesIO()
+        workbook.save(content)
+
+        uploaded_file_df = FileValidationService._FileValidationService__read_uploaded_file(SimpleUploadedFile("upload.xlsx", content.getvalue()))
+
+        self.assertEqual(list(uploaded_file_df.columns), FileValidationService.ROW_COLUMNS)
+        self.assertEqual(list(uploaded_file_df["Asset ID"]), [10, 11, 12, 13, 14])
+        self.assertEqual(uploaded_file_df.loc[4, "Start Date"], "2026-01-05")
+
+    def test_read_arrow(self):
+        """Test that Parquet and Arrow IPC uploads are read with their typed columns and dates as csv dates."""
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(
+            {
+                "User Id": [1, 2],
+                "Asset ID": [10, 11],
+                "Asset Quantity": [1, 2],
+                "Start Date": pa.array([date(2026, 1, 1), date(2026, 1, 2)], pa.date32()),
+                "End Date": pa.array([datetime(2026, 2, 1, 12), datetime(2026, 2, 2, 12)]),
+            }
+        )
+        parquet_content, arrow_content = pa.BufferOutputStream(), pa.BufferOutputStream()
+        pq.write_table(table, parquet_content)
+        with pa.ipc.new_stream(arrow_content, table.schema) as writer:
+            writer.write_table(table)
+
+        for name, content in (("upload.parquet", parquet_content), ("upload.arrow", arrow_content)):
+            uploaded_file_df = FileValidationService._FileValidationService__read_uploaded_file(SimpleUploadedFile(name, content.getvalue().to_pybytes()))
+
+            self.assertEqual(list(uploaded_file_df["Asset ID"]), [10, 11])
+            self.assertEqual(list(uploaded_file_df["Start Date"]), ["2026-01-01", "2026-01-02"])
+            self.assertEqual(list(uploaded_file_df["End Date"]), ["2026-02-01", "2026-02-02"])
+
+    def test_read_invalid_xlsx(self):
+        """Test that a file which is not a workbook gives an error message."""
+
+        self.assertIsInstance(FileValidationService._FileValidationService__read_uploaded_file(SimpleUploadedFile("upload.xlsx", b"User Id")), str)
+
+    def test_timeline_unit(self):
+        """Test that a timeline unit starts from the quantities it is given, zero by default."""
+
+        self.assertEqual(str(TimeLineUnit(date(2026, 1, 1))), "2026-01-01::0::0\n")
+        self.assertEqual(str(TimeLineUnit(date(2026, 1, 1), start_date_qunatity=3)), "2026-01-01::3::0\n")
+        self.assertEqual(str(TimeLineUnit(date(2026, 1, 1), end_date_qunatity=2)), "2026-01-01::0::2\n")
+
+    def test_timeline(self):
+        """Test that the rows and the open requisitions, with datetimes, share one timeline of dates, from their start to their end dates."""
+
+        from pandas import DataFrame
+
+        rows = DataFrame([[1, 10, 2, "2026-01-02", "2026-01-05"], [2, 10, 3, "2026-01-05", "2026-01-09"]], columns=FileValidationService.ROW_COLUMNS)
+        open_requisitions = [SimpleNamespace(start_date=datetime(2026, 1, 1, 9), end_date=datetime(2026, 1, 5, 18), requisition_qunatity=4)]
+
+        timeline = FileValidationService._FileValidationService__create_timeline(rows, open_requisitions)
+
+        self.assertEqual(
+            [(unit.date, unit.start_date_qunatity, unit.end_date_qunatity) for unit in timeline],
+            [(date(2026, 1, 1), 4, 0), (date(2026, 1, 2), 2, 0), (date(2026, 1, 5), 3, 6), (date(2026, 1, 9), 0, 3)],
+        )
+
+
+class TestUploadDeduplicationService(SimpleTestCase):
+    """Test suite for the reuse of the results of repeated uploads."""
+
+    def test_content_hash(self):
+        """Test that the hash covers every chunk and the file is rewound for the validation."""
+
+        content = b"User Id,Asset ID,Asset Quantity,Start Date,End Date\n" * 50_000
+        uploaded_file = SimpleUploadedFile("upload.csv", content)
+
+        self.assertEqual(UploadDeduplicationService.get_content_hash(uploaded_file), hashlib.sha256(content).hexdigest())
+        self.assertEqual(uploaded_file.read(), content)
+
+    def test_untracked_generation(self):
+        """Test that nothing is reused where the inventory generation is not tracked."""
+
+        self.assertIsNone(UploadDeduplicationService.get_reusable_upload(None, "upload.csv", "0" * 64, None))
+
+
+class FileValidationTestCase(TestCase):
+    """Two users and two assets, of 10 and 2 units, with a valid requisition of each."""
+
+    def setUp(self):
+        create_groups()
+        self.user = create_user("user@test.com", "test_password")
+        self.other_user = create_user("other@test.com", "test_password")
+        asset_type = AssetType.objects.create(type="Hardware(HDW)", sub_type="Cable(CBL)", group="Ethernet(ETH)", description="Cables")
+        self.asset = create_asset("Cable", "Ethernet cable", 10, self.user, asset_type, "Pune", "Dell")
+        self.other_asset = create_asset("Dongle", "USB dongle", 2, self.user, asset_type, "Pune", "Dell")
+        self.rows = [
+            [self.user.id, self.asset.id, 2, get_date(2), get_date(10)],
+            [self.other_user.id, self.other_asset.id, 1, get_date(2), get_date(10)],
+        ]
+
+
+@override_settings(FILE_INCREMENTAL_VALIDATION=False)
+class TestFileValidation(FileValidationTestCase):
+    """Test suite for the full validation of the uploaded rows."""
+
+    def test_row_errors(self):
+        """Test that each invalid row gets only its own error messages, and the rows are annotated even when some are invalid."""
+
+        rows = [
+            [self.user.id, self.asset.id, 20, get_date(2), get_date(10)],
+            [self.user.id, self.other_asset.id, 1, get_date(-3), get_date(10)],
+            self.rows[1],
+        ]
+        is_valid, uploaded_file_df, _, _, _ = FileService.validate_file(get_csv_upload(rows))
+
+        self.assertFalse(is_valid)
+        self.assertEqual(
+            list(uploaded_file_df["Status"]),
+            ["Requisition Quantity is more than avaialable quantity.", "Start date cannot be in the past.", "OK"],
+        )
+
+    def test_unknown_asset(self):
+        """Test that a row of an unknown asset is reported by the row-wise validation, and skipped by the totality check."""
+
+        rows = self.rows + [[self.user.id, self.other_asset.id + 1, 1, get_date(2), get_date(10)]]
+        is_valid, uploaded_file_df, totality_check, totality_errors, _ = FileService.validate_file(get_csv_upload(rows))
+
+        self.assertFalse(is_valid)
+        self.assertEqual(list(uploaded_file_df["Status"]), ["OK", "OK", "Asset with the provided user id not found!"])
+        self.assertTrue(totality_check)
+        self.assertEqual(totality_errors, [])
+
+    def test_totality_errors(self):
+        """Test that each totality error is reported as one message."""
+
+        rows = [
+            [self.user.id, self.asset.id, 6, get_date(2), get_date(10)],
+            [self.other_user.id, self.asset.id, 6, get_date(3), get_date(12)],
+        ]
+        is_valid, uploaded_file_df, totality_check, totality_errors, _ = FileService.validate_file(get_csv_upload(rows))
+
+        self.assertFalse(is_valid)
+        self.assertEqual(list(uploaded_file_df["Status"]), ["OK", "OK"])
+        self.assertFalse(totality_check)
+        self.assertEqual(totality_errors, [f"Asset ID: {self.asset.id} has a requisition quantity of 6 on {get_date(3)} but the current quantity will be -2 then."])
+
+
+class TestIncrementalFileValidation(FileValidationTestCase):
+    """
+    Test suite for the incremental validation of re-uploads (FILE_INCREMENTAL_VALIDATION).
+    Every upload is validated incrementally against the previous results and in full, and both must agree.
+    """
+
+    def validate(self, rows, previous_results=None):
+        """
+        Validates the rows incrementally and in full, checks that both give the same result, and returns the
+        results for the next upload and the numbers of rows and assets the incremental validation checked.
+        """
+        with self.assertLogs("inventory.files", "INFO") as logs:
+            incremental = FileService.validate_file(get_csv_upload(rows), previous_results)
+        with override_settings(FILE_INCREMENTAL_VALIDATION=False):
+            full = FileService.validate_file(get_csv_upload(rows))
+
+        self.assertEqual(incremental[0], full[0])
+        self.assertEqual(list(incremental[1]["Status"]), list(full[1]["Status"]))
+        self.assertEqual(sorted(incremental[3]), sorted(full[3]))
+        record = logs.records[-1]
+        return incremental, record.validated_rows, record.checked_assets
+
+    def test_changed_rows(self):
+        """Test that only the edited and added rows are validated again, and a duplicate row reuses its status."""
+
+        (_, _, _, _, results), validated_rows, checked_assets = self.validate(self.rows)
+        self.assertEqual((validated_rows, checked_assets), (2, 2))
+
+        rows = [
+            [self.user.id, self.asset.id, 20, get_date(2), get_date(10)],
+            self.rows[1],
+            self.rows[1],
+            [self.user.id, self.other_asset.id, 1, get_date(3), get_date(12)],
+        ]
+        (is_valid, uploaded_file_df, _, totality_errors, _), validated_rows, checked_assets = self.validate(rows, results)
+
+        self.assertFalse(is_valid)
+        self.assertEqual(list(uploaded_file_df["Status"])[1:], ["OK", "OK", "OK"])
+        self.assertTrue(totality_errors)
+        self.assertEqual((validated_rows, checked_assets), (2, 2))
+
+    def test_changed_assets(self):
+        """Test that the rows and totality of an asset are checked again once it or its open requisitions change."""
+
+        (_, _, _, _, results), _, _ = self.validate(self.rows)
+
+        self.asset.quantity = 1
+        self.asset.save()
+        (is_valid, _, _, _, results), validated_rows, checked_assets = self.validate(self.rows, results)
+        self.assertFalse(is_valid)
+        self.assertEqual((validated_rows, checked_assets), (1, 1))
+
+        AssetOwnerHistory.objects.create(
+            user=self.user,
+            asset=self.other_asset,
+            start_date=timezone.now() + timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=20),
+            requisition_qunatity=2,
+        )
+        (_, _, totality_check, totality_errors, _), validated_rows, checked_assets = self.validate(self.rows, results)
+        self.assertFalse(totality_check)
+        self.assertEqual(len(totality_errors), 2)
+        self.assertEqual((validated_rows, checked_assets), (1, 1))
+
+    def test_missing_user(self):
+        """Test that the rows of a user deleted since the previous upload are validated again."""
+
+        (_, _, _, _, results), _, _ = self.validate(self.rows)
+
+        other_user_id = self.other_user.id
+        self.other_user.delete()
+        (is_valid, uploaded_file_df, _, _, results), validated_rows, checked_assets = self.validate(self.rows, results)
+
+        self.assertFalse(is_valid)
+        self.assertEqual(uploaded_file_df.loc[1, "Status"], "User with the provided user id not found!")
+        self.assertEqual((validated_rows, checked_assets), (1, 0))
+        self.assertEqual(results["missing_users"], [other_user_id])
+
+    def test_validated_file(self):
+        """Test that a re-uploaded validated file, with its "Status" column, reuses every result."""
+
+        (_, uploaded_file_df, _, _, results), _, _ = self.validate(self.rows)
+
+        uploaded_file_df.loc[0, "Status"] = "Edited by hand"
+        upload = SimpleUploadedFile("upload.csv", uploaded_file_df.to_csv(index=False).encode())
+        with self.assertLogs("inventory.files", "INFO") as logs:
+            is_valid, uploaded_file_df, _, _, _ = FileService.validate_file(upload, results)
+
+        self.assertTrue(is_valid)
+        self.assertEqual(list(uploaded_file_df["Status"]), ["OK", "OK"])
+        self.assertEqual((logs.records[-1].validated_rows, logs.records[-1].checked_assets), (0, 0))
+
+
+class TestFileDryRun(FileValidationTestCase):
+    """Test suite for the fail fast dry runs of /file/upload."""
+
+    def test_early_stop(self):
+        """Test that the rows after the error budget are not validated, nor the file checked in totality."""
+
+        rows = [[self.user.id, self.asset.id, 20, get_date(2), get_date(10)]] * 3 + self.rows
+        is_valid, summary = FileService.dry_run_file(get_csv_upload(rows), 2)
+
+        self.assertFalse(is_valid)
+        self.assertEqual((summary["rows"], summary["validated_rows"], summary["complete"]), (5, 2, False))
+        self.assertEqual([error["row"] for error in summary["errors"]], [1, 2])
+        self.assertEqual(summary["totality_errors"], [])
+
+    def test_totality_budget(self):
+        """Test that the totality check stops at the errors left after the invalid rows."""
+
+        rows = [
+            [self.user.id, self.asset.id, 6, get_date(2), get_date(10)],
+            [self.user.id, self.asset.id, 6, get_date(3), get_date(12)],
+            [self.user.id, self.other_asset.id, 2, get_date(2), get_date(10)],
+            [self.user.id, self.other_asset.id, 1, get_date(3), get_date(12)],
+        ]
+        is_valid, summary = FileService.dry_run_file(get_csv_upload(rows), 1)
+
+        self.assertFalse(is_valid)
+        self.assertEqual((summary["validated_rows"], summary["errors"], len(summary["totality_errors"])), (4, [], 1))
+        self.assertFalse(summary["complete"])
+
+        is_valid, summary = FileService.dry_run_file(get_csv_upload(rows), 3)
+        self.assertEqual(len(summary["totality_errors"]), 2)
+        self.assertTrue(summary["complete"])
+
+    def test_errors_on_budget(self):
+        """Test that a file whose errors exactly fill the budget is still validated completely."""
+
+        rows = [
+            [self.user.id, self.other_asset.id, 1, get_date(-3), get_date(10)],
+            [self.user.id, self.other_asset.id, 2, get_date(2), get_date(10)],
+            [self.user.id, self.other_asset.id, 2, get_date(2), get_date(10)],
+        ]
+        is_valid, summary = FileService.dry_run_file(get_csv_upload(rows), 2)
+
+        self.assertFalse(is_valid)
+        self.assertEqual((len(summary["errors"]), len(summary["totality_errors"])), (1, 1))
+        self.assertTrue(summary["complete"])
+
+    def test_dry_run_upload(self):
+        """Test that a dry run only answers with the summary: no upload is recorded and no file written."""
+
+        superuser = get_user_model().objects.create_superuser("admin@test.com", "test_password")
+        client = APIClient()
+        client.force_authenticate(superuser)
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+
+        with override_settings(MEDIA_ROOT=media_root.name):
+            for max_errors in ("0", "-1", "ten"):
+                response = client.post(f"/file/upload?dry_run=1&max_errors={max_errors}", {"uploaded_file": get_csv_upload(self.rows)})
+                self.assertEqual(response.status_code, 400)
+
+            response = client.post("/file/upload?dry_run=1", {"uploaded_file": get_csv_upload(self.rows)})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()[0]["data"]["complete"])
+            self.assertFalse(AssetFileUploadHistory.objects.exists())
+            self.assertEqual(os.listdir(media_root.name), [])
+
+
+class TestFileUpload(FileValidationTestCase):
+    """Test suite for the uploads of /file/upload, and their validated files."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = get_user_model().objects.create_superuser("admin@test.com", "test_password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name, VALIDATED_FILE_COMPRESSION="none")
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def test_upload(self):
+        """Test that an upload is recorded with its validated file, named after the uploader, and an invalid one links to it."""
+
+        response = self.client.post("/file/upload", {"uploaded_file": get_csv_upload(self.rows)})
+
+        self.assertEqual(response.status_code, 200)
+        upload = AssetFileUploadHistory.objects.get()
+        self.assertTrue(upload.is_valid)
+        self.assertTrue(upload.validated_file.name.startswith("validated-files/admin@test.com##"))
+        self.assertTrue(os.path.isfile(upload.validated_file.path))
+
+        rows = [[self.user.id, self.asset.id, 20, get_date(2), get_date(10)]]
+        response = self.client.post("/file/upload", {"uploaded_file": get_csv_upload(rows)})
+
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(response.json()[0]["data"]["validated_file"])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Requisition Quantity is more than avaialable quantity.", b"".join(response.streaming_content))
+
+
+@skipUnless(connection.vendor == "postgresql", "The inventory generation is maintained by PostgreSQL triggers.")
+class TestUploadDeduplication(FileValidationTestCase):
+    """Test suite for the reuse of the results of repeated uploads, through /file/upload."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = get_user_model().objects.create_superuser("admin@test.com", "test_password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def upload(self, name="upload.csv"):
+        response = self.client.post("/file/upload", {"uploaded_file": get_csv_upload(self.rows, name)})
+        self.assertEqual(response.status_code, 200)
+        return AssetFileUploadHistory.objects.order_by("-pk").first()
+
+    def get_reusable_upload(self, name="upload.csv", user=None):
+        content_hash = UploadDeduplicationService.get_content_hash(get_csv_upload(self.rows))
+        generation = UploadDeduplicationService.get_inventory_generation()
+        return UploadDeduplicationService.get_reusable_upload(user or self.admin, name, content_hash, generation)
+
+    def test_repeated_upload(self):
+        """Test that a repeated upload reuses the first one, until an asset is written."""
+
+        upload = self.upload()
+        self.assertEqual(self.upload(), upload)
+        self.assertEqual(AssetFileUploadHistory.objects.count(), 1)
+
+        self.asset.quantity = 9
+        self.asset.save()
+        self.assertNotEqual(self.upload(), upload)
+        self.assertEqual(AssetFileUploadHistory.objects.count(), 2)
+
+    def test_inventory_generation(self):
+        """Test that every write to the assets, the asset owner history or the users moves the generation forward."""
+
+        generation = UploadDeduplicationService.get_inventory_generation()
+        AssetOwnerHistory.objects.create(
+            user=self.user, asset=self.asset, start_date=timezone.now(), end_date=timezone.now() + timedelta(days=1), requisition_qunatity=1
+        )
+        self.assertGreater(UploadDeduplicationService.get_inventory_generation(), generation)
+
+        generation = UploadDeduplicationService.get_inventory_generation()
+        self.user.save()
+        self.assertGreater(UploadDeduplicationService.get_inventory_generation(), generation)
+
+        generation = UploadDeduplicationService.get_inventory_generation()
+        AssetFileUploadHistory.objects.create(uploaded_by=self.user, uploaded_file="uploaded-files/upload.csv")
+        self.assertEqual(UploadDeduplicationService.get_inventory_generation(), generation)
+
+    def test_reuse_filters(self):
+        """Test that only today's recent uploads of the same user and extension, with a stored validated file, are reused."""
+
+        upload = self.upload()
+        self.assertEqual(self.get_reusable_upload(), upload)
+
+        self.assertIsNone(self.get_reusable_upload(user=self.user))
+        self.assertIsNone(self.get_reusable_upload(name="upload.parquet"))
+        with override_settings(UPLOAD_DEDUP_ENABLED=False):
+            self.assertIsNone(self.get_reusable_upload())
+        with override_settings(UPLOAD_DEDUP_MAX_AGE_SECONDS=0):
+            self.assertIsNone(self.get_reusable_upload())
+
+        AssetFileUploadHistory.objects.filter(pk=upload.pk).update(uploaded_at=timezone.now() - timedelta(days=1))
+        with override_settings(UPLOAD_DEDUP_MAX_AGE_SECONDS=3 * 24 * 3600):
+            self.assertIsNone(self.get_reusable_upload())
+
+        AssetFileUploadHistory.objects.filter(pk=upload.pk).update(uploaded_at=timezone.now())
+        os.remove(upload.validated_file.path)
+        self.assertIsNone(self.get_reusable_upload())
+
+
+class TestUploadValidationResultService(TestCase):
+    """Test suite for the results kept on the latest upload of each user."""
+
+    def setUp(self):
+        create_groups()
+        self.user = create_user("user@test.com", "test_password")
+
+    def create_upload(self, user, validation_results, uploaded_at=None):
+        upload = AssetFileUploadHistory.objects.create(uploaded_by=user, uploaded_file="uploaded-files/upload.csv", validation_results=validation_results)
+        if uploaded_at is not None:
+            AssetFileUploadHistory.objects.filter(pk=upload.pk).update(uploaded_at=uploaded_at)
+        return upload
+
+    def test_previous_results_of_today(self):
+        """Test that only the results of an upload made today are reused."""
+
+        self.create_upload(self.user, {"rows": {}}, timezone.now() - timedelta(days=1))
+        self.assertIsNone(UploadValidationResultService.get_previous_results(self.user))
+
+        self.create_upload(self.user, {"rows": {"1": "OK"}})
+        self.assertEqual(UploadValidationResultService.get_previous_results(self.user), {"rows": {"1": "OK"}})
+
+        with override_settings(FILE_INCREMENTAL_VALIDATION=False):
+            self.assertIsNone(UploadValidationResultService.get_previous_results(self.user))
+
+    def test_drop_previous_results(self):
+        """Test that only the latest results of the user are kept, and the other users' are untouched."""
+
+        other_upload = self.create_upload(create_user("other@test.com", "test_password"), {"rows": {}})
+        self.create_upload(self.user, {"rows": {}}, timezone.now() - timedelta(minutes=2))
+        self.create_upload(self.user, {"rows": {}}, timezone.now() - timedelta(minutes=1))
+        latest_upload = self.create_upload(self.user, {"rows": {"1": "OK"}})
+
+        UploadValidationResultService.drop_previous_results(latest_upload)
+
+        self.assertEqual(
+            list(AssetFileUploadHistory.objects.filter(validation_results__isnull=False).order_by("pk").values_list("pk", flat=True)),
+            [other_upload.pk, latest_upload.pk],
+        )
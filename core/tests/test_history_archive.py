@@ -0,0 +1,102 @@
+"""Unit tests for the archiving of closed requisitions and the asset history endpoint."""
+
+from datetime import datetime, timezone as dt_timezone
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..models import AssetOwnerHistory, AssetOwnerHistoryArchive, AssetOwnerHistoryRollup, AssetType
+from ..services.archives import HistoryArchiveService
+from ..services.users import UserService
+from .test_asset_models import create_asset
+from .test_user_models import create_groups, create_user
+
+
+def get_datetime(month, day):
+    return datetime(2026, month, day, 12, tzinfo=dt_timezone.utc)
+
+
+@skipUnless(connection.vendor == "postgresql", "Requisitions are archived with a data-modifying CTE, which needs PostgreSQL.")
+class TestHistoryArchive(TestCase):
+    """
+    Test suite for HistoryArchiveService and the /asset/<id>/history endpoint.
+    Three requisitions closed before the horizon are archived, in January (two) and February; a closed
+    one after the horizon and an open one stay live.
+    """
+
+    HORIZON = get_datetime(6, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.user = create_user("user@test.com", "test_password")
+        cls.moderator = create_user("moderator@test.com", "test_password")
+        UserService.make_user_mod(cls.moderator)
+        asset_type = AssetType.objects.create(type="Hardware(HDW)", sub_type="Cable(CBL)", group="Ethernet(ETH)", description="Cables")
+        cls.asset = create_asset("Cable", "Ethernet cable", 10, cls.moderator, asset_type, "Pune", "Dell")
+
+        cls.closed = [
+            AssetOwnerHistory.objects.create(user=cls.user, asset=cls.asset, start_date=start, end_date=end, requisition_qunatity=quantity)
+            for start, end, quantity in (
+                (get_datetime(1, 5), get_datetime(1, 20), 2),
+                (get_datetime(1, 25), get_datetime(2, 10), 3),
+                (get_datetime(2, 1), get_datetime(2, 15), 4),
+            )
+        ]
+        cls.live = [
+            AssetOwnerHistory.objects.create(user=cls.user, asset=cls.asset, start_date=get_datetime(5, 1), end_date=get_datetime(7, 1), requisition_qunatity=1),
+            AssetOwnerHistory.objects.create(user=cls.moderator, asset=cls.asset, start_date=get_datetime(8, 1), requisition_qunatity=5),
+        ]
+
+    def test_archive_batch(self):
+        """Test that a batch moves the oldest closed requisitions, and only those, to the archive."""
+
+        self.assertEqual(HistoryArchiveService.archive_batch(self.HORIZON, 2), 2)
+
+        self.assertEqual(
+            set(AssetOwnerHistoryArchive.objects.values_list("history_id", "start_date", "requisition_qunatity")),
+            {(history.id, history.start_date, history.requisition_qunatity) for history in self.closed[:2]},
+        )
+        self.assertEqual(
+            set(AssetOwnerHistory.objects.values_list("id", flat=True)),
+            {history.id for history in self.closed[2:] + self.live},
+        )
+
+    def test_rollups(self):
+        """Test that archiving one requisition per batch adds each to the monthly rollup of its asset and user."""
+
+        self.assertEqual(HistoryArchiveService.archive(self.HORIZON, batch_size=1), 3)
+        self.assertEqual(HistoryArchiveService.archive(self.HORIZON, batch_size=1), 0)
+
+        rollups = {
+            rollup.month.month: (rollup.requisition_count, rollup.total_quantity, rollup.first_start_date, rollup.last_end_date)
+            for rollup in AssetOwnerHistoryRollup.objects.filter(asset=self.asset, user=self.user)
+        }
+        self.assertEqual(
+            rollups,
+            {
+                1: (2, 5, get_datetime(1, 5), get_datetime(2, 10)),
+                2: (1, 4, get_datetime(2, 1), get_datetime(2, 15)),
+            },
+        )
+
+    def test_history_endpoint(self):
+        """Test that the history unions the live requisitions with the rollups, newest first."""
+
+        HistoryArchiveService.archive(self.HORIZON)
+        client = APIClient()
+        client.force_authenticate(self.moderator)
+
+        response = client.get(f"/asset/{self.asset.id}/history")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 4)
+        self.assertEqual(
+            [(entry["owner_id"], entry["quantity"], entry["requisitions"], entry["archived"]) for entry in response.json()["data"]],
+            [(self.moderator.id, 5, 1, False), (self.user.id, 1, 1, False), (self.user.id, 4, 1, True), (self.user.id, 5, 2, True)],
+        )
+
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get(f"/asset/{self.asset.id}/history").status_code, 403)
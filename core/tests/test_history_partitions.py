@@ -0,0 +1,69 @@
+"""Unit tests for the asset owner history partitioning."""
+
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from ..services.partitions import HistoryPartitionService
+
+
+class TestHistoryPartitionService(SimpleTestCase):
+    """
+    Test suite for the month arithmetic and naming used by the history partitions.
+    Methods:
+        test_add_months(): Months roll over the year boundary in both directions.
+        test_partition_name(): Partitions are named after the month they hold.
+        test_partition_bounds(): A partition covers exactly one calendar month.
+    """
+
+    def test_add_months(self):
+        """Test month arithmetic across year boundaries."""
+
+        self.assertEqual(HistoryPartitionService.add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(HistoryPartitionService.add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+        self.assertEqual(HistoryPartitionService.get_month(date(2025, 3, 17)), date(2025, 3, 1))
+
+    def test_partition_name(self):
+        """Test the partition name of a month."""
+
+        self.assertEqual(HistoryPartitionService.get_partition_name(date(2025, 3, 1)), "core_assetownerhistory_y2025m03")
+
+    def test_partition_bounds(self):
+        """Test the partition bounds of a month."""
+
+        self.assertEqual(
+            HistoryPartitionService.get_partition_bounds(date(2025, 12, 1)),
+            ("2025-12-01 00:00:00+00", "2026-01-01 00:00:00+00"),
+        )
+
+
+@patch("core.services.partitions.HistoryPartitionService.is_partitioned")
+class TestHistoryPartitionsCommand(SimpleTestCase):
+    """Test suite for the `history_partitions` management command."""
+
+    def test_table_not_partitioned(self, patched_is_partitioned):
+        """Test that the command refuses to run on an unpartitioned table."""
+
+        patched_is_partitioned.return_value = False
+        with self.assertRaises(CommandError):
+            call_command("history_partitions", stdout=StringIO())
+
+    @patch("core.services.partitions.HistoryPartitionService.create_partition")
+    def test_creates_partitions_ahead(self, patched_create_partition, patched_is_partitioned):
+        """Test that the current month and the requested months ahead are created."""
+
+        patched_is_partitioned.return_value = True
+        patched_create_partition.return_value = True
+        call_command("history_partitions", ahead=2, stdout=StringIO())
+        self.assertEqual(patched_create_partition.call_count, 3)
+
+    def test_invalid_month(self, patched_is_partitioned):
+        """Test that an invalid month is rejected."""
+
+        patched_is_partitioned.return_value = True
+        with self.assertRaises(CommandError):
+            call_command("history_partitions", from_month="2025/01", stdout=StringIO())
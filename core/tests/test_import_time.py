@@ -0,0 +1,56 @@
+"""Import time budget of a worker / management command start."""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+STARTUP_SCRIPT = "import django; django.setup(); from django.urls import resolve; resolve('/asset')"
+
+# Generous on purpose: the test is about keeping heavy imports out of startup, not about the speed of the machine.
+IMPORT_TIME_BUDGET_SECONDS = 3.0
+
+# Only needed by the file endpoints, imported on their first use.
+LAZY_MODULES = ("pandas", "numpy")
+
+
+class TestImportTime(SimpleTestCase):
+    """
+    Test suite for the startup imports.
+    `django.setup()` and URL resolution are run in a fresh interpreter with `-X importtime`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Lines look like "import time:  self [us] | cumulative | imported package", nested imports are indented.
+        cls.imports = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cls.imports.append((name.rstrip(), int(cumulative)))
+
+    def test_heavy_modules_are_lazy(self):
+        """Test that pandas and NumPy are not imported at startup."""
+
+        imported = {name.strip().split(".")[0] for name, _ in self.imports}
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, imported)
+
+    def test_import_time_budget(self):
+        """Test that the startup imports stay within the budget."""
+
+        total = sum(cumulative for name, cumulative in self.imports if not name.startswith("  ")) / 1_000_000
+        self.assertLess(total, IMPORT_TIME_BUDGET_SECONDS)
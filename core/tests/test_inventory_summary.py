@@ -0,0 +1,46 @@
+"""Unit tests for the inventory summary service."""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from ..services.summary import InventorySummaryService
+
+
+@patch("core.services.summary.connection")
+class TestInventorySummaryService(SimpleTestCase):
+    """
+    Test suite for InventorySummaryService.get_summary.
+    The grouping sets query is mocked, the tests check how its rows are split into the summary levels.
+    """
+
+    def test_summary_levels(self, patched_connection):
+        """Test that every grouping set row lands in its summary level."""
+
+        patched_connection.cursor.return_value.__enter__.return_value.fetchall.return_value = [
+            ("Hardware(HDW)", "Cable(CBL)", "Ethernet(ETH)", None, 0b0001, 10, 2),
+            ("Hardware(HDW)", "Cable(CBL)", None, None, 0b0011, 10, 2),
+            ("Hardware(HDW)", None, None, None, 0b0111, 10, 2),
+            (None, None, None, "Pune", 0b1110, 10, 2),
+            (None, None, None, None, 0b1111, 10, 2),
+        ]
+
+        summary = InventorySummaryService.get_summary()
+
+        self.assertEqual(summary["group"], [{"type": "Hardware(HDW)", "sub_type": "Cable(CBL)", "group": "Ethernet(ETH)", "total_quantity": 10, "asset_count": 2}])
+        self.assertEqual(summary["sub_type"], [{"type": "Hardware(HDW)", "sub_type": "Cable(CBL)", "total_quantity": 10, "asset_count": 2}])
+        self.assertEqual(summary["type"], [{"type": "Hardware(HDW)", "total_quantity": 10, "asset_count": 2}])
+        self.assertEqual(summary["location"], [{"location": "Pune", "total_quantity": 10, "asset_count": 2}])
+        self.assertEqual(summary["total"], {"total_quantity": 10, "asset_count": 2})
+
+    def test_empty_summary(self, patched_connection):
+        """Test the summary of an empty inventory."""
+
+        patched_connection.cursor.return_value.__enter__.return_value.fetchall.return_value = [
+            (None, None, None, None, 0b1111, 0, 0),
+        ]
+
+        summary = InventorySummaryService.get_summary()
+
+        self.assertEqual(summary["type"], [])
+        self.assertEqual(summary["total"], {"total_quantity": 0, "asset_count": 0})
@@ -0,0 +1,39 @@
+"""Unit tests for the structured log formatters and the row sampling."""
+
+import json
+import logging
+
+from django.test import SimpleTestCase, override_settings
+
+from ..log import JsonFormatter, KeyValueFormatter, is_row_sampled
+
+
+class TestLog(SimpleTestCase):
+    """Test suite for the "inventory" log output."""
+
+    def setUp(self):
+        self.record = logging.makeLogRecord(
+            {"name": "inventory.files", "levelname": "INFO", "msg": "Validated %s", "args": ("upload.csv",), "rows": 3}
+        )
+
+    def test_formatters(self):
+        """Test that the `extra` fields of a call are logged as fields."""
+
+        entry = json.loads(JsonFormatter().format(self.record))
+
+        self.assertEqual(entry["message"], "Validated upload.csv")
+        self.assertEqual(entry["logger"], "inventory.files")
+        self.assertEqual(entry["rows"], 3)
+        self.assertTrue(KeyValueFormatter().format(self.record).endswith("INFO inventory.files Validated upload.csv rows=3"))
+
+    @override_settings(LOG_ROW_SAMPLE_RATE=1.0)
+    def test_row_sampling(self):
+        """Test that rows are only sampled when DEBUG is enabled."""
+
+        logger = logging.getLogger("inventory.tests")
+        self.addCleanup(logger.setLevel, logging.NOTSET)
+
+        logger.setLevel(logging.INFO)
+        self.assertFalse(is_row_sampled(logger))
+        logger.setLevel(logging.DEBUG)
+        self.assertTrue(is_row_sampled(logger))
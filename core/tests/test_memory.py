@@ -0,0 +1,38 @@
+"""Unit tests for the memory instrumentation of file jobs."""
+
+from django.test import SimpleTestCase, override_settings
+
+from ..services.memory import MemoryService
+
+
+class TestMemoryService(SimpleTestCase):
+    """Test suite for the per stage memory records."""
+
+    @override_settings(FILE_MEMORY_PROFILING=True, FILE_MEMORY_TOP_SITES=3)
+    def test_stages(self):
+        """Test that every stage of an instrumented job records its peak, top sites and DataFrame memory."""
+
+        from pandas import DataFrame
+
+        with MemoryService.job() as memory:
+            with MemoryService.stage("parse") as stage:
+                stage["dataframe"] = DataFrame({"Asset ID": range(10_000)})
+            with MemoryService.stage("write"):
+                buffer = [bytearray(1_000) for _ in range(1_000)]
+
+        profile = memory.as_dict()
+
+        self.assertEqual([stage["stage"] for stage in profile["stages"]], ["parse", "write"])
+        self.assertGreater(profile["stages"][0]["dataframe_bytes"], 0)
+        self.assertIsNone(profile["stages"][1]["dataframe_bytes"])
+        self.assertGreaterEqual(profile["stages"][1]["tracemalloc_peak_bytes"], len(buffer) * 1_000)
+        self.assertLessEqual(len(profile["stages"][1]["top_sites"]), 3)
+        self.assertEqual(profile["tracemalloc_peak_bytes"], max(stage["tracemalloc_peak_bytes"] for stage in profile["stages"]))
+
+    def test_disabled(self):
+        """Test that nothing is recorded when the instrumentation is off."""
+
+        with MemoryService.job() as memory, MemoryService.stage("parse") as stage:
+            stage["dataframe"] = None
+
+        self.assertIsNone(memory)
@@ -0,0 +1,82 @@
+"""Unit tests for the request metrics."""
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..services.metrics import MetricsService, RequestMetrics
+from .test_user_models import create_groups, create_user
+
+
+class TestMetricsService(SimpleTestCase):
+    """Test suite for the per route histograms and the Server-Timing header."""
+
+    def setUp(self):
+        MetricsService._histograms.clear()
+        MetricsService._requests.clear()
+
+    def test_request_histogram(self):
+        """Test that request durations land in cumulative buckets of their route."""
+
+        MetricsService.record_request("asset-list", "GET", 200, 0.02, None, end=0.0)
+        MetricsService.record_request("asset-list", "GET", 200, 0.3, None, end=0.0)
+
+        rendered = MetricsService.render()
+
+        self.assertIn('inventory_requests_total{route="asset-list",method="GET",status="200"} 2', rendered)
+        self.assertIn('inventory_request_duration_seconds_bucket{route="asset-list",method="GET",le="0.01"} 0', rendered)
+        self.assertIn('inventory_request_duration_seconds_bucket{route="asset-list",method="GET",le="0.025"} 1', rendered)
+        self.assertIn('inventory_request_duration_seconds_bucket{route="asset-list",method="GET",le="+Inf"} 2', rendered)
+        self.assertIn('inventory_request_duration_seconds_count{route="asset-list",method="GET"} 2', rendered)
+        self.assertNotIn('inventory_sql_queries_count{route="asset-list"', rendered)
+
+    def test_sampled_request(self):
+        """Test that a sampled request records its SQL timings and reports them in the Server-Timing header."""
+
+        metrics = RequestMetrics()
+        metrics.sql_count, metrics.sql_time, metrics.render_time, metrics.view_start = 4, 0.003, 0.001, 1.0
+
+        MetricsService.record_request("asset-detail", "GET", 200, 0.02, metrics, end=1.01)
+
+        self.assertIn('inventory_sql_queries_bucket{route="asset-detail",method="GET",le="5"} 1', MetricsService.render())
+        self.assertEqual(
+            MetricsService.get_server_timing(metrics, 0.02, end=1.01),
+            'sql;dur=3.0;desc="4 queries", render;dur=1.0, view;dur=10.0, total;dur=20.0',
+        )
+
+
+class TestMetricsEndpoints(TestCase):
+    """Test suite for the Server-Timing header and the access to /metrics."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.superuser = get_user_model().objects.create_superuser("admin@test.com", "test_password")
+        cls.user = create_user("user@test.com", "test_password")
+
+    def get_headers(self, user):
+        return {"Authorization": f"JWT {AccessToken.for_user(user)}"}
+
+    @override_settings(METRICS_SAMPLE_RATE=1.0)
+    def test_server_timing(self):
+        """Test that the Server-Timing header, with the render time of the response, is only sent when turned on."""
+
+        response = self.client.get("/asset", headers=self.get_headers(self.user))
+        self.assertNotIn("Server-Timing", response)
+
+        with override_settings(METRICS_SERVER_TIMING=True):
+            response = self.client.get("/asset", headers=self.get_headers(self.user))
+        self.assertRegex(response["Server-Timing"], r"^sql;dur=[\d.]+;desc=\"\d+ queries\", render;dur=[\d.]+, view;dur=")
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_metrics_access(self):
+        """Test that /metrics is served to superusers and to the bearer of METRICS_TOKEN only."""
+
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", headers={"Authorization": "Bearer other-token"}).status_code, 401)
+        self.assertEqual(self.client.get("/metrics", headers=self.get_headers(self.user)).status_code, 401)
+        self.assertEqual(self.client.get("/metrics", headers={"Authorization": "Bearer scrape-token"}).status_code, 200)
+        self.assertEqual(self.client.get("/metrics", headers=self.get_headers(self.superuser)).status_code, 200)
+
+        with override_settings(METRICS_TOKEN=""):
+            self.assertEqual(self.client.get("/metrics", headers={"Authorization": "Bearer "}).status_code, 401)
@@ -0,0 +1,112 @@
+"""Unit tests for the on demand request profiling."""
+
+import cProfile
+import os
+import pstats
+import tempfile
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..services.profiling import ProfilingService
+from .test_user_models import create_groups, create_user
+
+
+class TestProfilingService(SimpleTestCase):
+    """Test suite for storing and listing request profiles."""
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+
+    def test_is_requested(self):
+        """Test that a profile is asked for with the query flag or the header."""
+
+        factory = RequestFactory()
+
+        self.assertTrue(ProfilingService.is_requested(factory.get("/asset", {"profile": "1"})))
+        self.assertTrue(ProfilingService.is_requested(factory.post("/asset/assign", headers={"X-Profile": "1"})))
+        self.assertFalse(ProfilingService.is_requested(factory.get("/asset")))
+
+    def test_save_and_prune(self):
+        """Test that profiles are listed newest first, the oldest pruned and only stored names resolved."""
+
+        request = SimpleNamespace(method="POST", resolver_match=SimpleNamespace(view_name="asset-files-upload"))
+        profiler = cProfile.Profile()
+        profiler.runcall(sum, range(10))
+
+        with override_settings(MEDIA_ROOT=self.media_root.name, PROFILING_MAX_FILES=2):
+            names = [ProfilingService.save(profiler, request, 1.5) for _ in range(3)]
+            profiles = ProfilingService.list_profiles()
+
+            self.assertEqual(len(profiles), 2)
+            self.assertEqual(profiles[0]["route"], "asset-files-upload")
+            self.assertEqual(profiles[0]["duration_ms"], 1500)
+            self.assertIsNotNone(ProfilingService.get_profile_path(profiles[0]["name"]))
+            self.assertIn("{built-in method builtins.sum}", ProfilingService.get_stats_text(ProfilingService.get_profile_path(names[-1])))
+            self.assertIsNone(ProfilingService.get_profile_path(os.path.join("..", names[-1])))
+
+
+class TestProfilingMiddleware(TestCase):
+    """Test suite for the profiling of superuser requests, over WSGI and ASGI."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.superuser = get_user_model().objects.create_superuser("admin@test.com", "test_password")
+        cls.user = create_user("user@test.com", "test_password")
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def get_headers(self, user):
+        return {"Authorization": f"JWT {AccessToken.for_user(user)}"}
+
+    def get_profiled_files(self, name):
+        """The source files of the functions in a stored profile."""
+        return {filename for filename, _, _ in pstats.Stats(ProfilingService.get_profile_path(name)).stats}
+
+    def test_superuser_profile(self):
+        """Test that a superuser asking for a profile gets it stored and named in the X-Profile header."""
+
+        response = self.client.get("/asset", {"profile": "1"}, headers=self.get_headers(self.superuser))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(ProfilingService.get_profile_path(response["X-Profile"]))
+        self.assertEqual(len(ProfilingService.list_profiles()), 1)
+
+    def test_not_superuser(self):
+        """Test that other users are served without a profile."""
+
+        response = self.client.get("/asset", {"profile": "1"}, headers=self.get_headers(self.user))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile", response)
+        self.assertEqual(ProfilingService.list_profiles(), [])
+
+    def test_profiler_busy(self):
+        """Test that a request arriving while another one is profiled is served without a profile."""
+
+        self.assertTrue(ProfilingService.acquire())
+        self.addCleanup(ProfilingService.release)
+
+        response = self.client.get("/asset", {"profile": "1"}, headers=self.get_headers(self.superuser))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile", response)
+
+    async def test_asgi_profile(self):
+        """Test that over ASGI the profile covers the sync views, which run in a thread, and the async views."""
+
+        client = AsyncClient()
+        for path, view_file in (("/asset", os.path.join("asset", "views.py")), ("/async/asset", os.path.join("asset", "async_views.py"))):
+            response = await client.get(path, {"profile": "1"}, headers=self.get_headers(self.superuser))
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(any(filename.endswith(view_file) for filename in self.get_profiled_files(response["X-Profile"])))
@@ -0,0 +1,68 @@
+"""Unit tests for the read replica router."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from ..models import Asset
+from ..routers import ReplicaRouter, replica_reads
+from ..services.replicas import ReplicaService
+
+
+@patch("core.services.replicas.ReplicaService.get_replica_aliases", return_value=["replica_1"])
+@patch("core.services.replicas.ReplicaService.get_replica_lag")
+class TestReplicaRouter(SimpleTestCase):
+    """
+    Test suite for ReplicaRouter and ReplicaService.
+    The replica lag is mocked, the tests check where reads and writes are routed.
+    """
+
+    def setUp(self):
+        ReplicaService._lag_checks.clear()
+        self.token = replica_reads.set(True)
+
+    def tearDown(self):
+        replica_reads.reset(self.token)
+        cache.clear()
+
+    def test_read_from_replica(self, patched_lag, patched_aliases):
+        """Test that reads of a replica read view go to an up to date replica, and writes to the primary."""
+
+        patched_lag.return_value = 0.5
+        self.assertEqual(ReplicaRouter().db_for_read(Asset), "replica_1")
+        self.assertEqual(ReplicaRouter().db_for_write(Asset), "default")
+
+    def test_read_outside_replica_views(self, patched_lag, patched_aliases):
+        """Test that reads outside of replica read views go to the primary."""
+
+        replica_reads.set(False)
+        self.assertEqual(ReplicaRouter().db_for_read(Asset), "default")
+        patched_lag.assert_not_called()
+
+    def test_lagging_replica(self, patched_lag, patched_aliases):
+        """Test that reads fall back to the primary when the replica lags behind or is unreachable."""
+
+        patched_lag.return_value = 60.0
+        self.assertEqual(ReplicaRouter().db_for_read(Asset), "default")
+
+        ReplicaService._lag_checks.clear()
+        patched_lag.return_value = None
+        self.assertEqual(ReplicaRouter().db_for_read(Asset), "default")
+
+    def test_lag_check_is_cached(self, patched_lag, patched_aliases):
+        """Test that the replica lag is not queried on every read."""
+
+        patched_lag.return_value = 0.0
+        for _ in range(3):
+            ReplicaRouter().db_for_read(Asset)
+        self.assertEqual(patched_lag.call_count, 1)
+
+    def test_pinned_user(self, patched_lag, patched_aliases):
+        """Test that a user is pinned to the primary after a write."""
+
+        user = SimpleNamespace(pk=1, is_authenticated=True)
+        self.assertFalse(ReplicaService.is_user_pinned(user))
+        ReplicaService.pin_user_to_primary(user)
+        self.assertTrue(ReplicaService.is_user_pinned(user))
@@ -0,0 +1,45 @@
+"""Unit tests for the slow query recorder."""
+
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from ..services.slowqueries import SlowQueryService
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=100, SLOW_QUERY_SAMPLE_RATE=1.0)
+@patch("core.services.slowqueries.time.perf_counter")
+class TestSlowQueryService(SimpleTestCase):
+    """Test suite for the slow query execute wrapper and its ring buffer."""
+
+    def setUp(self):
+        SlowQueryService.clear()
+        self.connection = Mock(vendor="sqlite", alias="default")
+
+    def test_slow_query_recorded(self, patched_perf_counter):
+        """Test that a query over the threshold is recorded with its parameters."""
+
+        patched_perf_counter.side_effect = [0.0, 0.25]
+        execute = Mock(return_value="result")
+
+        result = SlowQueryService.sql_execute_wrapper(execute, "SELECT %s", (1,), False, {"connection": self.connection})
+
+        self.assertEqual(result, "result")
+        [slow_query] = SlowQueryService.get_slow_queries()
+        self.assertEqual((slow_query["sql"], slow_query["params"], slow_query["duration_ms"]), ("SELECT %s", "(1,)", 250.0))
+
+    def test_fast_query_ignored(self, patched_perf_counter):
+        """Test that a query under the threshold is not recorded."""
+
+        patched_perf_counter.side_effect = [0.0, 0.05]
+        SlowQueryService.sql_execute_wrapper(Mock(), "SELECT 1", None, False, {"connection": self.connection})
+
+        self.assertEqual(SlowQueryService.get_slow_queries(), [])
+
+    def test_only_reads_are_analyzed(self, patched_perf_counter):
+        """Test that only plain reads are run again under EXPLAIN ANALYZE."""
+
+        self.assertTrue(SlowQueryService.is_read_only("SELECT * FROM core_asset"))
+        self.assertFalse(SlowQueryService.is_read_only("SELECT * FROM core_asset FOR UPDATE"))
+        self.assertFalse(SlowQueryService.is_read_only("UPDATE core_asset SET quantity = 1"))
+        self.assertFalse(SlowQueryService.is_read_only("WITH moved AS (DELETE FROM t RETURNING *) SELECT * FROM moved"))
@@ -0,0 +1,41 @@
+"""Unit tests for the SQL attribution comments."""
+
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase
+
+from ..services.sqlcomments import SqlCommentService
+from ..services.users import UserService
+
+
+class TestSqlCommentService(SimpleTestCase):
+    """Test suite for the sqlcommenter style comments appended to SQL queries."""
+
+    def test_comment(self):
+        """Test that fields are sorted, URL encoded and escaped for parametrized queries."""
+
+        fields = {"route": "asset-detail", "request_id": "a b*/", "action": "retrieve", "service": None}
+
+        self.assertEqual(
+            SqlCommentService.add_comment("SELECT 1", fields, has_params=False),
+            "SELECT 1 /*action='retrieve',request_id='a%20b%2A%2F',route='asset-detail'*/",
+        )
+        self.assertEqual(
+            SqlCommentService.add_comment("SELECT %s", fields),
+            "SELECT %s /*action='retrieve',request_id='a%%20b%%2A%%2F',route='asset-detail'*/",
+        )
+
+    def test_existing_comment(self):
+        """Test that queries which already carry a comment are left alone."""
+
+        self.assertEqual(SqlCommentService.add_comment("SELECT 1 /*x*/", {"route": "asset-list"}), "SELECT 1 /*x*/")
+
+    def test_service_name(self):
+        """Test that the innermost service method on the call stack is reported."""
+
+        self.assertIsNone(SqlCommentService.get_service_name())
+
+        user = Mock()
+        user.groups.filter.return_value.exists.side_effect = SqlCommentService.get_service_name
+
+        self.assertIn("is_user_in_group", UserService.is_user_in_group(user, "Asset User"))
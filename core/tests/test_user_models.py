@@ -4,10 +4,17 @@ from django.test import TestCase
 from django.core.exceptions import ValidationError
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 
 from ..models import Profile
 
 
+def create_groups():
+    """Creates the role groups, which new users are added to. They are created by the admins, not by a migration."""
+    for name in ("Asset User", "Asset Moderator", "Asset Admin"):
+        Group.objects.get_or_create(name=name)
+
+
 def create_user(email, password):
     return get_user_model().objects.create_user(email=email, password=password)
 
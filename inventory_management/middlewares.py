@@ -1,16 +1,204 @@
+import cProfile
 import json
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.services.metrics import MetricsService, RequestMetrics, current_request_metrics
+from core.services.profiling import ProfilingService
+from core.services.sqlcomments import current_sql_context
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the duration of every request in the per route histograms of /metrics. Sampled requests
+    also record their SQL, render and view timings, returned in a Server-Timing header with METRICS_SERVER_TIMING.
+    Keep it first in MIDDLEWARE so the total covers the other middlewares.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics() if MetricsService.is_sampled() else None
+        start = time.perf_counter()
+        token = current_request_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        return self.record(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics() if MetricsService.is_sampled() else None
+        start = time.perf_counter()
+        token = current_request_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        return self.record(request, response, metrics, start)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = current_request_metrics.get()
+        if metrics is not None:
+            metrics.view_start = time.perf_counter()
+
+    def record(self, request, response, metrics, start):
+        end = time.perf_counter()
+        route = request.resolver_match.view_name if request.resolver_match else "unmatched"
+        MetricsService.record_request(route, request.method, response.status_code, end - start, metrics, end)
+        if metrics is not None and settings.METRICS_SERVER_TIMING:
+            response["Server-Timing"] = MetricsService.get_server_timing(metrics, end - start, end)
+        return response
+
+
+class SqlCommenterMiddleware:
+    """
+    Provides the route, view action and request id appended to the SQL queries of the request
+    (see SqlCommentService). The request id is taken from the X-Request-ID header when present
+    and returned in the response.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SQL_COMMENTER_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        sql_context = {"request_id": request.headers.get("X-Request-ID") or uuid.uuid4().hex}
+        token = current_sql_context.set(sql_context)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_sql_context.reset(token)
+        response["X-Request-ID"] = sql_context["request_id"]
+        return response
+
+    async def __acall__(self, request):
+        sql_context = {"request_id": request.headers.get("X-Request-ID") or uuid.uuid4().hex}
+        token = current_sql_context.set(sql_context)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_sql_context.reset(token)
+        response["X-Request-ID"] = sql_context["request_id"]
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        sql_context = current_sql_context.get()
+        if sql_context is not None:
+            # DRF viewsets map the HTTP method to the action name.
+            actions = getattr(view_func, "actions", None) or {}
+            sql_context["route"] = request.resolver_match.view_name
+            sql_context["action"] = actions.get(request.method.lower(), view_func.__name__)
+
+
+class ProfilingMiddleware:
+    """
+    Runs the requests of superusers asking for it (`?profile=1` or `X-Profile: 1`) under cProfile and
+    returns the name of the stored profile, listed on /profiles, in an X-Profile header. Requests that
+    arrive while another request of the worker is being profiled are served without a profile.
+
+    Before Python 3.12 cProfile only sees the thread that enabled it. Over ASGI, sync views run in the
+    request's thread of sync_to_async (thread sensitive, one per request), so the profiler is enabled in
+    that thread. Async views run in the event loop, and their profile also covers whatever else the
+    event loop runs meanwhile.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not (ProfilingService.is_requested(request) and ProfilingService.is_allowed(request) and ProfilingService.acquire()):
+            return self.get_response(request)
+
+        try:
+            profiler, start = cProfile.Profile(), time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            response["X-Profile"] = ProfilingService.save(profiler, request, time.perf_counter() - start)
+        finally:
+            ProfilingService.release()
+        return response
+
+    async def __acall__(self, request):
+        if not (
+            ProfilingService.is_requested(request)
+            and await sync_to_async(ProfilingService.is_allowed)(request)
+            and ProfilingService.acquire()
+        ):
+            return await self.get_response(request)
+
+        try:
+            profiler, start = cProfile.Profile(), time.perf_counter()
+            in_event_loop = ProfilingService.is_async_view(request)
+            if in_event_loop:
+                profiler.enable()
+            else:
+                await sync_to_async(profiler.enable)()
+            try:
+                response = await self.get_response(request)
+            finally:
+                if in_event_loop:
+                    profiler.disable()
+                else:
+                    await sync_to_async(profiler.disable)()
+            response["X-Profile"] = await sync_to_async(ProfilingService.save)(profiler, request, time.perf_counter() - start)
+        finally:
+            ProfilingService.release()
+        return response
 
 
 class CustomResponseMiddleware:
+    # Async capable, so async views served over ASGI are not switched to a thread by this middleware.
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
         self.excluded_paths = ["api", "login", "profile", "admin"]
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
         return response
 
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return response
+
     def process_response(self, request, json_response):
         if (
             any(request.path.startswith(path) for path in self.excluded_paths)
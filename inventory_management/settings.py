@@ -40,6 +40,7 @@ DJANGO_INBUILT_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 DJANGO_CUSTOM_APPS = ["core", "userprofile", "asset"]
@@ -54,11 +55,14 @@ THIRD_PARTY_APPS = [
 INSTALLED_APPS = DJANGO_INBUILT_APPS + DJANGO_CUSTOM_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    'inventory_management.middlewares.RequestMetricsMiddleware',
+    'inventory_management.middlewares.SqlCommenterMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'inventory_management.middlewares.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'inventory_management.middlewares.CustomResponseMiddleware',
@@ -83,6 +87,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'inventory_management.wsgi.application'
+ASGI_APPLICATION = 'inventory_management.asgi.application'
 
 
 # Database
@@ -96,9 +101,112 @@ DATABASES = {
         'PASSWORD': 'postgres',
         'HOST': 'db',
         'PORT': '5432',
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
     }
 }
 
+# Connection pooling (psycopg 3). Pooled connections are reused across requests instead of being opened for
+# each one, and are health checked before being handed out. Pooling and CONN_MAX_AGE are mutually exclusive.
+DB_CONN_POOL = os.environ.get('DB_CONN_POOL', '1') == '1'
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+
+# Opt-in: with DB_PREPARE_THRESHOLD set, a query executed that many times on a connection is prepared on the server,
+# so the hot queries skip parsing and planning. Prepared statements need server side parameter binding, under which
+# statements such as DDL cannot take query parameters; check the raw SQL before turning it on. 0 disables it.
+DB_PREPARE_THRESHOLD = int(os.environ.get('DB_PREPARE_THRESHOLD', 0))
+
+if DB_CONN_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': DB_POOL_MIN_SIZE,
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': DB_POOL_TIMEOUT,
+    }
+if DB_PREPARE_THRESHOLD:
+    DATABASES['default']['OPTIONS']['server_side_binding'] = True
+    DATABASES['default']['OPTIONS']['prepare_threshold'] = DB_PREPARE_THRESHOLD
+
+# Read replicas. Every "host[:port]" of DB_REPLICA_HOSTS becomes a "replica_<n>" alias with the credentials of the
+# primary. DB_REPLICA_SIMULATE=1 (without hosts) adds a "replica_1" alias pointing at the primary to try the routing locally.
+DB_REPLICA_HOSTS = [host for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if host]
+if not DB_REPLICA_HOSTS and os.environ.get('DB_REPLICA_SIMULATE') == '1':
+    DB_REPLICA_HOSTS = [DATABASES['default']['HOST']]
+
+for idx, replica_host in enumerate(DB_REPLICA_HOSTS, start=1):
+    host, _, port = replica_host.partition(':')
+    DATABASES[f'replica_{idx}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Replicas more than REPLICA_MAX_LAG_SECONDS behind (checked every REPLICA_LAG_CHECK_INTERVAL seconds) are skipped.
+# After /asset/assign, the reads of both users stay on the primary for REPLICA_STICKY_SECONDS.
+REPLICA_MAX_LAG_SECONDS = 5
+REPLICA_LAG_CHECK_INTERVAL = 5
+REPLICA_STICKY_SECONDS = 30
+
+
+# Request metrics, exposed on /metrics to superusers and to scrapers sending METRICS_TOKEN. A METRICS_SAMPLE_RATE share
+# of the requests also records SQL, render and view timings, returned in a Server-Timing header with METRICS_SERVER_TIMING.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', 1.0))
+METRICS_SERVER_TIMING = os.environ.get('METRICS_SERVER_TIMING', '0') == '1'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Opt-in sqlcommenter style comments (route, view action, service function, request id) on every SQL query.
+# The request id makes every query text unique, which defeats server side prepared statements; leave it out of
+# SQL_COMMENTER_FIELDS when they matter more than per request tracing.
+SQL_COMMENTER_ENABLED = os.environ.get('SQL_COMMENTER_ENABLED', '0') == '1'
+SQL_COMMENTER_FIELDS = ('route', 'action', 'service', 'request_id')
+
+# Slow query recorder: queries over SLOW_QUERY_THRESHOLD_MS are kept, with their plan, in a ring buffer of the last
+# SLOW_QUERY_BUFFER_SIZE per worker, listed to superusers on /slow-queries. Enable it in staging; in production lower
+# SLOW_QUERY_SAMPLE_RATE, as the plan of a slow SELECT comes from running it again under EXPLAIN ANALYZE.
+SLOW_QUERY_ENABLED = os.environ.get('SLOW_QUERY_ENABLED', '0') == '1'
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_SAMPLE_RATE', 1.0))
+SLOW_QUERY_BUFFER_SIZE = 100
+SLOW_QUERY_EXPLAIN = True
+
+# Logging of the "inventory" loggers, as text (`key=value` fields) or one JSON object per line (LOG_FORMAT=json).
+# Per-row loops log a summary per job at INFO; with LOG_LEVEL=DEBUG, a LOG_ROW_SAMPLE_RATE share of their rows
+# is logged too.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+LOG_ROW_SAMPLE_RATE = float(os.environ.get('LOG_ROW_SAMPLE_RATE', 0.01))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'text': {'()': 'core.log.KeyValueFormatter'},
+        'json': {'()': 'core.log.JsonFormatter'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': LOG_FORMAT},
+    },
+    'loggers': {
+        'inventory': {'handlers': ['console'], 'level': LOG_LEVEL, 'propagate': False},
+    },
+}
+
+# Memory instrumentation of /file/upload (tracemalloc peak and top allocation sites, RSS and DataFrame memory per
+# stage), stored on the AssetFileUploadHistory record. tracemalloc slows the job down, enable it to size workers.
+FILE_MEMORY_PROFILING = os.environ.get('FILE_MEMORY_PROFILING', '0') == '1'
+FILE_MEMORY_TOP_SITES = 10
+
+# On demand cProfile profiles of single requests of superusers (`?profile=1` or an `X-Profile: 1` header), kept under
+# MEDIA_ROOT/profiles and listed on /profiles. Only the last PROFILING_MAX_FILES profiles are kept.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '1') == '1'
+PROFILING_MAX_FILES = 100
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -150,6 +258,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -174,4 +286,32 @@ DJOSER={
 
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = os.path.join(BASE_DIR, "media")
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+# Closed requisitions older than this are moved out of the live asset owner history by `archive_history`.
+ASSET_HISTORY_ARCHIVE_AFTER_DAYS = 365
+
+# Validated upload files are written gzip compressed ('gzip') or as plain CSV ('none'). `purge_upload_files`
+# deletes the uploaded and validated files of uploads older than UPLOAD_FILE_RETENTION_DAYS.
+VALIDATED_FILE_COMPRESSION = os.environ.get('VALIDATED_FILE_COMPRESSION', 'gzip')
+VALIDATED_FILE_COMPRESSLEVEL = 6
+UPLOAD_FILE_RETENTION_DAYS = int(os.environ.get('UPLOAD_FILE_RETENTION_DAYS', 90))
+
+# A re-upload of the same bytes by the same user reuses the earlier result while the inventory is unchanged,
+# for uploads of the last UPLOAD_DEDUP_MAX_AGE_SECONDS (see UploadDeduplicationService).
+UPLOAD_DEDUP_ENABLED = os.environ.get('UPLOAD_DEDUP_ENABLED', '1') == '1'
+UPLOAD_DEDUP_MAX_AGE_SECONDS = int(os.environ.get('UPLOAD_DEDUP_MAX_AGE_SECONDS', 3600))
+
+# Validate only the rows and assets of an upload which changed since the same user's previous upload of the day.
+FILE_INCREMENTAL_VALIDATION = os.environ.get('FILE_INCREMENTAL_VALIDATION', '1') == '1'
+
+# Errors after which a dry run of `/file/upload` (`?dry_run=1`) stops, unless `max_errors` is given.
+FILE_DRY_RUN_MAX_ERRORS = 10
+
+# Limits of the batch asset creation endpoint (`POST /asset/batch`).
+ASSET_BATCH_CREATE_MAX_ROWS = 50_000
+ASSET_BATCH_CREATE_CHUNK_SIZE = 2_000
+
+# Long-polling of `/async/asset/<id>/availability`: maximum wait and database poll interval, in seconds.
+ASYNC_AVAILABILITY_MAX_WAIT = 30
+ASYNC_AVAILABILITY_POLL_INTERVAL = 1.0
@@ -7,6 +7,8 @@ from django.urls import include, path
 
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
+from .views import metrics, profile_download, profiles, slow_queries
+
 
 
 djoser_urls = [
@@ -20,6 +22,13 @@ swagger_urls = [
     path('api/redoc', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
 
+metrics_urls = [
+    path('metrics', metrics, name='metrics'),
+    path('slow-queries', slow_queries, name='slow-queries'),
+    path('profiles', profiles, name='profiles'),
+    path('profiles/<str:name>', profile_download, name='profile-download'),
+]
+
 app_urls = [
     path('user/', include('userprofile.urls')),
     path('', include('asset.urls')),
@@ -28,4 +37,5 @@ app_urls = [
 urlpatterns = [path('admin/', admin.site.urls)] + \
             djoser_urls + \
             swagger_urls + \
+            metrics_urls + \
             app_urls
@@ -0,0 +1,51 @@
+from django.http import FileResponse, HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser as IsSuperUser
+
+from core.exceptions import raise_404_exception
+from core.messages import response_list, response_ok
+from core.services.metrics import MetricsService
+from core.services.profiling import ProfilingService
+from core.services.slowqueries import SlowQueryService
+
+
+def metrics(request):
+    """Request metrics of this worker process in the Prometheus text format, for superusers and METRICS_TOKEN scrapers."""
+    if not MetricsService.is_allowed(request):
+        return HttpResponse(status=401)
+    return HttpResponse(MetricsService.render(), content_type="text/plain; version=0.0.4")
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsSuperUser])
+def slow_queries(request):
+    """Slow queries recorded by this worker process, newest first. DELETE empties the buffer."""
+    if request.method == "DELETE":
+        SlowQueryService.clear()
+        return response_ok(detail="Slow queries cleared.", data={})
+
+    queries = SlowQueryService.get_slow_queries()
+    return response_list(detail="Slow queries retrieved successfully.", data=queries, count=len(queries))
+
+
+@api_view(["GET"])
+@permission_classes([IsSuperUser])
+def profiles(request):
+    """Stored request profiles, newest first."""
+    stored_profiles = ProfilingService.list_profiles()
+    return response_list(detail="Profiles retrieved successfully.", data=stored_profiles, count=len(stored_profiles))
+
+
+@api_view(["GET"])
+@permission_classes([IsSuperUser])
+def profile_download(request, name):
+    """
+    A stored profile in pstats format, for snakeviz, `python -m pstats` or conversion to other viewers.
+    `?output=text` returns the functions with the highest cumulative time instead.
+    """
+    path = ProfilingService.get_profile_path(name)
+    if path is None:
+        raise_404_exception(detail=f"Profile {name} not found!")
+    if request.query_params.get("output") == "text":
+        return HttpResponse(ProfilingService.get_stats_text(path), content_type="text/plain")
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=name)